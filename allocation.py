@@ -0,0 +1,135 @@
+from datetime import date
+from food_groups import CANONICAL_FOOD_GROUPS, normalize_food_group
+
+class Recipient:
+    """
+        A household or partner agency receiving food
+
+        name: name of the household/agency
+        household_size: number of people served (used to scale target servings)
+    """
+    def __init__(self, name, household_size:int):
+        self.name = name.strip()
+        self.household_size = int(household_size)
+
+class AllocationPlan:
+    """
+        Result of plan_allocation
+
+        allocations: list of (key, quantity) to give, one list per recipient (same order as recipients)
+        fill: {food group: (allocated, target)}, one per recipient (same order as recipients)
+        totals: key -> total quantity to remove from inventory
+        versions: key -> version of each allocated item when the plan was made
+    """
+    def __init__(self):
+        self.allocations = []
+        self.fill = []
+        self.totals = {}
+        self.versions = {}
+
+    # Returns the total units allocated
+    def get_total_quantity(self) -> int:
+        """Returns the total number of units allocated to all recipients"""
+        return sum(self.totals.values())
+
+    # Applies the plan to inventory
+    def apply(self, inventory):
+        """
+            Removes the allocated quantities from inventory as one batch (remove_items)
+            Nothing is removed if any allocated item changed since planning
+            Returns True if applied, False if inventory changed since planning
+        """
+        try:
+            inventory.remove_items((key + (quantity,) for key, quantity in self.totals.items()),
+                                   expected_versions=self.versions)
+        except ValueError:
+            return False
+        return True
+
+# Splits supply between recipients in proportion to their demand
+def _fair_shares(demands, supply:int):
+    """
+        Returns a list of whole-number shares of supply, one per demand
+
+        If supply covers total demand, each share equals its demand
+        Otherwise, each share is demand * supply / total demand rounded down, and the
+        units left over go to the largest remainders (largest remainder method)
+    """
+    total_demand = sum(demands)
+    if total_demand <= supply:
+        return list(demands)
+    if total_demand == 0 or supply <= 0:
+        return [0] * len(demands)
+
+    shares = []
+    remainders = []
+    for index, demand in enumerate(demands):
+        share, remainder = divmod(demand * supply, total_demand)
+        shares.append(share)
+        remainders.append((-remainder, index))
+
+    # Give leftover units to the largest remainders (ties go to the earlier recipient)
+    leftover = supply - sum(shares)
+    for _, index in sorted(remainders)[:leftover]:
+        shares[index] += 1
+    return shares
+
+# Plans a fair allocation of inventory between recipients
+def plan_allocation(inventory, recipients, targets):
+    """
+        Plans how to split inventory between recipients
+
+        recipients: list of Recipient
+        targets: {canonical food group: servings per person} (one unit = one serving)
+
+        Each recipient's target for a food group is household_size * servings per person.
+        When a food group is short, it's split in proportion to each recipient's target,
+        so every household gets the same fill rate for that group. Within a group, items
+        expiring first are given out first.
+
+        Works per food group instead of per item x recipient pair, so the cost is
+        O(items + food groups x recipients)
+    """
+    plan = AllocationPlan()
+    # Recipients are kept by position, so two recipients with the same name stay separate
+    for _ in recipients:
+        plan.allocations.append([])
+        plan.fill.append({})
+
+    # Group item keys by canonical food group, expiring first (items without a date last)
+    keys_by_group = {group: [] for group in CANONICAL_FOOD_GROUPS}
+    for key, item in inventory.items.items():
+        group = normalize_food_group(item.food_group)
+        if group in keys_by_group:
+            keys_by_group[group].append(key)
+    for keys in keys_by_group.values():
+        keys.sort(key=lambda key: (inventory.items[key].expiration or date.max, key))
+
+    for group, servings in targets.items():
+        if not servings or group not in keys_by_group:
+            continue
+
+        keys = keys_by_group[group]
+        supply = sum(inventory.items[key].quantity for key in keys)
+        demands = [recipient.household_size * servings for recipient in recipients]
+        shares = _fair_shares(demands, supply)
+
+        # Hand out items in order, moving to the next item when one runs out
+        position = 0
+        left = inventory.items[keys[0]].quantity if keys else 0
+        for index, (share, demand) in enumerate(zip(shares, demands)):
+            plan.fill[index][group] = (share, demand)
+            needed = share
+            while needed > 0:
+                if left == 0:
+                    position += 1
+                    left = inventory.items[keys[position]].quantity
+                taken = min(needed, left)
+                key = keys[position]
+                plan.allocations[index].append((key, taken))
+                plan.totals[key] = plan.totals.get(key, 0) + taken
+                plan.versions[key] = inventory.items[key].version
+                needed -= taken
+                left -= taken
+
+    return plan
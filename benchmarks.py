@@ -0,0 +1,215 @@
+import argparse
+import contextlib
+import copy
+import io
+import os
+import random
+import tempfile
+import time
+from inventory import Inventory
+from measurements import format_unit
+from parse_cache import get_cache_file
+from session_replay import load_session, replay_session, print_latency_report
+
+# Number of items used by the benchmarks
+BENCHMARK_ITEMS = 100_000
+
+# Responses of a typical volunteer session, replayed by the replay benchmark when no
+# recorded session is given: view, sort, and filter inventory, add and remove an item,
+# undo, run reports, and quit without saving (item 7 is a 12 oz bag in make_inventory)
+SAMPLE_SESSION = [
+    "1", "1", "", "2", "1", "", "3", "", "4", "", "6", "1", "", "r",
+    "2", "rice", "bag", "1 lb", "5", "", "", "", "grains", "y", "",
+    "3", "item 7", "bag", "12 oz", "2", "y", "",
+    "6",
+    "9", "1", "", "2", "", "r",
+    "q", "2",
+]
+
+# Builds an inventory for benchmarks
+def make_inventory(count:int = BENCHMARK_ITEMS):
+    """Returns an Inventory with count distinct items spread over several containers, groups, and weights"""
+    containers = ["can", "box", "bag", "jar", "carton"]
+    food_groups = ["grains", "vegetables", "fruits", "protein", "dairy", "snacks"]
+    weights = ["12 oz", "1 lb", "2 lb", "500 ml", "1 l", "8 fl oz"]
+
+    inventory = Inventory()
+    for i in range(count):
+        inventory.add_item(f"item {i}", containers[i % 5], food_groups[i % 6], weights[i % 7 % 6], i % 50 + 1)
+    return inventory
+
+# Times a function
+def best_time(function, repeat:int = 5) -> float:
+    """Returns the fastest of repeat runs of function, in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+# Prints one benchmark result
+def report(name, seconds, count):
+    """Prints total time and time per item"""
+    print(f"{name:<40} {seconds * 1000:10.2f} ms {seconds / count * 1_000_000:10.3f} us/item")
+
+# Render benchmark
+def bench_render(count:int = BENCHMARK_ITEMS):
+    """
+        Compares building every item's display line from scratch (title() and format_unit
+        on every render) with Item's cached display strings
+    """
+    items = list(make_inventory(count).items.values())
+
+    def uncached():
+        for item in items:
+            f"{item.name.title()} ({format_unit(item.weight)}, {item.container.title()}, {item.food_group.title()}) - Qty: {item.quantity}"
+
+    def cached():
+        for item in items:
+            item.get_display()
+
+    # Warm the cache once (the first render of each item builds its strings)
+    cached()
+
+    print(f"\nRender {count} items")
+    report("format every render", best_time(uncached), count)
+    report("cached display strings", best_time(cached), count)
+
+    # Changing quantities only rebuilds the quantity part
+    def changed_quantity():
+        for item in items:
+            item.quantity += 1
+        for item in items:
+            item.get_display()
+
+    report("cached, after every quantity changed", best_time(changed_quantity), count)
+
+# Event bus benchmark
+def bench_events(count:int = BENCHMARK_ITEMS):
+    """Times add_item with 0, 1, and 10 event subscribers (half per-event, half batch)"""
+    print(f"\nadd_item x {count} with event subscribers")
+    for subscribers in (0, 1, 10):
+        def run():
+            inventory = Inventory()
+            received = []
+            for i in range(subscribers):
+                inventory.events.subscribe(received.append, batch=i % 2 == 1)
+            for i in range(count):
+                inventory.add_item("rice", "bag", "grains", "1 lb", 1)
+
+        report(f"{subscribers} subscriber(s)", best_time(run, repeat=3), count)
+
+# Startup load benchmark
+def bench_load(count:int = BENCHMARK_ITEMS):
+    """Times loading an inventory CSV without a parse cache (cold) and with one (warm)"""
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "inventory.csv")
+        with contextlib.redirect_stdout(io.StringIO()):
+            make_inventory(count).save_inventory_to_csv(filename)
+
+        def load():
+            with contextlib.redirect_stdout(io.StringIO()):
+                Inventory().load_inventory_from_csv(filename)
+
+        def cold():
+            os.remove(get_cache_file(filename))
+            load()
+
+        # The first load writes the cache
+        load()
+
+        print(f"\nLoad {count} items from CSV")
+        report("cold (parse and write cache)", best_time(cold, repeat=3), count)
+        report("warm (read cache)", best_time(load, repeat=3), count)
+
+# Pick route benchmark
+def bench_route(count:int = BENCHMARK_ITEMS, picks:int = 500):
+    """Times routing a pick list through an inventory whose items are spread over 26 aisles"""
+    inventory = make_inventory(count)
+    generator = random.Random(1)
+    for key in inventory.items:
+        inventory.set_location(key, f"{chr(ord('A') + generator.randrange(26))}-{generator.randrange(1, 60)}")
+    pick_list = [(key, 1) for key in generator.sample(list(inventory.items), picks)]
+
+    print(f"\nRoute {picks} picks ({count} items)")
+    report("nearest neighbor + 2-opt", best_time(lambda: inventory.get_pick_route(pick_list), repeat=3), picks)
+
+# What-if view benchmark
+def bench_view(count:int = BENCHMARK_ITEMS, changes:int = 300):
+    """Compares a what-if copy made with copy.deepcopy to a copy-on-write view, each changing changes items"""
+    inventory = make_inventory(count)
+    keys = list(inventory.items)[:changes]
+
+    def deep_copy():
+        items = copy.deepcopy(inventory.items)
+        for key in keys:
+            items[key].consume(1)
+
+    def view():
+        what_if = inventory.create_view()
+        what_if.remove_items([key + (1,) for key in keys])
+
+    print(f"\nWhat-if copy of {count} items, {changes} changed")
+    report("copy.deepcopy of every item", best_time(deep_copy, repeat=1), count)
+    report("copy-on-write view", best_time(view, repeat=3), count)
+
+# Session replay benchmark
+def bench_replay(count:int = BENCHMARK_ITEMS, session=None):
+    """
+        Replays a session through the menus (headless) and prints latency percentiles per menu
+        session: session file recorded with session_replay.py (default: SAMPLE_SESSION)
+        Items in the recorded session's inventory file (if it still exists) are added to the
+        synthetic items, so the recorded item names are found
+    """
+    inventory = make_inventory(count)
+    if session:
+        header, steps = load_session(session)
+        if header.get("inventory") and os.path.exists(header["inventory"]):
+            # Loaded into a separate inventory, so the replay never saves over the recorded file
+            recorded = Inventory()
+            with contextlib.redirect_stdout(io.StringIO()):
+                recorded.load_inventory_from_csv(header["inventory"])
+            for item in recorded.iter_items():
+                inventory.add_item(item.name, item.container, item.food_group, item.weight, item.quantity, item.expiration)
+    else:
+        steps = [{"response": response} for response in SAMPLE_SESSION]
+
+    print(f"\nReplay {session or 'sample session'} ({len(steps)} responses, {count} items)")
+    print_latency_report(replay_session(steps, inventory))
+
+# Benchmarks that can be run by name
+BENCHMARKS = {
+    "render": bench_render,
+    "events": bench_events,
+    "load": bench_load,
+    "route": bench_route,
+    "view": bench_view,
+    "replay": bench_replay,
+}
+
+def main():
+    """
+        Runs benchmarks and prints their timings
+        python benchmarks.py [name ...] (default: all)
+    """
+    parser = argparse.ArgumentParser(description="Run inventory benchmarks.")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument("-n", "--items", type=int, default=BENCHMARK_ITEMS, help="number of items")
+    parser.add_argument("--session", help="session file for the replay benchmark (default: sample session)")
+    args = parser.parse_args()
+
+    for name in args.names:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark '{name}'")
+
+    for name in args.names or BENCHMARKS:
+        # The replay benchmark can replay a recorded session instead of the sample session
+        if name == "replay":
+            bench_replay(args.items, args.session)
+        else:
+            BENCHMARKS[name](args.items)
+
+# Only run main when executing this program
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+from food_groups import normalize_food_group
+from measurements import UNIT_MAP
+from reports import REPORT_DIMENSIONS
+
+# Attributes indexed by BitmapIndex (values are the same as in group-by reports)
+BITMAP_ATTRIBUTES = ("food_group", "container", "unit")
+
+# Bit positions set in each byte value (used to list the set bits of a bitmap)
+_BYTE_BITS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+
+# Lists the set bits of a bitmap
+def iter_bits(bitmap:int):
+    """Yields the position of each set bit in bitmap, lowest first"""
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    for index, byte in enumerate(data):
+        if byte:
+            base = index * 8
+            for bit in _BYTE_BITS[byte]:
+                yield base + bit
+
+# Builds a bitmap from bit positions
+def _from_positions(positions, size:int) -> int:
+    """Returns an int with the given bit positions set (all positions are below size)"""
+    data = bytearray((size + 7) // 8)
+    for position in positions:
+        data[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(data, "little")
+
+# Normalizes a filter value to the indexed value of an attribute
+def _normalize_value(attribute, value:str) -> str:
+    """Returns value the way it's stored in the index (ex. 'veg' --> 'Vegetables', 'l' --> 'L')"""
+    value = value.strip()
+    if attribute == "food_group":
+        return normalize_food_group(value) or value.title()
+    if attribute == "unit":
+        return UNIT_MAP.get(value.lower(), value)
+    return value.title()
+
+# Returns the quantity bin of a quantity
+def _quantity_bin(quantity:int) -> int:
+    """Returns the bin of quantity: bin b holds quantities from 2^(b-1) to 2^b - 1"""
+    return max(quantity, 0).bit_length()
+
+class BitmapIndex:
+    """
+        Bitmap indexes of items by food group, container, unit, and quantity range
+
+        Every item gets a slot number, and each attribute value has a bitmap (a Python int)
+        with the bit of every item slot holding that value. Quantities are indexed in
+        power-of-two bins (1, 2-3, 4-7, 8-15...). A query combines bitmaps with | (OR)
+        within an attribute and & (AND) across attributes, which handles many items per
+        machine word, and only looks at the items that match
+
+        Inventory calls update(key) after every change; slots of deleted items are reused
+    """
+    def __init__(self, items):
+        # Inventory items dictionary (key -> Item)
+        self.items = items
+        # Slot -> key (None for a free slot), and key -> slot
+        self.slot_keys = []
+        self.slots = {}
+        # Slots of deleted items, reused by new items
+        self.free_slots = []
+        # Slot -> (attribute values..., quantity bin)
+        self.slot_values = []
+        # Attribute -> {value: bitmap}
+        self.bitmaps = {attribute: {} for attribute in BITMAP_ATTRIBUTES}
+        # Quantity bin -> bitmap
+        self.quantity_bins = {}
+        # Bitmap of every used slot
+        self.all = 0
+        # (food group, container, weight) as stored on an item -> indexed attribute values
+        # (many items share these, so each combination is normalized only once)
+        self.value_cache = {}
+
+    # Returns the indexed values of an item
+    def _values_of(self, item):
+        """Returns (food group, container, unit, quantity bin) of item"""
+        raw = (item.food_group, item.container, item.weight)
+        values = self.value_cache.get(raw)
+        if values is None:
+            values = self.value_cache[raw] = tuple(REPORT_DIMENSIONS[attribute](item) for attribute in BITMAP_ATTRIBUTES)
+        return values + (_quantity_bin(item.quantity),)
+
+    # Rebuilds the index from scratch
+    def rebuild(self):
+        """Rebuilds every bitmap in one pass over the items (used after loading)"""
+        self.slot_keys = list(self.items)
+        self.slots = {key: slot for slot, key in enumerate(self.slot_keys)}
+        self.free_slots = []
+        self.slot_values = [self._values_of(item) for item in self.items.values()]
+
+        # Group slots by their combination of values (items share a few combinations),
+        # then by each value, and build each bitmap at once
+        combinations = {}
+        for slot, values in enumerate(self.slot_values):
+            combinations.setdefault(values, []).append(slot)
+        positions = [{} for _ in range(len(BITMAP_ATTRIBUTES) + 1)]
+        for values, slots in combinations.items():
+            for index, value in enumerate(values):
+                positions[index].setdefault(value, []).extend(slots)
+
+        size = len(self.slot_keys)
+        for index, attribute in enumerate(BITMAP_ATTRIBUTES):
+            self.bitmaps[attribute] = {value: _from_positions(slots, size) for value, slots in positions[index].items()}
+        self.quantity_bins = {value: _from_positions(slots, size) for value, slots in positions[-1].items()}
+        self.all = (1 << size) - 1
+
+    # Sets or clears one slot's bit in a bitmap dictionary
+    def _set_bit(self, bitmaps, value, bit:int, on:bool):
+        """Sets (on=True) or clears bit in bitmaps[value], dropping bitmaps that become empty"""
+        if on:
+            bitmaps[value] = bitmaps.get(value, 0) | bit
+        else:
+            bitmap = bitmaps.get(value, 0) & ~bit
+            if bitmap:
+                bitmaps[value] = bitmap
+            else:
+                bitmaps.pop(value, None)
+
+    # Updates the index for one key
+    def update(self, key):
+        """Adds, moves (to a new quantity bin), or removes key after a change"""
+        item = self.items.get(key)
+        slot = self.slots.get(key)
+
+        # Deleted item: clear its bits and free its slot
+        if item is None:
+            if slot is None:
+                return
+            bit = 1 << slot
+            values = self.slot_values[slot]
+            for attribute, value in zip(BITMAP_ATTRIBUTES, values):
+                self._set_bit(self.bitmaps[attribute], value, bit, False)
+            self._set_bit(self.quantity_bins, values[-1], bit, False)
+            self.all &= ~bit
+            del self.slots[key]
+            self.slot_keys[slot] = None
+            self.free_slots.append(slot)
+            return
+
+        # New item: give it a slot and set its bits
+        if slot is None:
+            values = self._values_of(item)
+            if self.free_slots:
+                slot = self.free_slots.pop()
+                self.slot_keys[slot] = key
+                self.slot_values[slot] = values
+            else:
+                slot = len(self.slot_keys)
+                self.slot_keys.append(key)
+                self.slot_values.append(values)
+            self.slots[key] = slot
+
+            bit = 1 << slot
+            for attribute, value in zip(BITMAP_ATTRIBUTES, values):
+                self._set_bit(self.bitmaps[attribute], value, bit, True)
+            self._set_bit(self.quantity_bins, values[-1], bit, True)
+            self.all |= bit
+            return
+
+        # Existing item: move it if its quantity bin changed
+        values = self.slot_values[slot]
+        quantity_bin = _quantity_bin(item.quantity)
+        if quantity_bin != values[-1]:
+            bit = 1 << slot
+            self._set_bit(self.quantity_bins, values[-1], bit, False)
+            self._set_bit(self.quantity_bins, quantity_bin, bit, True)
+            self.slot_values[slot] = values[:-1] + (quantity_bin,)
+
+    # Returns the bitmap of items with any of the given values
+    def match(self, attribute, values) -> int:
+        """
+            Returns the bitmap of items whose attribute has any of values (OR)
+            values can be one value or a list; values are normalized (ex. 'veg' --> 'Vegetables')
+        """
+        if attribute not in self.bitmaps:
+            raise ValueError(f"Unknown filter attribute '{attribute}'.")
+        if isinstance(values, str):
+            values = [values]
+
+        bitmap = 0
+        for value in values:
+            bitmap |= self.bitmaps[attribute].get(_normalize_value(attribute, value), 0)
+        return bitmap
+
+    # Returns the bitmap of items that might be in a quantity range
+    def match_quantity(self, min_qty=None, max_qty=None) -> int:
+        """Returns the bitmap of items in quantity bins that overlap min_qty to max_qty"""
+        low = _quantity_bin(min_qty) if min_qty is not None else 0
+        high = _quantity_bin(max_qty) if max_qty is not None else None
+
+        bitmap = 0
+        for quantity_bin, bins_bitmap in self.quantity_bins.items():
+            if quantity_bin >= low and (high is None or quantity_bin <= high):
+                bitmap |= bins_bitmap
+        return bitmap
+
+    # Finds items matching filters
+    def query(self, min_qty=None, max_qty=None, **filters):
+        """
+            Returns the keys of items matching every filter (AND)
+            filters: attribute=value or attribute=[values] (OR), for attributes in BITMAP_ATTRIBUTES
+            min_qty/max_qty (optional): quantity range (inclusive)
+        """
+        bitmap = self.all
+        for attribute, values in filters.items():
+            if values is not None and values != []:
+                bitmap &= self.match(attribute, values)
+
+        # Quantity bins narrow the range; quantities in the boundary bins are checked exactly
+        check_quantity = min_qty is not None or max_qty is not None
+        if check_quantity:
+            bitmap &= self.match_quantity(min_qty, max_qty)
+
+        keys = []
+        for slot in iter_bits(bitmap):
+            key = self.slot_keys[slot]
+            if check_quantity:
+                quantity = self.items[key].quantity
+                if (min_qty is not None and quantity < min_qty) or (max_qty is not None and quantity > max_qty):
+                    continue
+            keys.append(key)
+        return keys
@@ -0,0 +1,51 @@
+import csv
+from food_groups import normalize_food_group
+from measurements import format_unit
+
+# Default product catalog file (UPC -> product)
+CATALOG_FILE = "product_catalog.csv"
+
+# Normalizes a scanned or typed product code
+def normalize_code(code:str) -> str:
+    """
+        Returns code with spaces and dashes removed and leading zeros stripped
+        so the same product matches as UPC-A (12 digits) or EAN-13 (13 digits)
+    """
+    return code.strip().replace(" ", "").replace("-", "").lstrip("0")
+
+# Loads the product catalog into a dictionary
+def load_catalog(catalog_path=CATALOG_FILE):
+    """
+        Loads the product catalog CSV (columns: upc, name, container, food_group, weight)
+
+        Returns a dictionary of normalized code -> (name, container, food group, weight),
+        with the food group and weight already normalized, so a scan is one dictionary lookup
+        Returns an empty dictionary if the file is not found
+        Rows with an unknown food group or invalid weight are skipped
+    """
+    catalog = {}
+
+    try:
+        with open(catalog_path, 'r', newline='', encoding='utf-8') as file:
+            rows = list(csv.DictReader(file))
+    except FileNotFoundError:
+        return catalog
+
+    skipped = 0
+    for row in rows:
+        code = normalize_code(row.get("upc") or "")
+        food_group = normalize_food_group(row.get("food_group") or "")
+        try:
+            weight = format_unit(row.get("weight") or "")
+        except ValueError:
+            weight = ""
+
+        # Skip rows that are missing a field or can't be normalized
+        if not code or not row.get("name") or not row.get("container") or not food_group or not weight:
+            skipped += 1
+            continue
+        catalog[code] = (row["name"].strip().lower(), row["container"].strip().lower(), food_group, weight)
+
+    if skipped:
+        print(f"Skipped {skipped} invalid row(s) in product catalog '{catalog_path}'.\n")
+    return catalog
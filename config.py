@@ -1,3 +1,7 @@
+# Default number of item changes kept for undo/redo (a batch counts each item it changed)
+# Override with the line "History Limit: N" in config.txt
+HISTORY_LIMIT = 5000
+
 # Loads data from the configuration file
 # If no file is provided, uses "config.txt" by default
 def load_config(config_path="config.txt"):
@@ -45,12 +49,57 @@ def load_config(config_path="config.txt"):
 
     return (food_bank_name, inventory_csv)
 
+# Loads the canonical units setting from the configuration file
+def load_canonical_units(config_path="config.txt"):
+    """
+        Returns True if config.txt has the line "Canonical Units: yes"
+        (items with equivalent sizes, ex. 16 oz and 1 lb, are kept as one item)
+        Returns False if the line or the file is missing
+    """
+    try:
+        with open(config_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line.lower().startswith("canonical units:"):
+                    return line.split(":", 1)[1].strip().lower() in ("yes", "y", "true", "on")
+    except FileNotFoundError:
+        pass
+    return False
+
+# Loads the undo history limit from the configuration file
+def load_history_limit(config_path="config.txt"):
+    """
+        Returns the number of item changes kept for undo/redo from the line "History Limit: N"
+        in config.txt
+        Returns HISTORY_LIMIT if the line or the file is missing, or N isn't a whole number
+        greater than 0
+    """
+    try:
+        with open(config_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line.lower().startswith("history limit:"):
+                    value = line.split(":", 1)[1].strip()
+                    if value.isdigit() and int(value) > 0:
+                        return int(value)
+    except FileNotFoundError:
+        pass
+    return HISTORY_LIMIT
+
 # Saves the food bank name and inventory csv data to the configuration file
-def save_config(food_bank_name, inventory_csv, config_path = "config.txt"):
+def save_config(food_bank_name, inventory_csv, config_path = "config.txt", canonical_units=None):
     """
         Save food bank name and inventory csv to config.txt
         Empty or None value will be written as "" (empty string) 
+        canonical_units (optional): True/False to change the canonical units setting
+        (by default, the current setting is kept)
+        A "History Limit" line is kept as is
     """
+    # Keep the canonical units setting unless it's being changed
+    if canonical_units is None:
+        canonical_units = load_canonical_units(config_path)
+    history_limit = load_history_limit(config_path)
+
     # Normalize values
     # Set the values to the input if not empty
     # Otherwise, set it to an empty string
@@ -64,7 +113,53 @@ def save_config(food_bank_name, inventory_csv, config_path = "config.txt"):
         with open(config_path, "w", encoding="utf-8") as f:
             f.write(f"Food Bank Name: {name_out}\n")
             f.write(f"Inventory CSV: {csv_out}")
+            if canonical_units:
+                f.write("\nCanonical Units: yes")
+            if history_limit != HISTORY_LIMIT:
+                f.write(f"\nHistory Limit: {history_limit}")
             print(f"Config saved successfully to {config_path}.\n")
     except Exception as e:
         print(f"Error saving config to {config_path}: {e}")
-        print("Be sure input is valid or file is in the same directory.\n")
\ No newline at end of file
+        print("Be sure input is valid or file is in the same directory.\n")
+
+# Loads food group reorder thresholds from a file
+# If no file is provided, uses "reorder_thresholds.txt" by default
+def load_reorder_thresholds(thresholds_path="reorder_thresholds.txt"):
+    """
+        Loads food group reorder thresholds from "reorder_thresholds.txt"
+        Each line has the format "Food Group: threshold" (ex. Grains: 20)
+
+        Returns a dictionary of food group (lowercase) -> threshold
+        Returns an empty dictionary if the file is not found
+        Lines that can't be read are skipped
+    """
+    thresholds = {}
+
+    try:
+        with open(thresholds_path, "r", encoding="utf-8") as f:
+            lines = [line.strip() for line in f.readlines()]
+    except FileNotFoundError:
+        return thresholds
+
+    for line in lines:
+        # Skip lines without a "group: threshold" format
+        if ":" not in line:
+            continue
+        group, value = line.rsplit(":", 1)
+        if group.strip() and value.strip().isdigit():
+            thresholds[group.strip().lower()] = int(value.strip())
+
+    return thresholds
+
+# Saves food group reorder thresholds to a file
+def save_reorder_thresholds(thresholds, thresholds_path="reorder_thresholds.txt"):
+    """
+        Save food group reorder thresholds to reorder_thresholds.txt
+        One "Food Group: threshold" line per group
+    """
+    try:
+        with open(thresholds_path, "w", encoding="utf-8") as f:
+            for group, threshold in sorted(thresholds.items()):
+                f.write(f"{group.title()}: {threshold}\n")
+    except Exception as e:
+        print(f"Error saving reorder thresholds to {thresholds_path}: {e}")
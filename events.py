@@ -0,0 +1,83 @@
+# Types of inventory events
+ADDED = "added"
+REMOVED = "removed"
+DELETED = "deleted"
+LOADED = "loaded"
+SAVED = "saved"
+EVENT_TYPES = (ADDED, REMOVED, DELETED, LOADED, SAVED)
+
+class InventoryEvent:
+    """
+        A change to the inventory
+
+        kind: one of EVENT_TYPES
+        - added: units were added to key (delta > 0)
+        - removed: units were taken from key and some are left (delta < 0)
+        - deleted: the last units of key were taken, so it left inventory (delta < 0)
+        - loaded/saved: the inventory was loaded from or saved to filename (key is None)
+        key: inventory key of the item (None for loaded/saved)
+        delta: change in quantity (0 for loaded/saved)
+        filename: file loaded or saved (None for item events)
+    """
+    def __init__(self, kind, key=None, delta:int = 0, filename=None):
+        self.kind = kind
+        self.key = key
+        self.delta = delta
+        self.filename = filename
+
+class EventBus:
+    """
+        Delivers inventory events to subscribers
+
+        A subscriber is a function that is called either once per event (callback(event))
+        or, with batch=True, once per change with the list of events it made (callback(events)),
+        so a batch (ex. add_items) reaches it as a single call.
+
+        Inventory only builds events when active is True, so when nobody is subscribed
+        the cost of a change is one attribute check
+    """
+    def __init__(self):
+        # (callback, kinds) pairs; kinds is a set of event types or None for all
+        self.listeners = []
+        self.batch_listeners = []
+        # True if anyone is subscribed
+        self.active = False
+
+    # Adds a subscriber
+    def subscribe(self, callback, kinds=None, batch:bool = False):
+        """
+            Subscribes callback to events
+            kinds (optional): event types to receive (default: all)
+            batch: True to receive a list of events once per change instead of one call per event
+            Raises ValueError for an unknown event type
+            Returns callback (pass it to unsubscribe)
+        """
+        if kinds is not None:
+            kinds = set(kinds)
+            unknown = kinds - set(EVENT_TYPES)
+            if unknown:
+                raise ValueError(f"Unknown event type(s): {', '.join(sorted(unknown))}.")
+
+        (self.batch_listeners if batch else self.listeners).append((callback, kinds))
+        self.active = True
+        return callback
+
+    # Removes a subscriber
+    def unsubscribe(self, callback):
+        """Stops sending events to callback (does nothing if it isn't subscribed)"""
+        self.listeners = [listener for listener in self.listeners if listener[0] != callback]
+        self.batch_listeners = [listener for listener in self.batch_listeners if listener[0] != callback]
+        self.active = bool(self.listeners or self.batch_listeners)
+
+    # Sends events to subscribers
+    def publish(self, events):
+        """Sends each event to per-event subscribers, then the whole list to batch subscribers"""
+        for callback, kinds in self.listeners:
+            for event in events:
+                if kinds is None or event.kind in kinds:
+                    callback(event)
+
+        for callback, kinds in self.batch_listeners:
+            selected = events if kinds is None else [event for event in events if event.kind in kinds]
+            if selected:
+                callback(selected)
@@ -0,0 +1,104 @@
+import heapq
+from datetime import date, datetime
+
+# Format used for expiration dates in files and user input
+DATE_FORMAT = "%Y-%m-%d"
+
+# Parses an expiration date string
+def parse_date(value):
+    """
+        Parses a date string in YYYY-MM-DD format
+        Returns None for an empty string or None
+        Raises ValueError if the date is invalid
+    """
+    if not value or not value.strip():
+        return None
+    try:
+        return datetime.strptime(value.strip(), DATE_FORMAT).date()
+    except ValueError:
+        raise ValueError(f"Invalid date '{value.strip()}'. Use YYYY-MM-DD.")
+
+# Formats an expiration date for files and display
+def format_date(value) -> str:
+    """Returns the date as a YYYY-MM-DD string (empty string for None)"""
+    # isoformat gives DATE_FORMAT for dates and is much faster than strftime for big saves
+    return value.isoformat() if value else ""
+
+class ExpirationIndex:
+    """
+        Min-heap of (expiration date, key) for items with an expiration date
+        An item's date is the earliest date of its lots, so it moves forward as expired or
+        used-up lots are removed (Inventory pushes the item again when it changes)
+
+        Uses lazy deletion: entries are not removed from the heap when an item is
+        removed or its date changes. Instead, an entry is only valid if the key is still
+        in inventory with the same expiration date, and invalid entries are dropped
+        when they reach the top of the heap.
+
+        Queries pop the k entries they need and push them back, so they cost O(k log n)
+    """
+    def __init__(self, items):
+        # Inventory items dictionary (key -> Item) used to validate heap entries
+        self.items = items
+        # Heap of (expiration date, key)
+        self.heap = []
+
+    # Adds an item to the index
+    def push(self, key, item):
+        """Adds the item under key to the index if it has an expiration date"""
+        if item.expiration is not None:
+            heapq.heappush(self.heap, (item.expiration, key))
+
+            # Rebuild if stale entries make up most of the heap
+            if len(self.heap) > 2 * len(self.items) + 64:
+                self.rebuild()
+
+    # Rebuilds the index from inventory
+    def rebuild(self):
+        """Rebuilds the heap from all items in inventory (drops stale entries)"""
+        self.heap = [(item.expiration, key) for key, item in self.items.items() if item.expiration is not None]
+        heapq.heapify(self.heap)
+
+    # Checks if a heap entry still matches inventory
+    def _is_valid(self, entry):
+        """Returns True if the entry's key is in inventory with the same expiration date"""
+        expiration, key = entry
+        item = self.items.get(key)
+        return item is not None and item.expiration == expiration
+
+    # Pops valid entries from the heap while condition is met
+    def _pop_while(self, condition):
+        """
+            Pops entries from the heap while condition(entry, found) is True
+            Stale entries are discarded, valid entries are pushed back afterwards
+            Returns the valid entries in expiration order
+        """
+        found = []
+        seen = set()
+        while self.heap and condition(self.heap[0], found):
+            entry = heapq.heappop(self.heap)
+            # Skip stale entries and duplicates of the same entry
+            if entry in seen or not self._is_valid(entry):
+                continue
+            seen.add(entry)
+            found.append(entry)
+
+        # Put valid entries back in the heap
+        for entry in found:
+            heapq.heappush(self.heap, entry)
+        return found
+
+    # Returns the next n items to expire
+    def next_expiring(self, n:int):
+        """Returns a list of (expiration date, key) for the n items that expire first"""
+        return self._pop_while(lambda entry, found: len(found) < n)
+
+    # Returns all items that expire before a date
+    def expiring_before(self, cutoff):
+        """Returns a list of (expiration date, key) for items that expire before cutoff"""
+        return self._pop_while(lambda entry, found: entry[0] < cutoff)
+
+    # Returns items that have already expired
+    def expired(self, today=None):
+        """Returns a list of (expiration date, key) for items that expired before today"""
+        return self.expiring_before(today or date.today())
@@ -0,0 +1,227 @@
+import csv
+import gzip
+import hashlib
+import io
+import json
+import lzma
+import os
+import re
+
+# Buffer size for reading and writing inventory files (1 MB)
+BUFFER_SIZE = 1 << 20
+
+# Magic bytes at the start of compressed files
+GZIP_MAGIC = b"\x1f\x8b"
+XZ_MAGIC = b"\xfd7zXZ\x00"
+
+# Minimum column widths for fixed-width files (columns not listed use DEFAULT_WIDTH)
+# Columns are widened to fit longer values; the last column is never padded
+FIXED_WIDTHS = {
+    "name": 32,
+    "container": 12,
+    "food_group": 14,
+    "weight": 12,
+    "quantity": 10,
+    "expiration": 12,
+    "reorder_at": 12,
+    "location": 12,
+}
+DEFAULT_WIDTH = 16
+
+# Opens a file as text, with optional compression
+def _open_text(filename, mode, compression=None):
+    """
+        Opens filename as a buffered UTF-8 text file for reading ('r') or writing ('w')
+        compression can be None, "gzip", or "xz"
+    """
+    if compression is None:
+        return open(filename, mode, buffering=BUFFER_SIZE, newline='', encoding='utf-8')
+
+    # Compressed files get a large buffer in front of the compressor
+    if compression == "gzip":
+        raw = gzip.GzipFile(filename, mode + "b")
+    else:
+        raw = lzma.LZMAFile(filename, mode + "b")
+    buffered = io.BufferedWriter(raw, BUFFER_SIZE) if mode == "w" else io.BufferedReader(raw, BUFFER_SIZE)
+    return io.TextIOWrapper(buffered, encoding='utf-8', newline='')
+
+class CsvFormat:
+    """Comma-separated values with a header row"""
+
+    # Writes rows as CSV
+    def write(self, file, fieldnames, make_rows):
+        """Writes the header and each row of make_rows() (lists of values in fieldnames order)"""
+        writer = csv.writer(file)
+        writer.writerow(fieldnames)
+        writer.writerows(make_rows())
+
+    # Reads rows from CSV
+    def read(self, file, fieldnames):
+        """Yields each row as a dictionary"""
+        yield from csv.DictReader(file)
+
+class JsonLinesFormat:
+    """One JSON object per line (JSON Lines)"""
+
+    # Writes rows as JSON Lines
+    def write(self, file, fieldnames, make_rows):
+        """Writes each row of make_rows() (lists of values in fieldnames order) as a JSON object"""
+        file.writelines(json.dumps(dict(zip(fieldnames, row)), ensure_ascii=False) + "\n" for row in make_rows())
+
+    # Reads rows from JSON Lines
+    def read(self, file, fieldnames):
+        """Yields each non-empty line as a dictionary"""
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+class FixedWidthFormat:
+    """
+        Fixed-width columns with a header row (for legacy reporting systems)
+        Columns use FIXED_WIDTHS, widened when a value is longer, so values are never cut off
+        (there is always at least one space between columns)
+    """
+
+    # Returns the width of each column
+    def _widths(self, fieldnames, rows):
+        """
+            Returns a list of column widths (None for the last column): the FIXED_WIDTHS width,
+            or the longest value plus one space if that's wider
+        """
+        widths = [max(FIXED_WIDTHS.get(fieldname, DEFAULT_WIDTH), len(fieldname) + 1) for fieldname in fieldnames]
+        for row in rows:
+            for index, value in enumerate(row):
+                length = len(str(value)) + 1
+                if length > widths[index]:
+                    widths[index] = length
+        widths[-1] = None
+        return widths
+
+    # Formats one line
+    def _format_line(self, values, widths):
+        """Returns values padded to their column widths as one line"""
+        parts = []
+        for value, width in zip(values, widths):
+            value = str(value)
+            parts.append(value if width is None else value.ljust(width))
+        return "".join(parts).rstrip() + "\n"
+
+    # Writes rows as fixed-width columns
+    def write(self, file, fieldnames, make_rows):
+        """
+            Writes the header and each row of make_rows() (lists of values in fieldnames order)
+            make_rows is called twice: the first pass sizes the columns and the second writes
+            the rows, so rows are streamed instead of kept in a list
+        """
+        widths = self._widths(fieldnames, make_rows())
+        file.write(self._format_line(fieldnames, widths))
+        file.writelines(self._format_line(row, widths) for row in make_rows())
+
+    # Reads rows from fixed-width columns
+    def read(self, file, fieldnames):
+        """
+            Yields each row as a dictionary
+            Each column starts where its name starts in the header line and ends where the
+            next column starts (the last column runs to the end of the line)
+        """
+        header_line = file.readline()
+        header = [(match.group(), match.start()) for match in re.finditer(r"\S+", header_line)]
+        columns = [(name, start, header[index + 1][1] if index + 1 < len(header) else None)
+                   for index, (name, start) in enumerate(header)]
+
+        for line in file:
+            if not line.strip():
+                continue
+            yield {name: line[start:end].strip() for name, start, end in columns}
+
+# Supported file extensions -> (format, compression)
+EXPORT_FORMATS = {
+    ".csv": (CsvFormat(), None),
+    ".csv.gz": (CsvFormat(), "gzip"),
+    ".csv.xz": (CsvFormat(), "xz"),
+    ".jsonl": (JsonLinesFormat(), None),
+    ".jsonl.gz": (JsonLinesFormat(), "gzip"),
+    ".txt": (FixedWidthFormat(), None),
+}
+
+# Returns the supported extension of a filename
+def get_extension(filename):
+    """Returns the supported extension filename ends with (longest match), or None"""
+    matches = [ext for ext in EXPORT_FORMATS if filename.lower().endswith(ext)]
+    return max(matches, key=len) if matches else None
+
+# Writes rows to a file in the format of its extension
+def write_rows(filename, fieldnames, make_rows):
+    """
+        Writes rows to filename
+        make_rows: function returning a new iterable of value lists in fieldnames order (ex. a
+        generator function). It may be called more than once (fixed-width sizes its columns first)
+        The format is chosen by extension (.csv, .csv.gz, .csv.xz, .jsonl, .jsonl.gz, .txt)
+        and defaults to CSV. Rows are streamed, so they are never all held in memory
+    """
+    file_format, compression = EXPORT_FORMATS[get_extension(filename) or ".csv"]
+    with _open_text(filename, 'w', compression) as file:
+        file_format.write(file, fieldnames, make_rows)
+
+# Reads rows from a file in any supported format
+def read_rows(filename, fieldnames):
+    """
+        Yields each row of filename as a dictionary
+        Compression (gzip/xz) is detected from the file's magic bytes and the format
+        (CSV, JSON Lines, or fixed-width) from its first line, so the extension doesn't matter
+    """
+    # Check magic bytes for compression
+    with open(filename, 'rb') as raw:
+        magic = raw.read(len(XZ_MAGIC))
+    compression = None
+    if magic.startswith(GZIP_MAGIC):
+        compression = "gzip"
+    elif magic.startswith(XZ_MAGIC):
+        compression = "xz"
+
+    # Check first line for format
+    with _open_text(filename, 'r', compression) as file:
+        first_line = file.readline()
+    if first_line.lstrip().startswith("{"):
+        file_format = JsonLinesFormat()
+    elif first_line.startswith(fieldnames[0] + ","):
+        file_format = CsvFormat()
+    elif first_line.startswith(fieldnames[0]):
+        file_format = FixedWidthFormat()
+    else:
+        file_format = CsvFormat()
+
+    with _open_text(filename, 'r', compression) as file:
+        yield from file_format.read(file, fieldnames)
+
+# Returns the modified time and size of files
+def file_stats(filenames):
+    """Returns a tuple of (mtime_ns, size) per file ((None, None) if a file is missing)"""
+    stats = []
+    for filename in filenames:
+        try:
+            stat = os.stat(filename)
+            stats.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            stats.append((None, None))
+    return tuple(stats)
+
+# Returns a content hash of files
+def file_hashes(filenames):
+    """Returns a tuple of BLAKE2b digests per file (None if a file is missing)"""
+    digests = []
+    for filename in filenames:
+        try:
+            with open(filename, 'rb') as file:
+                digest = hashlib.blake2b(digest_size=16)
+                for chunk in iter(lambda: file.read(BUFFER_SIZE), b""):
+                    digest.update(chunk)
+                digests.append(digest.hexdigest())
+        except FileNotFoundError:
+            digests.append(None)
+    return tuple(digests)
+
+# Returns a fingerprint of files
+def file_fingerprint(filenames):
+    """Returns (stats, hashes) for filenames (see file_stats and file_hashes)"""
+    return (file_stats(filenames), file_hashes(filenames))
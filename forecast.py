@@ -0,0 +1,135 @@
+from datetime import date
+from food_groups import normalize_food_group
+
+# Days for a day's removals to count half as much in the smoothed rate
+FORECAST_HALF_LIFE = 7
+
+# Days of removal history read from the stock history log at startup
+# (older days have almost no weight left)
+FORECAST_WINDOW = 8 * FORECAST_HALF_LIFE
+
+# Returns the day number of a time
+def _day_number(when=None) -> int:
+    """Returns the day number (date.toordinal) of a time in seconds (default: today)"""
+    return (date.today() if when is None else date.fromtimestamp(when)).toordinal()
+
+# Formats days of supply for display
+def format_days_of_supply(days) -> str:
+    """Returns days of supply as a display suffix (ex. ' - Days Left: 12.5'), or '' for None"""
+    return f" - Days Left: {days:.1f}" if days is not None else ""
+
+class ConsumptionForecast:
+    """
+        Daily consumption rate of each item, from its removals
+
+        Removals are added up per day, and each item's rate (units per day) is an
+        exponentially smoothed average of its daily totals, so recent days count the most
+        and a day's weight halves every half_life_days. Days with no removals count as 0.
+
+        Each item only stores its smoothed rate up to its last removal day plus that day's
+        total, so recording a removal is O(1) and get_rates recomputes every item in one
+        pass using a table of decay factors. Rates are cached until a removal is recorded
+        or the day changes
+    """
+    def __init__(self, half_life_days:float = FORECAST_HALF_LIFE):
+        # Weight kept by the previous days' average each day
+        self.decay = 0.5 ** (1 / half_life_days)
+        # key -> [smoothed total up to the day before last_day, last_day, last_day total, first_day]
+        self.state = {}
+        # Increases on every recorded removal
+        self.version = 0
+        # Cached rates: (version, day, {key: units per day})
+        self.cache = None
+
+    # Records units removed from an item
+    def record_removal(self, key, quantity:int, when=None):
+        """
+            Adds quantity to the units removed from key on the day of when (seconds, default: now)
+            A negative quantity takes back units (ex. an undone removal)
+        """
+        day = _day_number(when)
+        state = self.state.get(key)
+        if state is None:
+            self.state[key] = [0.0, day, quantity, day]
+        elif day > state[1]:
+            # Fold the last day into the average, then the empty days in between
+            alpha = 1 - self.decay
+            state[0] = (state[0] * self.decay + alpha * state[2]) * self.decay ** (day - state[1] - 1)
+            state[1] = day
+            state[2] = quantity
+        else:
+            # Same day (or an older day, which is counted as the last day)
+            state[2] += quantity
+        self.version += 1
+
+    # Returns the consumption rate of every item
+    def get_rates(self, today=None):
+        """
+            Returns {key: units removed per day} as of today (day number, default: today)
+            Today only counts once it has removals, so rates don't drop every morning.
+            The average is divided by the total weight of the days since the item's first
+            removal, so a new item's rate isn't pulled toward 0 by days before it existed
+        """
+        today = _day_number() if today is None else today
+        if self.cache is not None and self.cache[0] == self.version and self.cache[1] == today:
+            return self.cache[2]
+
+        decay = self.decay
+        alpha = 1 - decay
+
+        # Decay factors by number of days (looked up instead of computed per item)
+        span = max((today - state[3] + 1 for state in self.state.values()), default=0)
+        powers = [1.0]
+        for _ in range(span):
+            powers.append(powers[-1] * decay)
+
+        rates = {}
+        for key, (smoothed, last_day, total, first_day) in self.state.items():
+            end = today if last_day == today else today - 1
+            days = end - last_day
+            if days < 0:
+                continue
+            rate = (smoothed * decay + alpha * total) * powers[days] / (1 - powers[end - first_day + 1])
+            if rate > 0:
+                rates[key] = rate
+
+        self.cache = (self.version, today, rates)
+        return rates
+
+    # Returns the consumption rate of each food group
+    def get_group_rates(self, keys, today=None):
+        """Returns {food group: units removed per day} for the given item keys"""
+        rates = self.get_rates(today)
+        groups = {}
+        for key in keys:
+            rate = rates.get(key)
+            if rate:
+                food_group = normalize_food_group(key[2]) or key[2].title()
+                groups[food_group] = groups.get(food_group, 0) + rate
+        return groups
+
+    # Combines the history of several keys into one
+    def merge_keys(self, keys, new_key):
+        """
+            Replaces the state of keys with one state under new_key (ex. after 16 oz and 1 lb
+            of an item are merged), as if every removal had been recorded under new_key
+            Smoothing is linear, so each state is brought up to the latest day and added up
+        """
+        states = [self.state.pop(key) for key in keys if key in self.state]
+        if not states:
+            return
+
+        last_day = max(state[1] for state in states)
+        alpha = 1 - self.decay
+        smoothed = 0.0
+        total = 0
+        for state in states:
+            if state[1] == last_day:
+                smoothed += state[0]
+                total += state[2]
+            else:
+                # Fold the state's last day into its average, then decay it to the day before last_day
+                smoothed += (state[0] * self.decay + alpha * state[2]) * self.decay ** (last_day - state[1] - 1)
+
+        self.state[new_key] = [smoothed, last_day, total, min(state[3] for state in states)]
+        self.version += 1
@@ -0,0 +1,141 @@
+from collections import deque
+from config import HISTORY_LIMIT
+
+class History:
+    """
+        Bounded undo/redo history of inventory changes
+
+        Each change is stored as a compact record (tuple):
+        (changes, before_state, after_state)
+
+        changes: tuple of (key, delta, item, lots), one per changed item (a batch like a
+        quick entry manifest is one record, so it's undone and redone as one change)
+            key: inventory key of the changed item
+            delta: change in quantity (positive = added, negative = removed)
+            item: the Item object when the change created or deleted the item, otherwise None
+            lots: the lots added (for an add) or consumed (for a removal)
+        before_state/after_state: ids of the inventory state before and after the change
+
+        Memory is capped by the total number of item changes stored in both stacks (a batch
+        of 1000 items counts as 1000), not the number of records. Once the cap is passed, the
+        oldest undo records are dropped (the newest record is always kept, so the last change
+        can be undone)
+    """
+    def __init__(self, max_changes:int = HISTORY_LIMIT):
+        # Maximum number of item changes kept in both stacks
+        self.max_changes = max_changes
+        # Number of item changes in both stacks
+        self.change_count = 0
+        # Changes that can be undone (most recent on the right)
+        self.undo_stack = deque()
+        # Changes that can be redone (most recently undone on the right)
+        self.redo_stack = deque()
+        # Id of the current inventory state
+        self.state = 0
+        # Last state id handed out (state ids are never reused)
+        self.last_state = 0
+        # Id of the state that matches the saved file (None = no saved state)
+        self.saved_state: int | None = 0
+
+    # Records a new change
+    def record(self, key, delta:int, item=None, lots=None):
+        """Records a change to one item (see record_batch)"""
+        self.record_batch([(key, delta, item, lots)])
+
+    # Records a batch of changes as one change
+    def record_batch(self, changes):
+        """
+            Records changes (list of (key, delta, item, lots)) as one record
+            Recording a new change clears the redo stack, then the oldest records are dropped
+            while more than max_changes item changes are stored
+        """
+        changes = tuple(changes)
+        self.last_state += 1
+        self.undo_stack.append((changes, self.state, self.last_state))
+        self.change_count += len(changes) - sum(len(record[0]) for record in self.redo_stack)
+        self.redo_stack.clear()
+        self.state = self.last_state
+
+        # Drop the oldest records until the stored changes fit the cap
+        while self.change_count > self.max_changes and len(self.undo_stack) > 1:
+            self.change_count -= len(self.undo_stack.popleft()[0])
+
+    # Pops the most recent change to undo
+    def undo(self):
+        """Returns the most recent change record and moves it to the redo stack (None if empty)"""
+        if not self.undo_stack:
+            return None
+        record = self.undo_stack.pop()
+        self.redo_stack.append(record)
+        self.state = record[1]
+        return record
+
+    # Pops the most recently undone change to redo
+    def redo(self):
+        """Returns the most recently undone record and moves it to the undo stack (None if empty)"""
+        if not self.redo_stack:
+            return None
+        record = self.redo_stack.pop()
+        self.undo_stack.append(record)
+        self.state = record[2]
+        return record
+
+    # Returns True if there is a change to undo
+    def can_undo(self) -> bool:
+        """Returns True if there is a change to undo"""
+        return bool(self.undo_stack)
+
+    # Returns True if there is a change to redo
+    def can_redo(self) -> bool:
+        """Returns True if there is a change to redo"""
+        return bool(self.redo_stack)
+
+    # Marks the current state as saved
+    def mark_saved(self):
+        """Marks the current state as the saved state"""
+        self.saved_state = self.state
+
+    # Marks that no state in history matches the saved file
+    def mark_unsaved(self):
+        """Marks that no state in history matches the saved file"""
+        self.saved_state = None
+
+    # Returns True if the current state matches the saved state
+    def is_saved(self) -> bool:
+        """Returns True if the current state matches the saved state"""
+        return self.state == self.saved_state
+
+    # Drops the changes to some keys
+    def drop_keys(self, keys):
+        """
+            Removes every record that changed one of keys (ex. items changed outside this program),
+            so other changes can still be undone and redone
+            Records that changed the same items as a removed record are removed too, since
+            undoing or redoing them depended on it
+            Returns the number of records removed
+        """
+        removed = 0
+        self.change_count = 0
+        for stack in (self.undo_stack, self.redo_stack):
+            # Records are undone/redone from the right, so later records are checked first
+            dropped = set(keys)
+            kept = []
+            for record in reversed(stack):
+                record_keys = {change[0] for change in record[0]}
+                if record_keys & dropped:
+                    dropped |= record_keys
+                    removed += 1
+                else:
+                    kept.append(record)
+                    self.change_count += len(record[0])
+            stack.clear()
+            stack.extend(reversed(kept))
+        return removed
+
+    # Clears all history
+    def clear(self):
+        """Clears both stacks and marks the current state as saved"""
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.change_count = 0
+        self.saved_state = self.state
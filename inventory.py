@@ -1,22 +1,236 @@
 import csv
+import os
+import time
+from itertools import chain, islice
+from operator import itemgetter
+from datetime import date
 from item import Item
-from measurements import format_unit
+from history import History, HISTORY_LIMIT
+from expiration import ExpirationIndex, parse_date, format_date
+from low_stock import LowStockIndex
+from lots import Lot, LotIndex, format_lots, parse_lots
+from reports import build_reports
+from exporters import read_rows, write_rows, file_fingerprint
+from parse_cache import make_cache_key, load_cache, save_cache, remove_cache
+from forecast import ConsumptionForecast, FORECAST_WINDOW, format_days_of_supply
+from bitmap_index import BitmapIndex
+from locations import LocationIndex, format_location, plan_route, route_distance
+from measurements import canonical_weight
+from events import EventBus, InventoryEvent, ADDED, REMOVED, DELETED, LOADED, SAVED
+from inventory_view import InventoryView
+
+# Column headers for inventory csv files
+# expiration, reorder_at, location, and lots are optional when loading (older files don't have them)
+# lots stays last since it's the longest column (fixed-width files don't pad the last column)
+CSV_FIELDNAMES = ["name", "container", "food_group", "weight", "quantity", "expiration", "reorder_at", "location", "lots"]
+
+# Extension added to the inventory filename for the delta (changes only) file
+DELTA_EXTENSION = ".delta"
+
+# Number of delta saves before the delta file is compacted into a full save
+DELTA_COMPACT_EVERY = 10
+
+# Makes the inventory key of an item
+def make_item_key(name, container, food_group, weight, canonical_units:bool = False):
+    """
+        Returns the key of an item: (name, container, food_group, weight), lowercase
+        With canonical_units, the weight is converted to its base unit (ex. 1 lb --> 0.453592 kg)
+        Used by Inventory.make_key, and by tools that key file rows without an Inventory
+    """
+    if canonical_units:
+        weight = canonical_weight(weight)
+    return (name.lower(), container.lower(), food_group.lower(), weight.lower())
+
+# Returns the fields of an item that are saved to a file
+def item_values(item, reorder_at=None):
+    """
+        Returns (quantity, expiration, reorder_at, location, lots) of item as saved to a file,
+        so two versions of an item can be compared field by field
+        reorder_at: the item's reorder threshold (None if it has none)
+    """
+    return (item.quantity, format_date(item.expiration), "" if reorder_at is None else str(reorder_at),
+            item.location or "", format_lots(item.lots))
+
+# Attributes items can be sorted by, and their position in the item key (None = not in the key)
+SORT_ATTRIBUTES = {"name": 0, "container": 1, "food_group": 2, "weight": 3, "quantity": None}
 
 class Inventory:
-    def __init__(self):
+    def __init__(self, history_limit:int = HISTORY_LIMIT, canonical_units:bool = False):
         # A dictionary of items
         self.items = {}
+        # True if keys use canonical weights, so equivalent sizes (ex. 16 oz and 1 lb) are one item
+        self.canonical_units = canonical_units
         # Current file inventory is saved as (by deafult is None)
         self.current_file:str | None = None
         # Tracks unsaved changes
         self.changed = False
+        # Undo/redo history of changes (bounded by history_limit item changes)
+        self.history = History(history_limit)
+        # Net quantity change per key since the last save/load (dirty keys)
+        self.pending_changes = {}
+        # Keys with other unsaved edits since the last save/load: key -> set of edits
+        # (ex. {"location changed"}); these are saved with a full save
+        self.edited_keys = {}
+        # Saved fields (item_values, None if the item didn't exist) of keys with unsaved changes,
+        # taken before their first change, so outside edits to the file can be told apart (see watcher.py)
+        self.saved_values = {}
+        # Number of delta saves and rows written to the delta file since the last full save
+        self.delta_saves = 0
+        self.delta_rows = 0
+        # Min-heap index of items by expiration date
+        self.expiration_index = ExpirationIndex(self.items)
+        # Index of items at or below their reorder threshold
+        self.low_stock = LowStockIndex(self.items)
+        # Index of lot id -> keys holding that lot (for recalls)
+        self.lot_index = LotIndex(self.items)
+        # Bitmap indexes of items by food group, container, unit, and quantity (for filters)
+        self.bitmap_index = BitmapIndex(self.items)
+        # Spatial index of items by bin location (for pick routes and nearby items)
+        self.location_index = LocationIndex(self.items)
+        # Mutation version number (increases on every change or load)
+        # Every changed item gets the new version too (see Item.version and get_item_version)
+        self.version = 0
+        # Cached reports: group_by -> (version, report)
+        self.report_cache = {}
+        # Cached sort orders: (sort_by, reverse) -> (version, sorted keys)
+        self.sort_cache = {}
+        # Fingerprint of the current file (and its delta file) when it was last loaded/saved
+        self.file_fingerprint = None
+        # Subscribers to change events (added, removed, deleted, loaded, saved)
+        self.events = EventBus()
+        # Log of stock level changes over time (None = not recorded, see set_stock_history)
+        self.stock_history = None
+        # Smoothed daily consumption rate of each item (from removals)
+        self.forecast = ConsumptionForecast()
 
     # Inventory Management
 
     # Makes a key based on name, container, food_group, and size
     def make_key(self, name, container, food_group, weight):
-        """Makes a key based on the components of the item"""
-        return (name.lower(), container.lower(), food_group.lower(), weight.lower())
+        """
+            Makes a key based on the components of the item
+            With canonical units, the weight is converted to its base unit (ex. 1 lb --> 0.453592 kg)
+        """
+        return make_item_key(name, container, food_group, weight, self.canonical_units)
+
+    # Finds items by name, container, and weight
+    def find_keys(self, name, container, weight):
+        """
+            Returns the keys of items with the same name, container, and weight (any food group)
+            With canonical units, equivalent weights match (ex. 16 oz finds a 1 lb item)
+        """
+        name, container, _, weight = self.make_key(name, container, "", weight)
+        return [key for key in self.items if key[0] == name and key[1] == container and key[3] == weight]
+
+    # Returns the weight of an item as it was entered
+    def get_display_weight(self, key):
+        """Returns the weight of the item under key as entered (ex. 1 lb, not 0.453592 kg), or key's weight if it's gone"""
+        item = self.items.get(key)
+        return item.weight if item is not None else key[3]
+
+    # Turns on canonical units
+    def enable_canonical_units(self):
+        """
+            Turns on canonical units and merges items with equivalent sizes
+            Returns the number of items merged into another item
+        """
+        self.canonical_units = True
+        return self.merge_equivalent_units()
+
+    # Merges items with equivalent sizes in one pass
+    def merge_equivalent_units(self):
+        """
+            Re-keys every item with its canonical weight and merges items that end up with
+            the same key (ex. 16 oz and 1 lb rice). The item with the most units keeps its
+            display weight, and lots (with their expiration dates) are combined oldest first
+
+            Keys change, so history is cleared and the next save is a full save
+            Returns the number of items merged into another item
+        """
+        # Group keys by canonical key
+        groups = {}
+        for key in self.items:
+            canonical_key = (key[0], key[1], key[2], canonical_weight(key[3]).lower())
+            groups.setdefault(canonical_key, []).append(key)
+
+        # Nothing to do if every key is already canonical
+        if all(keys == [new_key] for new_key, keys in groups.items()):
+            return 0
+
+        items = {}
+        thresholds = {}
+        changes = []
+        merged = 0
+        for new_key, keys in groups.items():
+            # The item with the most units keeps its display weight
+            keys.sort(key=lambda key: self.items[key].quantity, reverse=True)
+            quantities = [self.items[key].quantity for key in keys]
+            item = self.items[keys[0]]
+            others = [self.items[key] for key in keys[1:]]
+            if others:
+                quantity = item.quantity + sum(other.quantity for other in others)
+                lots = sorted(chain(item.lots, *(other.lots for other in others)),
+                              key=lambda lot: lot.donation_date or date.min)
+                item.set_lots(lots, quantity)
+                if item.location is None:
+                    item.location = next((other.location for other in others if other.location), None)
+                self.forecast.merge_keys(keys, new_key)
+                merged += len(others)
+            elif keys[0] != new_key:
+                self.forecast.merge_keys(keys, new_key)
+            items[new_key] = item
+
+            # Keep the first reorder threshold found
+            for key in keys:
+                if key in self.low_stock.item_thresholds:
+                    thresholds[new_key] = self.low_stock.item_thresholds[key]
+                    break
+
+            # Record the units moved to the new key (for subscribers)
+            moved = [(key, -quantity) for key, quantity in zip(keys, quantities) if key != new_key]
+            if moved:
+                changes.extend(moved)
+                changes.append((new_key, -sum(delta for _, delta in moved)))
+
+        # Replace the items (the indexes keep a reference to the same dictionary)
+        self.items.clear()
+        self.items.update(items)
+        self.low_stock.item_thresholds.clear()
+        self.low_stock.item_thresholds.update(thresholds)
+
+        # Rebuild the indexes like a load, and make the next save a full save
+        self._rebuild_indexes()
+        self.version += 1
+        for key, _ in changes:
+            self._stamp_version(key)
+        self.history.clear()
+
+        # Move unsaved quantity changes and edits to the new keys
+        pending = {}
+        for key, delta in self.pending_changes.items():
+            new_key = (key[0], key[1], key[2], canonical_weight(key[3]).lower())
+            pending[new_key] = pending.get(new_key, 0) + delta
+        self.pending_changes.clear()
+        self.pending_changes.update((key, delta) for key, delta in pending.items() if delta)
+        edited = {}
+        for key, edits in self.edited_keys.items():
+            new_key = (key[0], key[1], key[2], canonical_weight(key[3]).lower())
+            edited.setdefault(new_key, set()).update(edits)
+        self.edited_keys = edited
+        self.saved_values.clear()
+        for new_key, keys in groups.items():
+            if len(keys) > 1:
+                self._mark_edited(new_key, "sizes merged")
+
+        self.delta_saves = DELTA_COMPACT_EVERY
+        if changes:
+            self.set_changed(True)
+
+        # Log the new stock levels and tell subscribers
+        self.sync_stock_history()
+        if self.events.active and changes:
+            self.events.publish([self._change_event(key, delta) for key, delta in changes])
+        return merged
 
     # Change Tracking
 
@@ -32,8 +246,197 @@ class Inventory:
     
     # Sets changed flag based on boolean value (True or False)
     def set_changed(self, value:bool):
-        """Sets the changed flag to True or False"""
+        """
+            Sets the changed flag to True or False
+            False marks the current history position as saved
+        """
         self.changed = value
+        if value:
+            self.history.mark_unsaved()
+        else:
+            self.history.mark_saved()
+
+    # Updates changed flag from the history position
+    def sync_changed(self):
+        """Sets the changed flag based on whether the current history position is the saved one"""
+        self.changed = not self.history.is_saved()
+
+    # Updates change tracking and indexes after a key changes
+    def _on_change(self, key, delta:int, removal:bool = False):
+        """
+            Bumps the version, marks key as dirty, updates the low stock and bitmap indexes, and logs the change
+            removal: True for a removal (or an undone/redone removal), which counts toward consumption
+        """
+        if removal:
+            self._on_changes(removals=[(key, delta)])
+        else:
+            self._on_changes([(key, delta)])
+
+    # Updates change tracking and indexes after a batch of changes
+    def _on_changes(self, changes=(), removals=()):
+        """
+            Same as _on_change for lists of (key, delta), but the version is bumped once
+            (so cached reports and sort orders are rebuilt once per batch) and subscribers
+            get one batch of events
+            changes: changes that aren't removals (additions, undone removals)
+            removals: removals (and undone/redone removals), which count toward consumption
+        """
+        self.version += 1
+        for key, delta in removals:
+            self.forecast.record_removal(key, -delta)
+        for key, delta in chain(removals, changes):
+            self._stamp_version(key)
+            self._track_change(key, delta)
+            self.low_stock.update(key)
+            self.bitmap_index.update(key)
+            self.location_index.update(key)
+        if self.stock_history is not None:
+            if removals:
+                self.stock_history.record_many(removals, removal=True)
+            if changes:
+                self.stock_history.record_many(changes)
+
+        # Events are only built when someone is subscribed
+        if self.events.active:
+            self.events.publish([self._change_event(key, delta) for key, delta in chain(removals, changes)])
+
+    # Marks an item as changed at the current version
+    def _stamp_version(self, key):
+        """Sets the version of the item under key (if it's in inventory) to the inventory's version"""
+        item = self.items.get(key)
+        if item is not None:
+            item.version = self.version
+
+    # Returns the version of an item
+    def get_item_version(self, key):
+        """
+            Returns the version of the item under key, or None if it's not in inventory
+            Pass it back as expected_version (remove_item) or in expected_versions (remove_items)
+            so the change is rejected if the item was changed in between (ex. by another
+            station while user was typing a quantity)
+        """
+        item = self.items.get(key)
+        return item.version if item is not None else None
+
+    # Builds the event for a change
+    def _change_event(self, key, delta:int):
+        """Returns an added, removed, or deleted (no units left) InventoryEvent for a change to key"""
+        if delta > 0:
+            kind = ADDED
+        elif key in self.items:
+            kind = REMOVED
+        else:
+            kind = DELETED
+        return InventoryEvent(kind, key, delta)
+
+    # Sends a loaded or saved event
+    def _publish_file_event(self, kind, filename):
+        """Sends a loaded/saved InventoryEvent for filename to subscribers"""
+        if self.events.active:
+            self.events.publish([InventoryEvent(kind, filename=filename)])
+
+    # Tracks the net change of a key since the last save
+    def _track_change(self, key, delta:int):
+        """
+            Adds delta to the net pending change of key
+            Keys whose changes cancel out are no longer dirty
+        """
+        net = self.pending_changes.get(key, 0) + delta
+        if net:
+            self.pending_changes[key] = net
+        else:
+            self.pending_changes.pop(key, None)
+
+    # Remembers the saved fields of a key before its first unsaved change
+    def _remember_saved(self, key):
+        """Stores the item's current fields as its saved version if it has no unsaved changes yet"""
+        if key not in self.saved_values:
+            self.saved_values[key] = self.get_item_values(key)
+
+    # Returns the fields of an item that are saved to a file
+    def get_item_values(self, key):
+        """Returns item_values of the item under key (with its reorder threshold), or None if it's not in inventory"""
+        item = self.items.get(key)
+        if item is None:
+            return None
+        return item_values(item, self.low_stock.item_thresholds.get(key))
+
+    # Returns the fields of an item as of the last save/load
+    def get_saved_values(self, key):
+        """Returns item_values of the item under key as it was at the last save/load (None if it didn't exist)"""
+        return self.saved_values.get(key, self.get_item_values(key))
+
+    # Checks if a key has unsaved changes
+    def has_unsaved_change(self, key) -> bool:
+        """Returns True if the item under key has an unsaved quantity change or other edit"""
+        return key in self.pending_changes or key in self.edited_keys
+
+    # Forgets the unsaved changes of a key
+    def clear_unsaved(self, key):
+        """Marks the item under key as matching the saved file (ex. the file has the same change)"""
+        self.pending_changes.pop(key, None)
+        self.edited_keys.pop(key, None)
+        self.saved_values.pop(key, None)
+
+    # Keeps an item's unsaved version over a different saved version
+    def keep_unsaved(self, key, saved_values):
+        """
+            Makes saved_values (see item_values, None = no item) the saved version of the item under key
+            and keeps the item as it is now as an unsaved change
+            (used when a conflict with an outside edit is resolved in favor of this program)
+        """
+        mine = self.get_item_values(key)
+        self.pending_changes.pop(key, None)
+        self.saved_values[key] = saved_values
+
+        # Quantity changes go in the delta file, other differences need a full save
+        delta = (mine[0] if mine else 0) - (saved_values[0] if saved_values else 0)
+        if delta:
+            self.pending_changes[key] = delta
+        if (mine or (0,))[1:] != (saved_values or (0,))[1:] and key not in self.edited_keys:
+            self._mark_edited(key, "kept over outside change")
+
+    # Records an edit that isn't a quantity change
+    def _mark_edited(self, key, edit:str):
+        """
+            Marks key as having an unsaved edit (ex. "location changed") and makes the next save a full save
+            (delta files only hold quantity changes)
+        """
+        self.edited_keys.setdefault(key, set()).add(edit)
+        self.set_changed(True)
+        self.delta_saves = DELTA_COMPACT_EVERY
+
+    # Returns keys with unsaved edits other than quantity changes
+    def get_edited_keys(self):
+        """Returns {key: sorted list of edits} for unsaved edits like locations and reorder thresholds"""
+        return {key: sorted(edits) for key, edits in self.edited_keys.items()}
+
+    # Returns True if there is anything to save
+    def has_unsaved_changes(self) -> bool:
+        """Returns True if any quantity changes or other edits haven't been saved"""
+        return bool(self.pending_changes or self.edited_keys)
+
+    # Returns keys of items changed since the last save that are still in inventory
+    def get_dirty_keys(self):
+        """Returns a list of keys changed since the last save that are still in inventory"""
+        return [key for key in self.pending_changes if key in self.items]
+
+    # Returns keys of items deleted since the last save
+    def get_deleted_keys(self):
+        """Returns a list of keys deleted from inventory since the last save"""
+        return [key for key in self.pending_changes if key not in self.items]
+
+    # Returns a list of pending changes
+    def get_pending_changes(self):
+        """
+            Returns a list of (key, net_delta, quantity) for every item changed since the last save
+            quantity is the current quantity (0 if the item was deleted)
+        """
+        changes = []
+        for key, delta in self.pending_changes.items():
+            item = self.items.get(key)
+            changes.append((key, delta, item.quantity if item else 0))
+        return changes
 
     # Returns changed flag boolean value (True or False)
     def get_changed(self):
@@ -41,59 +444,439 @@ class Inventory:
         return self.changed
 
     # Add item to inventory
-    def add_item(self, name, container, food_group, weight, quantity):
+    def add_item(self, name, container, food_group, weight, quantity, expiration=None, lot=None):
         """
             Adds items to inventory
             Checks if the item is in the inventory
             Makes sure the user isn't trying to remove more than there is in the inventory
             Deletes the item from inventory if there isn't any more of the item (quantity = 0)
+            expiration (datetime.date) is optional; it's stored with the added units' lot,
+            so older units keep their own dates
+            lot (Lot) is optional; its quantity is replaced by quantity. By default the units
+            are added as an unnamed lot donated today
+            Raises ValueError if quantity is not a whole number greater than 0 (like add_items)
         """
+        if not isinstance(quantity, int) or quantity <= 0:
+            raise ValueError("Quantity must be a whole number greater than 0.")
+
         # Compound key (tuple) to check if item added is already in inventory
         # Checks by name, category, and size
         key = self.make_key(name, container, food_group, weight)
-        
+        self._remember_saved(key)
+
+        # Units are added as the newest lot of the item
+        lot = lot.copy(quantity) if lot else Lot("", date.today(), "", quantity)
+        if expiration is not None:
+            lot.expiration = expiration
+
+        # Add to inventory, keeping the new Item (if one was created) for undo
+        created = self._merge_item(key, name, container, food_group, weight, 0)
+        self._put_lots(key, created, [lot], newest=True)
+
+        # Record change in history and mark key as dirty
+        self.history.record(key, quantity, created, [lot])
+        self._on_change(key, quantity)
+
+        # Reflects that a change has been made to inventory
+        self.sync_changed()
+
+    # Adds many items to inventory at once
+    def add_items(self, entries):
+        """
+            Adds a batch of items to inventory
+            entries: iterable of (name, container, food_group, weight, quantity[, expiration[, lot]])
+            (the same arguments as add_item)
+
+            Entries for the same item are added up first, so each item is changed once.
+            Every entry is checked before anything is added; if any quantity is invalid,
+            ValueError lists every bad entry and inventory is not changed.
+            The batch counts as one change for versions, caches, and the stock history log
+        """
+        self.change_items(entries, ())
+
+    # Checks and adds up entries of a batch addition
+    def _collect_additions(self, entries, errors):
+        """
+            Returns {key: [name, container, food_group, weight, total quantity, lots]} for add_items entries
+            A message is appended to errors for each invalid entry
+        """
+        # Add up entries by key, keeping the first spelling of each item
+        batch = {}
+        for number, entry in enumerate(entries, start=1):
+            name, container, food_group, weight, quantity, *extra = entry
+            if not isinstance(quantity, int) or quantity <= 0:
+                errors.append(f"Entry {number}: quantity must be a whole number greater than 0.")
+                continue
+            expiration = extra[0] if extra else None
+            lot = extra[1] if len(extra) > 1 else None
+
+            key = self.make_key(name, container, food_group, weight)
+            pending = batch.get(key)
+            if pending is None:
+                pending = batch[key] = [name, container, food_group, weight, 0, []]
+            pending[4] += quantity
+            # Each entry is its own lot, with its own expiration date
+            lot = lot.copy(quantity) if lot else Lot("", date.today(), "", quantity)
+            if expiration is not None:
+                lot.expiration = expiration
+            pending[5].append(lot)
+        return batch
+
+    # Adds quantity to an item without recording history
+    def _merge_item(self, key, name, container, food_group, weight, quantity, expiration=None, lots=None):
+        """
+            Adds quantity to the item under key, creating the item if needed
+            lots (optional) are the lots of the added quantity, oldest first
+            expiration (optional) is given to the added lots if none of them has a date
+            Returns the new Item if one was created, otherwise None
+        """
         # If it's the same item (name, category, size), add to the quantity
         if key in self.items:
-            self.items[key].quantity += quantity
-        # Otherwise, add the new item to the inventory
-        else:
-            self.items[key] = Item(name, container, food_group, weight, quantity)
+            item = self.items[key]
+            before = item.expiration
+            # Build the added units as an Item so its lots add up to quantity
+            added = Item(name, container, food_group, weight, quantity, expiration, lots)
+            for lot in added.lots:
+                item.add_lot(lot)
+            self.lot_index.add(key, item.lots)
 
-        # Reflects that a change has been made to inventory
-        self.set_changed(True)
+            # Re-index the item if the added lots expire first, so it isn't missed in expiring soon
+            if item.expiration != before:
+                self.expiration_index.push(key, item)
+            return None
+
+        # Otherwise, add the new item to the inventory
+        item = Item(name, container, food_group, weight, quantity, expiration, lots)
+        self.items[key] = item
+        self.expiration_index.push(key, item)
+        self.lot_index.add(key, item.lots)
+        return item
 
     # Remove item from inventory
-    def remove_item(self, name, container, food_group, weight, quantity):
+    def remove_item(self, name, container, food_group, weight, quantity, expected_version=None):
         """
             Removes items from inventory
             Checks if the item is in the inventory
             Makes sure the user isn't trying to remove more than there is in the inventory
             Deletes the item from inventory if there isn't any more of the item (quantity = 0)
+            Units are taken from the oldest lot first (FIFO)
+            expected_version (optional) is the item's version when it was read (get_item_version);
+            if the item changed since then, nothing is removed
+            Returns True if the units were removed, otherwise False
+            Raises ValueError if quantity is not a whole number greater than 0 (like remove_items)
         """
-        
+        if not isinstance(quantity, int) or quantity <= 0:
+            raise ValueError("Quantity must be a whole number greater than 0.")
+
         key = self.make_key(name, container, food_group, weight)
 
         # If item is in inventory, subtract from the quantity
         if key in self.items:
+            item = self.items[key]
+
+            # If the item changed since it was read, reject the stale removal
+            if expected_version is not None and item.version != expected_version:
+                print(f"{name.title()} was changed since it was read. Nothing was removed.")
+                return False
+
             # If user tries to remove a valid quantity (not asking for more than available), remove that amount
-            if quantity <= self.items[key].quantity:
-                self.items[key].quantity -= quantity
+            # oldest lots first
+            # If the quantity is <= 0, the item has run out and is removed from the inventory (items dictionary)
+            if quantity <= item.quantity:
+                consumed = self._take_lots(key, quantity, newest=False)
             # Otherwise, print error message and exit
             else:
-                print(f"Cannot remove {quantity}. Only {self.items[key].quantity} available.")
-                return
+                print(f"Cannot remove {quantity}. Only {item.quantity} available.")
+                return False
 
-            # If the quantity is <= 0, the item has run out and is removed from the inventory (items dictionary)
-            if self.items[key].quantity <= 0:
-                del self.items[key]
+            # The removed Item is kept in history so the deletion can be undone
+            deleted = item if key not in self.items else None
+
+            # Record change in history (with the consumed lots) and mark key as dirty
+            self.history.record(key, -quantity, deleted, consumed)
+            self._on_change(key, -quantity, removal=True)
 
             # Reflects that a change has been made to inventory
-            self.set_changed(True)
+            self.sync_changed()
+            return True
+
+        # Otherwise, the item is not in inventory (ex. another station removed the last units)
+        print(f"{name.title()} is not in inventory. Nothing was removed.")
+        return False
+
+    # Removes many items from inventory at once
+    def remove_items(self, entries, expected_versions=None):
+        """
+            Removes a batch of items from inventory (oldest lots first, like remove_item)
+            entries: iterable of (name, container, food_group, weight, quantity)
+            expected_versions (optional): dictionary of key -> item version when it was read;
+            items that changed since then count as problems
+
+            Entries for the same item are added up first, so each item is changed once.
+            Every item is checked before anything is removed; if any item is missing or
+            doesn't have enough units, ValueError lists every problem and inventory is not changed.
+            The batch counts as one change for versions, caches, and the stock history log
+        """
+        self.change_items((), entries, expected_versions)
+
+    # Checks and adds up entries of a batch removal
+    def _collect_removals(self, entries, errors, expected_versions=None):
+        """
+            Returns {key: total quantity} for remove_items entries
+            A message is appended to errors for each invalid entry and each item that is missing,
+            changed since it was read, or short of units
+        """
+        # Add up quantities by key
+        batch = {}
+        # Weight as entered for each key (used in error messages)
+        weights = {}
+        for number, (name, container, food_group, weight, quantity) in enumerate(entries, start=1):
+            if not isinstance(quantity, int) or quantity <= 0:
+                errors.append(f"Entry {number}: quantity must be a whole number greater than 0.")
+                continue
+            key = self.make_key(name, container, food_group, weight)
+            batch[key] = batch.get(key, 0) + quantity
+            weights.setdefault(key, weight)
+
+        # Check every item before removing anything
+        for key, quantity in batch.items():
+            item = self.items.get(key)
+            if item is None:
+                errors.append(f"{key[0].title()} ({key[1].title()}, {key[2].title()}, {weights[key]}) is not in inventory.")
+            elif expected_versions is not None and key in expected_versions and item.version != expected_versions[key]:
+                errors.append(f"{key[0].title()} was changed since it was read.")
+            elif quantity > item.quantity:
+                errors.append(f"Cannot remove {quantity} {key[0].title()}. Only {item.quantity} available.")
+        return batch
+
+    # Adds and removes many items at once
+    def change_items(self, additions, removals, expected_versions=None):
+        """
+            Applies a batch of removals and additions as one change
+            additions: entries as for add_items
+            removals: entries as for remove_items (expected_versions as for remove_items)
+
+            Every entry is checked before anything is changed; if any entry is invalid, ValueError
+            lists every problem and inventory is not changed. Removals are applied first (so a
+            removal can't take units the batch adds), then additions.
+            The whole batch is one history record (undone at once) and one batch of events
+        """
+        errors = []
+        removal_batch = self._collect_removals(removals, errors, expected_versions)
+        addition_batch = self._collect_additions(additions, errors)
+        if errors:
+            raise ValueError("\n".join(errors))
+
+        records = []
+
+        # Remove each item's total, oldest lots first
+        removed = []
+        for key, quantity in removal_batch.items():
+            self._remember_saved(key)
+            item = self.items[key]
+            consumed = self._take_lots(key, quantity, newest=False)
+            deleted = item if key not in self.items else None
+            records.append((key, -quantity, deleted, consumed))
+            removed.append((key, -quantity))
+
+        # Add each item's total as its newest lots
+        added = []
+        for key, (name, container, food_group, weight, quantity, lots) in addition_batch.items():
+            self._remember_saved(key)
+            created = self._merge_item(key, name, container, food_group, weight, 0)
+            self._put_lots(key, created, lots, newest=True)
+            records.append((key, quantity, created, lots))
+            added.append((key, quantity))
+
+        if records:
+            self.history.record_batch(records)
+            self._on_changes(added, removed)
+            self.sync_changed()
+
+    # Undo/Redo
+
+    # Undoes the most recent change
+    def undo(self):
+        """
+            Undoes the most recent change (a whole batch for add_items/remove_items)
+            Returns the undone change record (changes, ...) or None if there is nothing to undo
+        """
+        record = self.history.undo()
+        if record is None:
+            return None
+
+        # Apply the opposite of each recorded change, newest first
+        # An add is undone by taking back the newest units, a removal by restoring the consumed lots
+        for key, delta, item, lots in reversed(record[0]):
+            if delta > 0:
+                self._take_lots(key, delta, newest=True)
+            else:
+                self._put_lots(key, item, lots, newest=False)
+        self._on_record(record[0], undo=True)
+
+        self.sync_changed()
+        return record
+
+    # Redoes the most recently undone change
+    def redo(self):
+        """
+            Redoes the most recently undone change (a whole batch for add_items/remove_items)
+            Returns the redone change record (changes, ...) or None if there is nothing to redo
+        """
+        record = self.history.redo()
+        if record is None:
+            return None
+
+        # Apply each recorded change again
+        for key, delta, item, lots in record[0]:
+            if delta > 0:
+                self._put_lots(key, item, lots, newest=True)
+            else:
+                self._take_lots(key, -delta, newest=False)
+        self._on_record(record[0], undo=False)
+
+        self.sync_changed()
+        return record
+
+    # Updates change tracking after undoing or redoing a record
+    def _on_record(self, changes, undo:bool):
+        """
+            Calls _on_changes for the changes of a history record (negated when undone)
+            Undone or redone removals count toward consumption, so they're passed separately
+        """
+        sign = -1 if undo else 1
+        added = [(key, sign * delta) for key, delta, _, _ in changes if delta > 0]
+        removed = [(key, sign * delta) for key, delta, _, _ in changes if delta < 0]
+        self._on_changes(added, removed)
+
+    # Adds lots to an item without recording history
+    def _put_lots(self, key, item, lots, newest:bool):
+        """
+            Adds lots to the item under key, as the newest lots or in front as the oldest lots
+            If the key is missing, item (from the history record) is put back first
+        """
+        self._remember_saved(key)
+
+        # Item is missing (it was created or deleted by this change), so put it back
+        if key not in self.items:
+            self.items[key] = item
+
+        target = self.items[key]
+        before = target.expiration
+        if newest:
+            for lot in lots:
+                target.add_lot(lot)
+        else:
+            target.restore_oldest(lots)
+        self.lot_index.add(key, lots)
+
+        # The item's expiration date is its earliest lot's, so it may have moved
+        if target is item or target.expiration != before:
+            self.expiration_index.push(key, target)
+
+    # Takes units from an item without recording history
+    def _take_lots(self, key, quantity:int, newest:bool):
+        """
+            Takes quantity units from the item under key, from the oldest lots (FIFO)
+            or from the newest lots (to undo an add)
+            If the quantity reaches 0, the item is removed
+            Returns the taken units as a list of Lots
+        """
+        self._remember_saved(key)
+        item = self.items[key]
+        before = item.expiration
+        taken = item.take_newest(quantity) if newest else item.consume(quantity)
+        if item.quantity <= 0:
+            del self.items[key]
+        # The item's expiration date is its earliest lot's, so it may have moved
+        elif item.expiration != before:
+            self.expiration_index.push(key, item)
+        return taken
+
+    # Returns every item holding units of a lot
+    def recall_lot(self, lot_id):
+        """Returns a sorted list of (key, quantity) for every item holding units of lot_id"""
+        return self.lot_index.recall(lot_id)
 
     # Returns a list of item values in inventory
     def get_all_items(self):
-        """Return a list of all Items values in inventory"""
-        return list(self.items.values())
+        """
+            Return a list of all Items values in inventory
+            Copies the whole inventory; use iter_items to go through items without a copy
+        """
+        return list(self.iter_items())
+
+    # Iteration
+
+    # Checks for changes while iterating
+    def _check_version(self, iterable):
+        """
+            Yields from iterable, raising RuntimeError if the inventory changes (version bump)
+            before the next value is asked for, like a dictionary changed during iteration
+        """
+        version = self.version
+        for value in iterable:
+            yield value
+            if self.version != version:
+                raise RuntimeError("Inventory changed during iteration.")
+
+    # Goes through items without copying them
+    def iter_items(self):
+        """
+            Yields each Item in inventory (insertion order) without copying the inventory
+            Raises RuntimeError if the inventory changes during iteration
+        """
+        return self._check_version(self.items.values())
+
+    # Returns the keys of items in sorted order
+    def _sorted_keys(self, sort_by:str, reverse:bool):
+        """
+            Returns a list of keys sorted by sort_by (cached until the inventory changes)
+            Name, container, food group, and weight are part of the key, so keys are sorted
+            without looking up their items
+        """
+        cached = self.sort_cache.get((sort_by, reverse))
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+
+        position = SORT_ATTRIBUTES[sort_by]
+        if position is None:
+            items = self.items
+            keys = sorted(items, key=lambda key: getattr(items[key], sort_by), reverse=reverse)
+        else:
+            keys = sorted(self.items, key=itemgetter(position), reverse=reverse)
+        self.sort_cache[(sort_by, reverse)] = (self.version, keys)
+        return keys
+
+    # Goes through items in sorted order
+    def iter_sorted(self, sort_by:str = "name", reverse:bool = False):
+        """
+            Yields each Item sorted by sort_by ("name", "container", "food_group", "weight", or "quantity")
+            Only the keys are sorted (and cached until the inventory changes); items are not copied
+            Raises RuntimeError if the inventory changes during iteration
+        """
+        if sort_by not in SORT_ATTRIBUTES:
+            sort_by = "name"
+        items = self.items
+        return self._check_version(items[key] for key in self._sorted_keys(sort_by, reverse))
+
+    # Returns one page of items
+    def iter_page(self, offset:int, limit:int, sort_by=None, reverse:bool = False):
+        """
+            Yields up to limit Items starting at position offset
+            sort_by (optional): sort order (see iter_sorted); None = insertion order
+            Sorted pages are sliced from the cached sort order, so each page costs O(limit)
+            Raises RuntimeError if the inventory changes during iteration
+        """
+        if offset < 0 or limit < 0:
+            raise ValueError("Offset and limit cannot be negative.")
+        if sort_by is None:
+            return islice(self.iter_items(), offset, offset + limit)
+        if sort_by not in SORT_ATTRIBUTES:
+            sort_by = "name"
+        items = self.items
+        keys = self._sorted_keys(sort_by, reverse)
+        return self._check_version(items[key] for key in keys[offset:offset + limit])
 
     # Returns the total quantity of items in inventory
     def get_total_quantity(self) -> int:
@@ -124,13 +907,14 @@ class Inventory:
             print("Inventory is empty.")
             return
 
-        # Copy inventory items to temp local variable
-        all_items = self.get_all_items()
+        # Consumption rates of every item (computed once for the whole list)
+        rates = self.get_consumption_rates()
 
         # Print each item from inventory
-        for item in all_items:
-            formatted_weight = format_unit(item.weight)
-            print(f"{item.name.title()} ({formatted_weight}, {item.container.title()}, {item.food_group.title()}) - Qty: {item.quantity}")
+        for item in self.iter_items():
+            expiration = f" - Exp: {format_date(item.expiration)}" if item.expiration else ""
+            days_left = format_days_of_supply(self.get_days_of_supply(item, rates))
+            print(f"{item.get_display()}{expiration}{days_left}")
 
     # Displays total values (unique items and total quantity)
     def display_totals(self):
@@ -145,42 +929,90 @@ class Inventory:
 
     # CSV Functions
 
+    # Returns the delta filename for an inventory file
+    def get_delta_file(self, filename):
+        """Returns the name of the delta file that goes with filename"""
+        return filename + DELTA_EXTENSION
+
     # Load inventory from csv file
     def load_inventory_from_csv(self, filename):
-        """Load items from a CSV file to the inventory"""
+        """
+            Load items from a CSV file to the inventory
+            Compressed CSV, JSON Lines, and fixed-width files (see exporters.py) are detected
+            and loaded the same way
+            If a delta file exists for the CSV, its changes are applied on top
+
+            The parsed file is cached next to it (see parse_cache.py), keyed by its path, size,
+            modified time, and content hash, so an unchanged file is loaded without parsing it
+        """
         # Try to read the csv file
         try:
-            # Open the CSV file for reading with UTF-8 encoding.
-            # 'newline=""' ensures consistent line endings across OSes.
-            # Using 'with' automatically closes the file when done.
-            with open(filename, 'r', newline='', encoding='utf-8') as file:
-                # Create a CSV DictReader to read each row as a dictionary
-                reader = csv.DictReader(file)
-
-                # Clear current items in inventory
+            # Check the file exists before clearing the current inventory
+            if not os.path.exists(filename):
+                raise FileNotFoundError(filename)
+
+            # Keep the current items so a failed load can put them back
+            previous = (dict(self.items), dict(self.low_stock.item_thresholds), self.delta_saves, self.delta_rows)
+
+            # Fingerprint the file and its delta file once (used for the cache and the watcher)
+            fingerprint = file_fingerprint([filename, self.get_delta_file(filename)])
+            cache_key = make_cache_key(filename, fingerprint[0][0], fingerprint[1][0], self.canonical_units)
+            cached = load_cache(filename, cache_key)
+
+            # Clear current items and item thresholds in inventory
+            self.items.clear()
+            self.low_stock.item_thresholds.clear()
+
+            try:
+                # Use the cached items if the file hasn't changed, otherwise parse it
+                if cached is not None:
+                    self.items.update(cached[0])
+                    self.low_stock.item_thresholds.update(cached[1])
+                else:
+                    self._read_items(read_rows(filename, CSV_FIELDNAMES))
+
+                # Apply changes saved to the delta file (if any)
+                self.delta_saves = 0
+                self.delta_rows = self._load_delta_file(self.get_delta_file(filename))
+
+                # Build the expiration, low stock, lot, bitmap, and location indexes in one pass
+                self._rebuild_indexes()
+            # If anything fails, put the previous items back so items and indexes still match
+            except BaseException:
+                items, thresholds, self.delta_saves, self.delta_rows = previous
                 self.items.clear()
+                self.items.update(items)
+                self.low_stock.item_thresholds.clear()
+                self.low_stock.item_thresholds.update(thresholds)
+                self._rebuild_indexes()
+                raise
 
-                # Iterate through each row
-                for row in reader:
-                    # Store data from the row to variables
-                    name = row["name"]
-                    container = row["container"]
-                    food_group = row["food_group"]
-                    weight = row["weight"]
-                    quantity = int(row["quantity"])
+            # Cache the parsed file only after it loaded without errors
+            if cached is None:
+                save_cache(filename, cache_key, self.items, self.low_stock.item_thresholds)
 
-                    # Add item to inventory
-                    self.add_item(name, container, food_group, weight, quantity)
+            # Loaded inventory starts with a new version, a fresh history, and no pending changes
+            self.version += 1
+            for item in self.items.values():
+                item.version = self.version
+            self.history.clear()
+            self.pending_changes.clear()
+            self.edited_keys.clear()
+            self.saved_values.clear()
+
+            # Ensures that the inventory changed flag stays False since loading doesn't count as a change
+            self.set_changed(False)
 
-                # Ensures that the inventory changed flag stays False since loading doesn't count as a change
-                # load function calls on add_item function in inventory, which makes changed flag true
-                self.set_changed(False)
+            # Sets current file to filename and remembers its fingerprint
+            self.set_current_file(filename)
+            self.file_fingerprint = fingerprint
 
-                # Sets current file to filename
-                self.set_current_file(filename)
+            # Log the loaded stock levels
+            self.sync_stock_history()
+            self._publish_file_event(LOADED, filename)
 
-                # Print confirmation message that inventory loaded successfully from csv file
-                print(f"\nInventory loaded from '{filename}'.\n")
+            # Print confirmation message that inventory loaded successfully from csv file
+            print(f"\nInventory loaded from '{filename}'.\n")
 
         # CSV file does not exist or is not found in directory
         except FileNotFoundError:
@@ -192,13 +1024,218 @@ class Inventory:
         except Exception as e:
             raise RuntimeError(f"Unexpected error: {e}")
 
+    # Rebuilds every index from the items
+    def _rebuild_indexes(self):
+        """Rebuilds the expiration, low stock, lot, bitmap, and location indexes from scratch"""
+        self.expiration_index.rebuild()
+        self.low_stock.rebuild()
+        self.lot_index.rebuild()
+        self.bitmap_index.rebuild()
+        self.location_index.rebuild()
+
+    # Adds the rows of an inventory file to inventory
+    def _read_items(self, rows):
+        """
+            Adds each row (a dictionary with CSV_FIELDNAMES) to inventory
+            Rows with the same key are merged; loading is not recorded in history
+        """
+        for row in rows:
+            # Store data from the row to variables
+            name = row["name"]
+            container = row["container"]
+            food_group = row["food_group"]
+            weight = row["weight"]
+            quantity = int(row["quantity"])
+            # Expiration, reorder threshold, and lots columns are optional
+            expiration = parse_date(row.get("expiration"))
+            reorder_at = row.get("reorder_at")
+            location = row.get("location") or None
+            lots = parse_lots(row.get("lots"))
+
+            # Add item to inventory (loading is not recorded in history)
+            key = self.make_key(name, container, food_group, weight)
+            self._merge_item(key, name, container, food_group, weight, quantity, expiration, lots)
+            # A threshold of 0 is kept (JSON Lines files store it as the number 0)
+            if reorder_at not in (None, ""):
+                self.low_stock.item_thresholds[key] = int(reorder_at)
+            if location:
+                self.items[key].location = location
+
+    # Applies the rows of a delta file to inventory
+    def _load_delta_file(self, delta_filename):
+        """
+            Applies each row of the delta file to inventory in order
+            Each row holds the new quantity of an item (0 = item deleted)
+            Returns the number of rows applied (0 if there is no delta file)
+        """
+        if not os.path.exists(delta_filename):
+            return 0
+
+        rows = 0
+        with open(delta_filename, 'r', newline='', encoding='utf-8') as file:
+            for row in csv.DictReader(file):
+                key = self.make_key(row["name"], row["container"], row["food_group"], row["weight"])
+                self._set_from_row(key, row)
+                rows += 1
+        return rows
+
+    # Sets an item from a file row
+    def _set_from_row(self, key, row):
+        """
+            Sets the item under key to match a file row (quantity, expiration, reorder_at, location, and lots)
+            A row with quantity 0 (or None for row) deletes the item
+            Does not record history or update indexes
+        """
+        quantity = int(row["quantity"]) if row else 0
+
+        # Quantity of 0 means the item was deleted
+        if quantity <= 0:
+            self.items.pop(key, None)
+            return
+
+        expiration = parse_date(row.get("expiration"))
+        location = row.get("location") or None
+        lots = parse_lots(row.get("lots"))
+        if row.get("reorder_at") not in (None, ""):
+            self.low_stock.item_thresholds[key] = int(row["reorder_at"])
+
+        # Set the item's quantity, expiration, and lots (creating it if needed)
+        if key in self.items:
+            self.items[key].set_lots(lots, quantity, expiration)
+            self.items[key].location = location
+        else:
+            self.items[key] = Item(row["name"], row["container"], row["food_group"], row["weight"],
+                                   quantity, expiration, lots, location)
+
+    # Applies a change made to the file outside this program
+    def apply_external_row(self, key, row):
+        """
+            Sets the item under key to match a row read from the file (None deletes it)
+            Updates the indexes, but is not recorded in history or pending changes
+        """
+        before = self.items[key].quantity if key in self.items else 0
+        self._set_from_row(key, row)
+        # The file's version is now the saved version
+        self.saved_values.pop(key, None)
+        self.version += 1
+        self._stamp_version(key)
+
+        item = self.items.get(key)
+        if item is not None:
+            self.expiration_index.push(key, item)
+            self.lot_index.add(key, item.lots)
+        self.low_stock.update(key)
+        self.bitmap_index.update(key)
+        self.location_index.update(key)
+
+        # Log the change in stock level and tell subscribers
+        delta = (item.quantity if item else 0) - before
+        if self.stock_history is not None:
+            self.stock_history.record(key, delta)
+        if self.events.active and delta:
+            self.events.publish([self._change_event(key, delta)])
+
+    # Returns the files that make up the current inventory file
+    def get_current_files(self):
+        """Returns [current file, its delta file] (empty list if there is no current file)"""
+        if not self.current_file:
+            return []
+        return [self.current_file, self.get_delta_file(self.current_file)]
+
+    # Remembers the fingerprint of the current file
+    def update_fingerprint(self):
+        """Stores the fingerprint (stats and content hashes) of the current file and its delta file"""
+        self.file_fingerprint = file_fingerprint(self.get_current_files())
+
+    # Saves only the changed items to the delta file
+    def save_inventory_delta(self, filename):
+        """
+            Appends the current quantity of each changed item to the delta file of filename
+            Deleted items are written with a quantity of 0
+            The base CSV (filename) is not rewritten
+        """
+        delta_filename = self.get_delta_file(filename)
+        write_header = not os.path.exists(delta_filename)
+
+        # Append so earlier delta saves are kept; later rows override earlier ones on load
+        with open(delta_filename, 'a', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            if write_header:
+                writer.writerow(CSV_FIELDNAMES)
+
+            for key, _, quantity in self.get_pending_changes():
+                # Items are written with their own fields (keys may hold canonical weights)
+                item = self.items.get(key)
+                name, container, food_group, weight = (
+                    (item.name, item.container, item.food_group, item.weight) if item else key)
+                expiration = format_date(item.expiration) if item else ""
+                location = (item.location or "") if item else ""
+                lots = format_lots(item.lots) if item else ""
+                writer.writerow([name, container, food_group, weight, quantity, expiration,
+                                 self.low_stock.item_thresholds.get(key, ""), location, lots])
+
+        rows = len(self.pending_changes)
+        self.delta_saves += 1
+        self.delta_rows += rows
+
+        print(f"\nSaved {rows} changed item(s) to '{delta_filename}'.")
+        self.update_fingerprint()
+
+        # Reflects that changes have been saved
+        self.pending_changes.clear()
+        self.edited_keys.clear()
+        self.saved_values.clear()
+        self.set_changed(False)
+        self._publish_file_event(SAVED, filename)
+
+    # Saves changes using a delta save when possible
+    def save_changes(self, filename):
+        """
+            Saves changes to filename
+
+            If filename is the current file and it exists, only changed items are written
+            to the delta file. Every DELTA_COMPACT_EVERY delta saves (or when the delta file
+            holds more rows than half the inventory), a full save compacts everything back
+            into the CSV file
+        """
+        # Delta save only works on top of the file the inventory was loaded from/saved to
+        can_delta = (filename == self.current_file and os.path.exists(filename)
+                     and self.pending_changes and self.items)
+
+        if not can_delta:
+            self.save_inventory_to_csv(filename)
+            return
+
+        # Compact if the delta file has grown too much
+        too_many_saves = self.delta_saves + 1 >= DELTA_COMPACT_EVERY
+        too_many_rows = self.delta_rows + len(self.pending_changes) > len(self.items) // 2
+        if too_many_saves or too_many_rows:
+            self.save_inventory_to_csv(filename)
+        else:
+            self.save_inventory_delta(filename)
+
+    # Yields each item as a row of values
+    def iter_rows(self):
+        """
+            Yields a list of values (in CSV_FIELDNAMES order) for each item in inventory
+            Raises RuntimeError if the inventory changes during iteration
+        """
+        thresholds = self.low_stock.item_thresholds
+        for key, item in self._check_version(self.items.items()):
+            yield [item.name, item.container, item.food_group, item.weight, item.quantity,
+                   format_date(item.expiration), thresholds.get(key, ""), item.location or "", format_lots(item.lots)]
+
     # Saves the inventory data to a CSV file
     def save_inventory_to_csv(self, filename):
         """
             Saves the current inventory data to a csv file
 
             CSV file will have the following information on each row:
-            name, container, food_group, weight, and quantity
+            name, container, food_group, weight, quantity, expiration, reorder_at, location, and lots
+
+            Filenames ending in .csv.gz, .csv.xz, .jsonl, .jsonl.gz, or .txt (fixed-width)
+            are saved in that format instead (see exporters.py)
+            Rows are streamed to the file without building a list or dictionary per row
 
             If the inventory is empty, a message is printed and no file is created
         """
@@ -208,36 +1245,266 @@ class Inventory:
             print("\nInventory is empty. Nothing to save.\n")
             return
 
-        # Open the CSV file for writing
-        # 'newline=""' ensures consistent line endings for the csv module
-        # 'encoding="utf-8"' allows special characters in item names
-        # 'with' ensures the file is automatically closed when done
-        with open(filename, 'w', newline='', encoding='utf-8') as file:
-            # Define the column headers for the csv file
-            fieldnames = ["name", "container", "food_group", "weight", "quantity"]
-
-            # Create a DictWriter to write dictionaries as rows in the CSV file
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-
-            # Write the header row
-            writer.writeheader()
-
-            # Loop through all items in the inventory
-            for item in self.get_all_items():
-                # Write each item as a row in the CSV file
-                writer.writerow({
-                    "name": item.name,
-                    "container": item.container,
-                    "food_group": item.food_group,
-                    "weight": item.weight,
-                    "quantity": item.quantity    
-                })
-
-            # Print confirmation message
-            print(f"\nInventory saved to '{filename}'. Make sure to check the file in the same directory.")
-
-            # Reflects that changes have been saved, so the changed flag gets reset to False
-            self.set_changed(False)
+        # Write every item to the file
+        write_rows(filename, CSV_FIELDNAMES, self.iter_rows)
+
+        # Print confirmation message
+        print(f"\nInventory saved to '{filename}'. Make sure to check the file in the same directory.")
+
+        # A full save includes every change, so the delta file is no longer needed
+        delta_filename = self.get_delta_file(filename)
+        if os.path.exists(delta_filename):
+            os.remove(delta_filename)
+        # The parse cache is for the old file (the next load caches the new one)
+        remove_cache(filename)
+        self.delta_saves = 0
+        self.delta_rows = 0
+
+        # Sets current file to filename and remembers its fingerprint
+        self.set_current_file(filename)
+        self.update_fingerprint()
+
+        # Reflects that changes have been saved, so the changed flag gets reset to False
+        self.pending_changes.clear()
+        self.edited_keys.clear()
+        self.saved_values.clear()
+        self.set_changed(False)
+        self._publish_file_event(SAVED, filename)
+
+    # Expiration Functions
+
+    # Returns the next items to expire
+    def get_next_expiring(self, n:int = 10):
+        """Returns a list of the n items that expire first (earliest first)"""
+        return [self.items[key] for _, key in self.expiration_index.next_expiring(n)]
+
+    # Returns items expiring before a date
+    def get_expiring_before(self, cutoff):
+        """Returns a list of items that expire before cutoff (datetime.date), earliest first"""
+        return [self.items[key] for _, key in self.expiration_index.expiring_before(cutoff)]
+
+    # Removes all expired units from inventory
+    def remove_expired(self, today=None):
+        """
+            Removes the units of every lot that expired before today (default: today's date) as one batch
+            Units from lots that haven't expired stay, even if they're the same item
+            The batch is recorded as one change, so one undo puts it all back
+            Returns a list of (key, quantity) removed
+        """
+        today = today or date.today()
+        removed = []
+        records = []
+        for _, key in self.expiration_index.expired(today):
+            self._remember_saved(key)
+            item = self.items[key]
+            expired = item.take_expired(today)
+            quantity = sum(lot.quantity for lot in expired)
+            if item.quantity <= 0:
+                del self.items[key]
+            else:
+                self.expiration_index.push(key, item)
+            deleted = item if key not in self.items else None
+            records.append((key, -quantity, deleted, expired))
+            removed.append((key, quantity))
+
+        if removed:
+            self.history.record_batch(records)
+            self._on_changes(removals=[(key, -quantity) for key, quantity in removed])
+            self.sync_changed()
+        return removed
+
+    # Stock History Functions
+
+    # Sets the stock history log
+    def set_stock_history(self, stock_history):
+        """
+            Sets the StockHistory that every change in stock level is recorded to (None stops recording)
+            Consumption forecasts are rebuilt from the removals in its last FORECAST_WINDOW days
+        """
+        self.stock_history = stock_history
+        self.sync_stock_history()
+
+        self.forecast = ConsumptionForecast()
+        if stock_history is not None:
+            start = time.time() - FORECAST_WINDOW * 24 * 60 * 60
+            for when, key, quantity in stock_history.iter_removals(start):
+                self.forecast.record_removal(key, quantity, when)
+
+    # Records the current stock levels in the stock history
+    def sync_stock_history(self):
+        """Records any difference between the stock history and the current items (ex. after a load)"""
+        if self.stock_history is not None:
+            self.stock_history.sync({key: item.quantity for key, item in self.items.items()})
+
+    # Returns stock held per food group between two times
+    def get_stock_history_report(self, start, end):
+        """
+            Returns {food group: [start quantity, end quantity, added, removed, average]}
+            between start and end (seconds), or None if stock history is not recorded
+        """
+        if self.stock_history is None:
+            return None
+        return self.stock_history.summarize_by_food_group(start, end)
+
+    # Forecast Functions
+
+    # Returns the consumption rate of every item
+    def get_consumption_rates(self):
+        """Returns {key: smoothed units removed per day} (items never removed are left out)"""
+        return self.forecast.get_rates()
+
+    # Returns how many days an item's stock will last
+    def get_days_of_supply(self, item, rates=None):
+        """
+            Returns item quantity / consumption rate, or None if the item has no removals
+            rates: result of get_consumption_rates (pass it when looking up many items)
+        """
+        if rates is None:
+            rates = self.get_consumption_rates()
+        rate = rates.get(self.make_key(item.name, item.container, item.food_group, item.weight))
+        return item.quantity / rate if rate else None
+
+    # Returns how many days each food group's stock will last
+    def get_group_days_of_supply(self):
+        """Returns {food group: total quantity / total consumption rate} for food groups with removals"""
+        rates = self.forecast.get_group_rates(self.items.keys())
+        report = self.get_report("food_group")
+        return {group: report[(group,)][1] / rate for group, rate in rates.items() if (group,) in report}
+
+    # Low Stock Functions
+
+    # Sets the reorder threshold of one item
+    def set_reorder_threshold(self, key, threshold):
+        """
+            Sets the reorder threshold of the item under key (None removes it)
+            Item thresholds are saved in the CSV file, so this counts as a change
+        """
+        self._remember_saved(key)
+        self.low_stock.set_item_threshold(key, threshold)
+        self._mark_edited(key, "reorder threshold changed")
+
+    # Sets the reorder threshold of a food group
+    def set_group_reorder_threshold(self, food_group, threshold):
+        """Sets the reorder threshold for every item in a food group (None removes it)"""
+        self.low_stock.set_group_threshold(food_group, threshold)
+
+    # Returns the low stock report
+    def get_low_stock(self):
+        """Returns a list of (key, quantity, threshold) for items at or below their threshold, most urgent first"""
+        return self.low_stock.report()
+
+    # Report Functions
+
+    # Returns group-by reports
+    def get_reports(self, group_bys):
+        """
+            Returns {group_by: {group values (tuple): [item count, total quantity]}}
+            group_bys: list of tuples of dimensions ("food_group", "container", "unit")
+
+            Reports are cached until the inventory changes; any reports not in the cache
+            are built together in a single pass over the items
+            Returned reports are shared with the cache and should not be modified
+        """
+        group_bys = [tuple(group_by) for group_by in group_bys]
+
+        # Find reports that are missing or out of date
+        stale = []
+        for group_by in group_bys:
+            cached = self.report_cache.get(group_by)
+            if cached is None or cached[0] != self.version:
+                stale.append(group_by)
+
+        # Build all stale reports in one pass
+        if stale:
+            for group_by, report in build_reports(self.items.values(), stale).items():
+                self.report_cache[group_by] = (self.version, report)
+
+        return {group_by: self.report_cache[group_by][1] for group_by in group_bys}
+
+    # Returns one group-by report
+    def get_report(self, *group_by):
+        """
+            Returns {group values (tuple): [item count, total quantity]} grouped by the given dimensions
+            Ex: get_report("food_group", "unit")
+        """
+        return self.get_reports([group_by])[group_by]
+
+    # Creates a what-if view of the inventory
+    def create_view(self):
+        """
+            Returns a copy-on-write InventoryView of the inventory
+            Changes made to the view don't touch the inventory until view.commit()
+        """
+        return InventoryView(self)
+
+    # Location Functions
+
+    # Sets the bin location of an item
+    def set_location(self, key, location):
+        """
+            Sets the bin location of the item under key (ex. B-12-3); None or "" removes it
+            Raises ValueError if location is not valid (see locations.parse_location)
+            Locations are saved in the CSV file, so this counts as a change
+        """
+        location = format_location(location) if location else None
+        self._remember_saved(key)
+        self.items[key].location = location
+        self.version += 1
+        self._stamp_version(key)
+        self.location_index.update(key)
+        self._mark_edited(key, "location changed")
+
+    # Finds items near a bin
+    def get_items_near(self, location, max_distance:int):
+        """
+            Returns [(distance, key)] of items within max_distance of location (closest first)
+            Raises ValueError if location is not valid
+        """
+        return self.location_index.near(location, max_distance)
+
+    # Orders a pick list into a walking route
+    def get_pick_route(self, picks):
+        """
+            Orders picks (list of (key, quantity)) into a short route through the warehouse
+            that starts and ends at the dock (see locations.plan_route)
+
+            Returns (route, distance)
+            route: list of (key, quantity, location) in walking order; picks without a valid
+            location (or that aren't in inventory) come last, in the order given
+            distance: walking distance of the route
+        """
+        points = self.location_index.points
+        located = []
+        unlocated = []
+        for key, quantity in picks:
+            item = self.items.get(key)
+            if key in points:
+                located.append((key, quantity, item.location))
+            else:
+                unlocated.append((key, quantity, item.location if item is not None else None))
+
+        stops = [points[key] for key, _, _ in located]
+        order = plan_route(stops)
+        return [located[index] for index in order] + unlocated, route_distance(stops, order)
+
+    # Filter Functions
+
+    # Finds items matching filters
+    def query(self, food_group=None, container=None, unit=None, min_qty=None, max_qty=None):
+        """
+            Returns a list of items matching every given filter (AND)
+            food_group, container, unit: one value or a list of values (any of them match, OR)
+            min_qty/max_qty: quantity range (inclusive)
+            Ex: query(food_group=["veg", "fruit"], container="can", max_qty=10)
+            Raises ValueError for a negative quantity or min_qty greater than max_qty
+        """
+        if (min_qty is not None and min_qty < 0) or (max_qty is not None and max_qty < 0):
+            raise ValueError("Quantities cannot be negative.")
+        if min_qty is not None and max_qty is not None and min_qty > max_qty:
+            raise ValueError("Minimum quantity cannot be greater than maximum quantity.")
+
+        keys = self.bitmap_index.query(min_qty, max_qty, food_group=food_group, container=container, unit=unit)
+        return [self.items[key] for key in keys]
 
     # Returns a sorted list of items based on input
     def get_sorted_items(self, sort_by: str = "name", reverse: bool = False):
@@ -247,19 +1514,4 @@ class Inventory:
             Default: sort by "name" (alphabetical order)
             reverse: True = descending order, False = ascending order
         """
-        # Dictionary of keys that refer to what the program can sort by
-        valid_keys = {"name", "container", "food_group", "weight", "quantity"}
-
-        # Validate sort_by
-        if sort_by not in valid_keys:
-            sort_by = "name"
-
-        # Sort the items
-        return sorted(
-            # Get all items in inventory
-            self.get_all_items(),
-            # Sort by the attribute chosen in sort_by (name, container, food_group, etc.)
-            key=lambda item: getattr(item, sort_by),
-            # Set reverse to input (True = descending order, False = ascending order)
-            reverse = reverse
-        )
\ No newline at end of file
+        return list(self.iter_sorted(sort_by, reverse))
\ No newline at end of file
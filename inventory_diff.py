@@ -0,0 +1,222 @@
+import argparse
+import csv
+import os
+import tempfile
+from exporters import read_rows, write_rows, GZIP_MAGIC, XZ_MAGIC
+from config import load_canonical_units
+from inventory import make_item_key, CSV_FIELDNAMES, DELTA_EXTENSION
+
+# Approximate amount of file data held in memory at once (64 MB)
+# Larger inputs are split into partitions on disk by key hash
+PARTITION_BYTES = 64 * 1024 * 1024
+
+# Compressed files are assumed to expand by about this much
+COMPRESSION_RATIO = 8
+
+# Returns the inventory key of a row
+def _key(row, make_key):
+    """Returns the inventory key of a file row, built with make_key(name, container, food_group, weight)"""
+    return make_key(row["name"], row["container"], row["food_group"], row["weight"])
+
+# Returns the quantity of a row
+def _quantity(row) -> int:
+    """Returns the quantity of a row (0 if the row is None)"""
+    return int(row["quantity"]) if row else 0
+
+# Yields the rows of an inventory file and its delta file
+def iter_inventory_rows(filename, make_key=make_item_key):
+    """
+        Yields (key, row, replace) for every row of filename, then every row of its delta file
+        replace is True for delta file rows, which replace the item instead of adding to it
+        make_key: key function (ex. Inventory.make_key, so keys match that inventory's units mode)
+    """
+    for row in read_rows(filename, CSV_FIELDNAMES):
+        yield _key(row, make_key), row, False
+
+    delta_filename = filename + DELTA_EXTENSION
+    if os.path.exists(delta_filename):
+        with open(delta_filename, 'r', newline='', encoding='utf-8') as file:
+            for row in csv.DictReader(file):
+                yield _key(row, make_key), row, True
+
+# Combines rows by key
+def _collect(rows):
+    """
+        Returns {key: row} for (key, row, replace) rows, the same way a file is loaded:
+        duplicate rows add up, delta rows replace, and quantity 0 means deleted
+    """
+    items = {}
+    for key, row, replace in rows:
+        row = dict(row)
+        if not replace and key in items:
+            row["quantity"] = _quantity(items[key]) + _quantity(row)
+        if _quantity(row) > 0:
+            items[key] = row
+        else:
+            items.pop(key, None)
+    return items
+
+# Returns the number of partitions needed
+def _partition_count(filenames) -> int:
+    """Returns how many partitions keep each one under PARTITION_BYTES"""
+    total = 0
+    for filename in filenames:
+        for path in (filename, filename + DELTA_EXTENSION):
+            if not os.path.exists(path):
+                continue
+            with open(path, 'rb') as file:
+                magic = file.read(len(XZ_MAGIC))
+            compressed = magic.startswith(GZIP_MAGIC) or magic.startswith(XZ_MAGIC)
+            total += os.path.getsize(path) * (COMPRESSION_RATIO if compressed else 1)
+    return max(1, -(-total // PARTITION_BYTES))
+
+# Splits files into partitions by key
+def _partitioned(filenames, make_key):
+    """
+        Yields one list of {key: row} (one dictionary per file) for each partition
+
+        Small inputs are read into memory as one partition. Larger inputs are first split
+        on disk by key hash, so every key lands in the same partition for every file and
+        each partition fits in memory (hash join). Each row is read and written once, so
+        the whole pass is linear
+    """
+    count = _partition_count(filenames)
+    if count == 1:
+        yield [_collect(iter_inventory_rows(filename, make_key)) for filename in filenames]
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Write each file's rows to its partition files
+        paths = [[os.path.join(directory, f"{index}_{part}.csv") for part in range(count)]
+                 for index in range(len(filenames))]
+        for index, filename in enumerate(filenames):
+            files = [open(path, 'w', newline='', encoding='utf-8') for path in paths[index]]
+            try:
+                writers = [csv.writer(file) for file in files]
+                for key, row, replace in iter_inventory_rows(filename, make_key):
+                    values = [row.get(fieldname, "") for fieldname in CSV_FIELDNAMES]
+                    writers[hash(key) % count].writerow([int(replace)] + values)
+            finally:
+                for file in files:
+                    file.close()
+
+        # Read partitions back one at a time
+        for part in range(count):
+            partition = []
+            for index in range(len(filenames)):
+                with open(paths[index][part], 'r', newline='', encoding='utf-8') as file:
+                    rows = ((dict(zip(CSV_FIELDNAMES, values[1:])), values[0] == "1") for values in csv.reader(file))
+                    partition.append(_collect((_key(row, make_key), row, replace) for row, replace in rows))
+            yield partition
+
+# Compares two inventory files
+def diff_files(old_filename, new_filename, make_key=make_item_key):
+    """
+        Yields (key, old quantity, new quantity) for every item that differs between two files
+        old quantity 0 = added, new quantity 0 = removed
+        make_key: key function (ex. a live Inventory's make_key to match its canonical units mode)
+    """
+    for old_items, new_items in _partitioned([old_filename, new_filename], make_key):
+        for key in sorted(old_items.keys() | new_items.keys()):
+            old_quantity = _quantity(old_items.get(key))
+            new_quantity = _quantity(new_items.get(key))
+            if old_quantity != new_quantity:
+                yield key, old_quantity, new_quantity
+
+# Merges two edited versions of a common base file
+def merge_files(base_filename, ours_filename, theirs_filename, output_filename, make_key=make_item_key):
+    """
+        Three-way merge of inventory files, written to output_filename
+
+        For each item:
+        - if only one side changed it, that change is kept
+        - if both made the same change, it's kept once
+        - if both changed it differently, both changes are applied to the base quantity
+          (ex. base 20, ours 15, theirs 18 --> 13) and it's reported as a conflict
+
+        make_key: key function (ex. a live Inventory's make_key to match its canonical units mode)
+        Returns a list of conflicts as (key, base, ours, theirs, merged)
+    """
+    conflicts = []
+
+    # Can run more than once (see write_rows), so conflicts are found again each time
+    def merged_rows():
+        conflicts.clear()
+        for base_items, our_items, their_items in _partitioned([base_filename, ours_filename, theirs_filename], make_key):
+            for key in sorted(base_items.keys() | our_items.keys() | their_items.keys()):
+                base = _quantity(base_items.get(key))
+                ours = _quantity(our_items.get(key))
+                theirs = _quantity(their_items.get(key))
+
+                if ours == theirs or theirs == base:
+                    merged = ours
+                elif ours == base:
+                    merged = theirs
+                else:
+                    merged = max(0, ours + theirs - base)
+                    conflicts.append((key, base, ours, theirs, merged))
+
+                if merged > 0:
+                    row = our_items.get(key) or their_items.get(key) or base_items.get(key)
+                    values = [row.get(fieldname, "") for fieldname in CSV_FIELDNAMES]
+                    values[CSV_FIELDNAMES.index("quantity")] = merged
+                    yield values
+
+    write_rows(output_filename, CSV_FIELDNAMES, merged_rows)
+    return conflicts
+
+# Formats a key for display
+def _describe(key) -> str:
+    """Returns a key as: Name (Container, Food Group, weight)"""
+    name, container, food_group, weight = key
+    return f"{name.title()} ({container.title()}, {food_group.title()}, {weight})"
+
+def main():
+    """
+        Command line entry point
+        python inventory_diff.py OLD NEW
+        python inventory_diff.py --merge BASE OURS THEIRS -o OUTPUT
+    """
+    parser = argparse.ArgumentParser(description="Compare or merge inventory files.")
+    parser.add_argument("files", nargs="+", help="OLD NEW, or BASE OURS THEIRS with --merge")
+    parser.add_argument("--merge", action="store_true", help="three-way merge BASE OURS THEIRS")
+    parser.add_argument("-o", "--output", help="merged output file (required with --merge)")
+    parser.add_argument("--canonical-units", action="store_true",
+                        help="treat equivalent sizes (ex. 16 oz and 1 lb) as one item (default: from config.txt)")
+    args = parser.parse_args()
+
+    # Key rows the same way the program does
+    canonical_units = args.canonical_units or load_canonical_units()
+
+    def make_key(name, container, food_group, weight):
+        return make_item_key(name, container, food_group, weight, canonical_units)
+
+    if args.merge:
+        if len(args.files) != 3 or not args.output:
+            parser.error("--merge needs BASE OURS THEIRS and -o OUTPUT")
+        conflicts = merge_files(*args.files, args.output, make_key)
+        for key, base, ours, theirs, merged in conflicts:
+            print(f"CONFLICT {_describe(key)}: base {base}, ours {ours}, theirs {theirs} -> {merged}")
+        print(f"Merged into '{args.output}' with {len(conflicts)} conflict(s).")
+        return
+
+    if len(args.files) != 2:
+        parser.error("diff needs OLD NEW")
+
+    # Print each difference
+    # Ex: + Corn (Can, Vegetables, 12 oz): 10
+    counts = {"+": 0, "-": 0, "~": 0}
+    for key, old_quantity, new_quantity in diff_files(*args.files, make_key):
+        if old_quantity == 0:
+            symbol, detail = "+", f"{new_quantity}"
+        elif new_quantity == 0:
+            symbol, detail = "-", f"{old_quantity}"
+        else:
+            symbol, detail = "~", f"{old_quantity} -> {new_quantity} ({new_quantity - old_quantity:+d})"
+        counts[symbol] += 1
+        print(f"{symbol} {_describe(key)}: {detail}")
+    print(f"\n{counts['+']} added, {counts['-']} removed, {counts['~']} changed.")
+
+# Only run main when executing this program
+if __name__ == "__main__":
+    main()
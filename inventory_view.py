@@ -0,0 +1,192 @@
+from datetime import date
+from item import Item
+from lots import Lot
+from reports import build_reports
+
+class InventoryView:
+    """
+        A what-if copy of an Inventory that doesn't touch live stock
+        (ex. "if we give out 300 boxes, what's left?")
+
+        The view is copy-on-write: items it hasn't changed are read from the inventory,
+        and an item is copied into the view the first time the view changes it. Only
+        changed items are stored, so creating a view is O(1) and its memory grows with the
+        number of changed items, not the size of the inventory.
+
+        Unchanged items always show the inventory's current stock. The view also keeps the
+        net change of each key, so commit() applies the changes to the inventory's current
+        stock as a batch (even if the inventory changed since the view was made)
+    """
+    def __init__(self, inventory):
+        # Inventory the view reads from and commits to
+        self.inventory = inventory
+        # key -> the view's copy of the item (None = the item is gone in the view)
+        self.overrides = {}
+        # key -> net quantity change made in the view
+        self.changes = {}
+        # Inventory version when the view was created or last committed/discarded
+        self.base_version = inventory.version
+
+    # Returns an item as seen by the view
+    def get_item(self, key):
+        """Returns the item under key in the view, or None if it's not in the view"""
+        if key in self.overrides:
+            return self.overrides[key]
+        return self.inventory.items.get(key)
+
+    # Yields every item in the view
+    def iter_items(self):
+        """Yields (key, item) for every item in the view (unchanged items, then changed ones)"""
+        overrides = self.overrides
+        for key, item in self.inventory.items.items():
+            if key not in overrides:
+                yield key, item
+        for key, item in overrides.items():
+            if item is not None:
+                yield key, item
+
+    # Returns the total quantity of items in the view
+    def get_total_quantity(self) -> int:
+        """Returns the inventory's total quantity plus the view's net changes"""
+        return self.inventory.get_total_quantity() + sum(self.changes.values())
+
+    # Returns one group-by report of the view
+    def get_report(self, *group_by):
+        """Returns {group values: [item count, total quantity]} like Inventory.get_report"""
+        return build_reports((item for _, item in self.iter_items()), [group_by])[group_by]
+
+    # Returns the view's changes
+    def get_changes(self):
+        """Returns a list of (key, inventory quantity, view quantity) for every changed key"""
+        changes = []
+        for key in self.changes:
+            current = self.inventory.items.get(key)
+            item = self.overrides.get(key)
+            changes.append((key, current.quantity if current else 0, item.quantity if item else 0))
+        return changes
+
+    # Returns True if the inventory changed after the view was made
+    def parent_changed(self) -> bool:
+        """Returns True if the inventory changed since the view was created, committed, or discarded"""
+        return self.inventory.version != self.base_version
+
+    # Copies an item into the view before changing it
+    def _write(self, key):
+        """Returns the view's own copy of the item under key (None if it's not in the view)"""
+        if key not in self.overrides:
+            item = self.inventory.items.get(key)
+            self.overrides[key] = item.copy() if item is not None else None
+        return self.overrides[key]
+
+    # Records a change to a key
+    def _track_change(self, key, delta:int):
+        """Adds delta to the net change of key (keys whose changes cancel out are dropped)"""
+        net = self.changes.get(key, 0) + delta
+        if net:
+            self.changes[key] = net
+        else:
+            self.changes.pop(key, None)
+
+    # Adds units to the view
+    def add_item(self, name, container, food_group, weight, quantity:int, expiration=None, lot=None):
+        """
+            Adds quantity units of an item to the view (like Inventory.add_item)
+            Raises ValueError if quantity is not a whole number greater than 0
+        """
+        if not isinstance(quantity, int) or quantity <= 0:
+            raise ValueError("Quantity must be a whole number greater than 0.")
+
+        key = self.inventory.make_key(name, container, food_group, weight)
+        item = self._write(key)
+        if item is None:
+            item = self.overrides[key] = Item(name, container, food_group, weight, 0)
+        lot = lot.copy(quantity) if lot else Lot("", date.today(), "", quantity)
+        if expiration is not None:
+            lot.expiration = expiration
+        item.add_lot(lot)
+        self._track_change(key, quantity)
+
+    # Removes units from the view
+    def remove_item(self, name, container, food_group, weight, quantity:int):
+        """
+            Removes quantity units of an item from the view, oldest lots first (like Inventory.remove_item)
+            Raises ValueError if the item is not in the view or doesn't have enough units
+        """
+        self.remove_items([(name, container, food_group, weight, quantity)])
+
+    # Removes many items from the view at once
+    def remove_items(self, entries, expected_versions=None):
+        """
+            Removes a batch of items from the view (like Inventory.remove_items)
+            Every item is checked first; if any item is missing, changed since it was read
+            (expected_versions), or doesn't have enough units, ValueError lists every problem
+            and the view is not changed
+        """
+        # Add up quantities by key
+        batch = {}
+        errors = []
+        for number, (name, container, food_group, weight, quantity) in enumerate(entries, start=1):
+            if not isinstance(quantity, int) or quantity <= 0:
+                errors.append(f"Entry {number}: quantity must be a whole number greater than 0.")
+                continue
+            key = self.inventory.make_key(name, container, food_group, weight)
+            batch[key] = batch.get(key, 0) + quantity
+
+        # Check every item before removing anything
+        for key, quantity in batch.items():
+            item = self.get_item(key)
+            if item is None:
+                errors.append(f"{key[0].title()} ({key[1].title()}, {key[2].title()}, {key[3]}) is not in inventory.")
+            elif expected_versions is not None and key in expected_versions and item.version != expected_versions[key]:
+                errors.append(f"{key[0].title()} was changed since it was read.")
+            elif quantity > item.quantity:
+                errors.append(f"Cannot remove {quantity} {key[0].title()}. Only {item.quantity} available.")
+        if errors:
+            raise ValueError("\n".join(errors))
+
+        for key, quantity in batch.items():
+            item = self._write(key)
+            item.consume(quantity)
+            if item.quantity == 0:
+                self.overrides[key] = None
+            self._track_change(key, -quantity)
+
+    # Throws away the view's changes
+    def discard(self):
+        """Drops every change made in the view (it shows the inventory's current stock again)"""
+        self.overrides.clear()
+        self.changes.clear()
+        self.base_version = self.inventory.version
+
+    # Applies the view's changes to the inventory
+    def commit(self):
+        """
+            Applies the net change of every changed key to the inventory as one batch
+            (Inventory.change_items: one undo step and one batch of events), then empties the view
+
+            Raises ValueError (and changes nothing) if the inventory no longer has enough
+            units for a removal
+            Added units go in as the view item's newest lots, keeping their own dates
+        """
+        removals = []
+        additions = []
+        for key, delta in self.changes.items():
+            item = self.overrides.get(key) or self.inventory.items.get(key)
+            # Use the item's own fields (keys can hold canonical weights)
+            fields = (item.name, item.container, item.food_group, item.weight) if item else key
+            if delta < 0:
+                removals.append(fields + (-delta,))
+                continue
+
+            # The added units are the view item's newest lots
+            added = []
+            for lot in reversed(item.lots):
+                quantity = min(delta, lot.quantity)
+                added.append(fields + (quantity, None, lot))
+                delta -= quantity
+                if not delta:
+                    break
+            additions.extend(reversed(added))
+
+        self.inventory.change_items(additions, removals)
+        self.discard()
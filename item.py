@@ -1,7 +1,163 @@
+from collections import deque
+from lots import Lot
+from measurements import format_unit
+
 class Item:
-    def __init__(self, name, container, food_group, weight, quantity):
+    def __init__(self, name, container, food_group, weight, quantity, expiration=None, lots=None, location=None):
         self.name = name.lower()
         self.container = container.lower()
         self.food_group = food_group.lower()
         self.weight = weight.lower()
-        self.quantity = int(quantity)
\ No newline at end of file
+        # Warehouse bin location (ex. B-12-3) or None if the item has no location
+        self.location = location
+        # Donation batches of this item, oldest first (quantity is the total of all lots)
+        self.lots = deque()
+        self.quantity = 0
+        # Each lot keeps its own expiration date; expiration (optional) is given to the lots
+        # when none of them has a date (ex. rows from older files, which had one date per item)
+        self.set_lots(lots or [], int(quantity), expiration)
+        # Version of the item's data (Inventory sets it to its own version every time the
+        # item changes, so it only goes up, even if the item is deleted and added again)
+        self.version = 0
+        # Cached display strings (built the first time they're needed)
+        self._label = None
+        self._display = None
+        self._display_quantity = None
+
+    # Returns the item's expiration date
+    @property
+    def expiration(self):
+        """Returns the earliest expiration date of the item's lots (datetime.date), or None if no lot has one"""
+        return min((lot.expiration for lot in self.lots if lot.expiration is not None), default=None)
+
+    # Replaces the lots of the item
+    def set_lots(self, lots, quantity:int, expiration=None):
+        """
+            Sets the lots of the item and makes them add up to quantity
+            Missing units are added as an unknown lot (oldest), extra units are consumed oldest first
+            expiration (optional) is given to every lot if none of the lots has an expiration date
+        """
+        self.lots = deque(lot.copy() for lot in lots if lot.quantity > 0)
+        self.quantity = sum(lot.quantity for lot in self.lots)
+
+        if self.quantity < quantity:
+            self.restore_oldest([Lot("", None, "", quantity - self.quantity)])
+        elif self.quantity > quantity:
+            self.consume(self.quantity - quantity)
+
+        if expiration is not None and all(lot.expiration is None for lot in self.lots):
+            for lot in self.lots:
+                lot.expiration = expiration
+
+    # Returns a copy of the item
+    def copy(self):
+        """Returns a copy of the item with copies of its lots (changing one doesn't change the other)"""
+        item = Item(self.name, self.container, self.food_group, self.weight, self.quantity,
+                    lots=self.lots, location=self.location)
+        item.version = self.version
+        return item
+
+    # Adds a lot as the newest batch
+    def add_lot(self, lot):
+        """Adds a copy of lot as the newest batch (merged into the newest lot if it's the same batch)"""
+        if self.lots and self.lots[-1].same_batch(lot):
+            self.lots[-1].quantity += lot.quantity
+        else:
+            self.lots.append(lot.copy())
+        self.quantity += lot.quantity
+
+    # Removes units oldest batch first (FIFO)
+    def consume(self, quantity:int):
+        """
+            Removes quantity units starting from the oldest lot
+            Returns the removed units as a list of Lots (oldest first)
+        """
+        consumed = []
+        while quantity > 0 and self.lots:
+            oldest = self.lots[0]
+            # Oldest lot is used up, so remove it from the deque
+            if oldest.quantity <= quantity:
+                consumed.append(self.lots.popleft())
+                quantity -= oldest.quantity
+                self.quantity -= oldest.quantity
+            # Otherwise, take part of the oldest lot
+            else:
+                consumed.append(oldest.copy(quantity))
+                oldest.quantity -= quantity
+                self.quantity -= quantity
+                quantity = 0
+        return consumed
+
+    # Removes units newest batch first
+    def take_newest(self, quantity:int):
+        """
+            Removes quantity units starting from the newest lot (used to undo an add)
+            Returns the removed units as a list of Lots (oldest first)
+        """
+        taken = []
+        while quantity > 0 and self.lots:
+            newest = self.lots[-1]
+            if newest.quantity <= quantity:
+                taken.append(self.lots.pop())
+                quantity -= newest.quantity
+                self.quantity -= newest.quantity
+            else:
+                taken.append(newest.copy(quantity))
+                newest.quantity -= quantity
+                self.quantity -= quantity
+                quantity = 0
+        taken.reverse()
+        return taken
+
+    # Removes the units of expired batches
+    def take_expired(self, today):
+        """
+            Removes every lot that expires before today (datetime.date)
+            Returns the removed units as a list of Lots (oldest first)
+        """
+        expired = [lot for lot in self.lots if lot.expiration is not None and lot.expiration < today]
+        if expired:
+            self.lots = deque(lot for lot in self.lots if lot.expiration is None or lot.expiration >= today)
+            self.quantity -= sum(lot.quantity for lot in expired)
+        return expired
+
+    # Returns the number of units that expire before a date
+    def count_expiring(self, cutoff) -> int:
+        """Returns the number of units in lots that expire before cutoff (datetime.date)"""
+        return sum(lot.quantity for lot in self.lots if lot.expiration is not None and lot.expiration < cutoff)
+
+    # Puts lots back as the oldest batches
+    def restore_oldest(self, lots):
+        """Adds copies of lots (oldest first) in front of the current lots (used to undo a removal)"""
+        for lot in reversed(lots):
+            if self.lots and self.lots[0].same_batch(lot):
+                self.lots[0].quantity += lot.quantity
+            else:
+                self.lots.appendleft(lot.copy())
+            self.quantity += lot.quantity
+
+    # Returns the item's description for display
+    def get_label(self) -> str:
+        """
+            Returns the item as: Name (weight, Container, Food Group)
+            Name, container, food group, and weight never change, so it's built once and cached
+        """
+        if self._label is None:
+            self._label = f"{self.name.title()} ({format_unit(self.weight)}, {self.container.title()}, {self.food_group.title()})"
+        return self._label
+
+    # Returns the item's description with its quantity for display
+    def get_display(self) -> str:
+        """
+            Returns the item as: Name (weight, Container, Food Group) - Qty: quantity
+            Cached until the quantity changes, and then only the quantity part is rebuilt
+        """
+        if self._display_quantity != self.quantity:
+            self._display = f"{self.get_label()} - Qty: {self.quantity}"
+            self._display_quantity = self.quantity
+        return self._display
+
+    # Returns True if the item has units from a lot
+    def has_lot(self, lot_id) -> bool:
+        """Returns True if the item has units from lot_id"""
+        return any(lot.lot_id == lot_id for lot in self.lots)
@@ -0,0 +1,227 @@
+import re
+
+# Bin location format: AISLE-BAY or AISLE-BAY-SHELF (ex. B-12 or B-12-3)
+# The aisle can be letters (A, B, ..., AA) or a number
+LOCATION_PATTERN = re.compile(r"^([A-Z]+|\d+)\s*-\s*(\d+)(?:\s*-\s*(\d+))?$")
+
+# Walking distance between neighboring aisles and between neighboring bays of an aisle
+AISLE_SPACING = 3
+BAY_LENGTH = 1
+
+# Where every pick route starts and ends (the front of aisle 0, ex. the packing area)
+DOCK = (0, 0)
+
+# Bays per spatial index cell
+CELL_BAYS = 8
+
+# Nearest picks checked for each pick when improving a route
+ROUTE_NEIGHBORS = 12
+
+# Parses a bin location
+def parse_location(text:str):
+    """
+        Returns (aisle number, bay, shelf) of a bin location (shelf is 0 if not given)
+        Ex: "B-12-3" --> (2, 12, 3), "c-4" --> (3, 4, 0), "10-2" --> (10, 2, 0)
+        Raises ValueError if text is not a valid location
+    """
+    match = LOCATION_PATTERN.match((text or "").strip().upper())
+    if not match:
+        raise ValueError(f"Invalid location '{text}'. Use AISLE-BAY or AISLE-BAY-SHELF (ex. B-12-3).")
+
+    aisle_text, bay, shelf = match.groups()
+    if aisle_text.isdigit():
+        aisle = int(aisle_text)
+    else:
+        # Letters count like spreadsheet columns (A=1, Z=26, AA=27)
+        aisle = 0
+        for letter in aisle_text:
+            aisle = aisle * 26 + ord(letter) - ord("A") + 1
+    return aisle, int(bay), int(shelf or 0)
+
+# Formats a bin location
+def format_location(text:str) -> str:
+    """
+        Returns a bin location in standard form (ex. " b - 12 - 3 " --> "B-12-3")
+        Raises ValueError if text is not a valid location
+    """
+    parse_location(text)
+    return "-".join(part.strip() for part in text.strip().upper().split("-"))
+
+# Returns the floor position of a bin location
+def location_point(text:str):
+    """
+        Returns the (x, y) floor position of a bin location, or None if it isn't valid
+        Shelves are stacked, so they don't change the position
+    """
+    try:
+        aisle, bay, _ = parse_location(text)
+    except ValueError:
+        return None
+    return aisle * AISLE_SPACING, bay * BAY_LENGTH
+
+# Returns the walking distance between two positions
+def distance(a, b) -> int:
+    """
+        Returns the walking distance between positions a and b
+        Aisles and cross aisles are at right angles, so distance is measured along them
+        (Manhattan distance)
+    """
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+class LocationIndex:
+    """
+        Spatial index of items by bin location
+
+        The floor is split into cells (one aisle by CELL_BAYS bays), and each cell holds
+        the keys of the items stored in it, so finding the items near a bin only looks at
+        the cells within reach instead of every item
+
+        Inventory calls update(key) after every change, and rebuild() after loading
+    """
+    def __init__(self, items):
+        # Inventory items dictionary (key -> Item)
+        self.items = items
+        # key -> (x, y) position of items with a valid location
+        self.points = {}
+        # (aisle, bay // CELL_BAYS) cell -> set of keys
+        self.cells = {}
+
+    # Returns the cell of a position
+    def _cell(self, point):
+        """Returns the index cell that holds position point"""
+        return point[0] // AISLE_SPACING, point[1] // (CELL_BAYS * BAY_LENGTH)
+
+    # Rebuilds the index from scratch
+    def rebuild(self):
+        """Rebuilds the index from every item's location"""
+        self.points = {}
+        self.cells = {}
+        for key in self.items:
+            self.update(key)
+
+    # Updates the index for one key
+    def update(self, key):
+        """Adds, moves, or removes key after its item changed, moved, or was deleted"""
+        item = self.items.get(key)
+        point = location_point(item.location) if item is not None and item.location else None
+
+        old_point = self.points.get(key)
+        if old_point == point:
+            return
+
+        # Take the key out of its old cell
+        if old_point is not None:
+            cell = self._cell(old_point)
+            self.cells[cell].discard(key)
+            if not self.cells[cell]:
+                del self.cells[cell]
+            del self.points[key]
+
+        # Put it in its new cell
+        if point is not None:
+            self.points[key] = point
+            self.cells.setdefault(self._cell(point), set()).add(key)
+
+    # Finds the items near a bin
+    def near(self, location:str, max_distance:int):
+        """
+            Returns [(distance, key)] of items within max_distance of location (closest first)
+            Raises ValueError if location is not valid
+        """
+        center = location_point(location)
+        if center is None:
+            # Raises ValueError describing the problem
+            parse_location(location)
+
+        # Only the cells within max_distance can hold matching items
+        aisle_reach = max_distance // AISLE_SPACING + 1
+        cell_reach = max_distance // (CELL_BAYS * BAY_LENGTH) + 1
+        center_aisle, center_cell = self._cell(center)
+
+        found = []
+        for aisle in range(center_aisle - aisle_reach, center_aisle + aisle_reach + 1):
+            for cell in range(center_cell - cell_reach, center_cell + cell_reach + 1):
+                for key in self.cells.get((aisle, cell), ()):
+                    item_distance = distance(center, self.points[key])
+                    if item_distance <= max_distance:
+                        found.append((item_distance, key))
+        found.sort()
+        return found
+
+# Orders positions into a short walking route
+def plan_route(points, start=DOCK):
+    """
+        Returns the indexes of points in the order to visit them, starting and ending at start
+
+        Builds a route by always walking to the nearest unvisited point, then improves it
+        with 2-opt: two legs of the route are swapped for two shorter ones (reversing the
+        part in between) until no swap helps. Distances are computed once into a matrix, and
+        each point only tries swaps with its ROUTE_NEIGHBORS nearest points, so large
+        pick lists (hundreds of picks) are routed quickly
+    """
+    if not points:
+        return []
+
+    # Node 0 is start, node i + 1 is points[i]
+    nodes = [start] + list(points)
+    count = len(nodes)
+    matrix = [[abs(x - other_x) + abs(y - other_y) for other_x, other_y in nodes] for x, y in nodes]
+
+    # Nearest neighbor route
+    route = [0]
+    unvisited = set(range(1, count))
+    while unvisited:
+        row = matrix[route[-1]]
+        closest = min(unvisited, key=row.__getitem__)
+        unvisited.remove(closest)
+        route.append(closest)
+
+    # Nearest other nodes of each node, closest first (several picks can share a bin,
+    # so the node itself isn't always first)
+    neighbors = []
+    for node, row in enumerate(matrix):
+        closest = sorted(range(count), key=row.__getitem__)[:ROUTE_NEIGHBORS + 1]
+        neighbors.append([other for other in closest if other != node][:ROUTE_NEIGHBORS])
+
+    # 2-opt: replace legs a-b and c-d with a-c and b-d when that's shorter
+    position = [0] * count
+    for index, node in enumerate(route):
+        position[node] = index
+    improved = True
+    while improved:
+        improved = False
+        for i in range(count):
+            a = route[i]
+            b = route[(i + 1) % count]
+            leg = matrix[a][b]
+            for c in neighbors[a]:
+                # Neighbors are sorted, so no closer node is left to try
+                if matrix[a][c] >= leg:
+                    break
+                j = position[c]
+                d = route[(j + 1) % count]
+                if c == b or d == a:
+                    continue
+                if matrix[a][c] + matrix[b][d] < leg + matrix[c][d]:
+                    # Reverse the part of the route between the two legs
+                    low, high = (i + 1, j) if i < j else (j + 1, i)
+                    route[low:high + 1] = route[low:high + 1][::-1]
+                    for index in range(low, high + 1):
+                        position[route[index]] = index
+                    improved = True
+                    break
+
+    # Start at node 0 and drop it
+    first = position[0]
+    route = route[first:] + route[:first]
+    return [node - 1 for node in route[1:]]
+
+# Returns the length of a route
+def route_distance(points, order, start=DOCK) -> int:
+    """Returns the walking distance from start through points in order and back to start"""
+    total = 0
+    current = start
+    for index in order:
+        total += distance(current, points[index])
+        current = points[index]
+    return total + distance(current, start)
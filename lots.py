@@ -0,0 +1,117 @@
+from expiration import parse_date, format_date
+
+# Separators used to store lots in one CSV column
+# Ex: "B-102|2026-10-01|Grocery Drive|12|2026-11-30;|2026-10-05||3"
+# (the expiration date is left off for lots without one, like older files)
+LOT_SEPARATOR = ";"
+FIELD_SEPARATOR = "|"
+
+class Lot:
+    """
+        A donation batch of an item
+
+        lot_id: batch/lot number used for recalls ("" if unknown)
+        donation_date: date the batch was received (datetime.date) or None if unknown
+        source: donor or source of the batch ("" if unknown)
+        quantity: units of the item left from this batch
+        expiration: date the batch expires (datetime.date) or None if it has no date
+    """
+    def __init__(self, lot_id, donation_date, source, quantity, expiration=None):
+        # Separators are replaced so lots can be stored in one CSV column
+        self.lot_id = _clean(lot_id)
+        self.donation_date = donation_date
+        self.source = _clean(source)
+        self.quantity = int(quantity)
+        self.expiration = expiration
+
+    # Returns True if other is from the same batch
+    def same_batch(self, other) -> bool:
+        """Returns True if other has the same lot id, donation date, source, and expiration date"""
+        return ((self.lot_id, self.donation_date, self.source, self.expiration)
+                == (other.lot_id, other.donation_date, other.source, other.expiration))
+
+    # Returns a copy of the lot with a different quantity
+    def copy(self, quantity=None):
+        """Returns a copy of the lot (with quantity if given)"""
+        return Lot(self.lot_id, self.donation_date, self.source,
+                   self.quantity if quantity is None else quantity, self.expiration)
+
+# Removes separator characters from lot text
+def _clean(value) -> str:
+    """Strips value and replaces lot separator characters with spaces"""
+    value = (value or "").strip()
+    return value.replace(LOT_SEPARATOR, " ").replace(FIELD_SEPARATOR, " ")
+
+# Formats lots for one CSV column
+def format_lots(lots) -> str:
+    """Returns lots as a string (oldest first) for the lots CSV column"""
+    return LOT_SEPARATOR.join(
+        FIELD_SEPARATOR.join([lot.lot_id, format_date(lot.donation_date), lot.source, str(lot.quantity)]
+                             + ([format_date(lot.expiration)] if lot.expiration else []))
+        for lot in lots
+    )
+
+# Parses lots from one CSV column
+def parse_lots(value):
+    """
+        Parses the lots CSV column into a list of Lots (oldest first)
+        Lots from older files have no expiration field (their expiration is None)
+        Returns an empty list for an empty string or None
+        Raises ValueError if a lot is malformed
+    """
+    lots = []
+    if not value:
+        return lots
+    for text in value.split(LOT_SEPARATOR):
+        fields = text.split(FIELD_SEPARATOR)
+        if len(fields) not in (4, 5) or not fields[3].strip().isdigit():
+            raise ValueError(f"Invalid lot '{text}'.")
+        expiration = parse_date(fields[4]) if len(fields) == 5 else None
+        lots.append(Lot(fields[0], parse_date(fields[1]), fields[2], int(fields[3]), expiration))
+    return lots
+
+class LotIndex:
+    """
+        Index of lot id -> keys of items that have received that lot
+
+        Keys are added when a lot is added to an item and are not removed when the
+        lot runs out. recall() checks each key and drops the ones that no longer hold
+        the lot (lazy deletion), so FIFO consumption never has to update the index
+    """
+    def __init__(self, items):
+        # Inventory items dictionary (key -> Item)
+        self.items = items
+        # Lot id -> set of keys
+        self.keys_by_lot = {}
+
+    # Adds lots of an item to the index
+    def add(self, key, lots):
+        """Adds key to the index for each lot with a lot id"""
+        for lot in lots:
+            if lot.lot_id:
+                self.keys_by_lot.setdefault(lot.lot_id, set()).add(key)
+
+    # Rebuilds the index from inventory
+    def rebuild(self):
+        """Rebuilds the index from all items in inventory"""
+        self.keys_by_lot.clear()
+        for key, item in self.items.items():
+            self.add(key, item.lots)
+
+    # Finds every item holding a lot
+    def recall(self, lot_id):
+        """
+            Returns a sorted list of (key, quantity) for every item that still holds units of lot_id
+            quantity is the number of units of the item from that lot
+        """
+        keys = self.keys_by_lot.get(lot_id.strip(), set())
+        found = []
+        for key in list(keys):
+            item = self.items.get(key)
+            quantity = sum(lot.quantity for lot in item.lots if lot.lot_id == lot_id.strip()) if item else 0
+            # Drop keys that no longer hold the lot
+            if quantity:
+                found.append((key, quantity))
+            else:
+                keys.discard(key)
+        return sorted(found)
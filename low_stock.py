@@ -0,0 +1,115 @@
+from food_groups import normalize_food_group
+
+class LowStockIndex:
+    """
+        Keeps track of items at or below their reorder threshold
+
+        Thresholds can be set per item (key) or per food group; an item threshold
+        takes priority over its food group's threshold
+
+        Inventory calls update(key) after every change, which only looks at that key,
+        so a low stock report never has to scan the whole inventory
+
+        on_alert (optional) is called as on_alert(key, quantity, threshold) when an
+        item drops to or below its threshold
+    """
+    def __init__(self, items, on_alert=None):
+        # Inventory items dictionary (key -> Item)
+        self.items = items
+        # Reorder threshold per item key
+        self.item_thresholds = {}
+        # Reorder threshold per canonical food group (lowercase)
+        self.group_thresholds = {}
+        # Items at or below threshold (key -> threshold)
+        self.low = {}
+        # Function called when an item drops to or below its threshold
+        self.on_alert = on_alert
+
+    # Returns the food group name used for group thresholds
+    def _group_of(self, key):
+        """Returns the canonical (lowercase) food group of key, or the raw group if unrecognized"""
+        group = normalize_food_group(key[2])
+        return group.lower() if group else key[2]
+
+    # Returns the reorder threshold for a key
+    def get_threshold(self, key):
+        """Returns the reorder threshold for key (item threshold first, then food group), or None"""
+        threshold = self.item_thresholds.get(key)
+        if threshold is None:
+            threshold = self.group_thresholds.get(self._group_of(key))
+        return threshold
+
+    # Updates the index for one key
+    def update(self, key):
+        """
+            Updates whether key is low on stock after a change
+            Fires on_alert when the key crosses to at or below its threshold
+        """
+        threshold = self.get_threshold(key)
+        item = self.items.get(key)
+
+        # Deleted items only stay in the report if they have their own threshold
+        if threshold is None or (item is None and key not in self.item_thresholds):
+            self.low.pop(key, None)
+            return
+
+        quantity = item.quantity if item else 0
+
+        # Item is not low, so remove it from the index
+        if quantity > threshold:
+            self.low.pop(key, None)
+            return
+
+        # Item just crossed its threshold, so fire alert
+        if key not in self.low and self.on_alert:
+            self.on_alert(key, quantity, threshold)
+        self.low[key] = threshold
+
+    # Sets the reorder threshold for one item
+    def set_item_threshold(self, key, threshold):
+        """Sets the reorder threshold for key (None removes it)"""
+        if threshold is None:
+            self.item_thresholds.pop(key, None)
+        else:
+            self.item_thresholds[key] = threshold
+        self.update(key)
+
+    # Sets the reorder threshold for a food group
+    def set_group_threshold(self, food_group, threshold):
+        """
+            Sets the reorder threshold for a food group (None removes it)
+            Rebuilds the index since every item in the group may be affected
+        """
+        group = food_group.lower()
+        if threshold is None:
+            self.group_thresholds.pop(group, None)
+        else:
+            self.group_thresholds[group] = threshold
+        self.rebuild()
+
+    # Rebuilds the index from inventory
+    def rebuild(self):
+        """Rebuilds the index from all items (used after loading); does not fire alerts"""
+        self.low.clear()
+        for key, item in self.items.items():
+            threshold = self.get_threshold(key)
+            if threshold is not None and item.quantity <= threshold:
+                self.low[key] = threshold
+
+        # Items that ran out but have their own threshold
+        for key, threshold in self.item_thresholds.items():
+            if key not in self.items:
+                self.low[key] = threshold
+
+    # Returns the low stock report
+    def report(self):
+        """
+            Returns a list of (key, quantity, threshold) for low items
+            Sorted by how far below threshold they are (most urgent first)
+        """
+        rows = []
+        for key, threshold in self.low.items():
+            item = self.items.get(key)
+            rows.append((key, item.quantity if item else 0, threshold))
+        rows.sort(key=lambda row: (row[1] - row[2], row[0]))
+        return rows
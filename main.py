@@ -1,6 +1,10 @@
+import os
 from menu_manager import MenuManager
 from inventory import Inventory
-from config import load_config
+from config import load_config, load_reorder_thresholds, load_canonical_units, load_history_limit
+from stock_history import StockHistory
+from catalog import load_catalog
+from parse_cache import evict_stale_caches
 
 def main():
     """
@@ -15,8 +19,13 @@ def main():
     # Stores food bank name and inventory csv from config.txt
     food_bank_name, inventory_csv = load_config()
 
-    # Create inventory instance
-    inventory = Inventory()
+    # Create inventory instance (keys use canonical weights if set in config)
+    # Undo history keeps up to the configured number of item changes
+    inventory = Inventory(load_history_limit(), canonical_units=load_canonical_units())
+
+    # Load food group reorder thresholds (used for low stock alerts)
+    for food_group, threshold in load_reorder_thresholds().items():
+        inventory.set_group_reorder_threshold(food_group, threshold)
 
     # If the name is an empty string, print the error message and prompt user for food bank name
     if not food_bank_name:
@@ -35,6 +44,8 @@ def main():
     # Attempt to load inventory CSV if provided
     # Prints error messages if unsuccessful and starts with empty inventory
     if inventory_csv:
+        # Delete parse caches of inventory files that have changed or are gone
+        evict_stale_caches(os.path.dirname(inventory_csv) or ".")
         try:
             inventory.load_inventory_from_csv(inventory_csv)
         # CSV file does not exist or is not found in directory
@@ -50,8 +61,14 @@ def main():
     else:
         print("No inventory file found in config. Starting with an empty inventory.\n")
 
-    # Pass inventory and food bank name in menu manager
-    menu = MenuManager(inventory, food_bank_name)
+    # Record stock level changes over time (for stock history reports)
+    inventory.set_stock_history(StockHistory())
+
+    # Load product catalog (used by scan mode)
+    catalog = load_catalog()
+
+    # Pass inventory, food bank name, and product catalog in menu manager
+    menu = MenuManager(inventory, food_bank_name, catalog)
 
     # Run the main menu loop
     menu.main_menu()
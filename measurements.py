@@ -1,4 +1,6 @@
 import re
+from decimal import Decimal
+from functools import lru_cache
 
 # Valid units for item weight and volume
 UNIT_MAP = {
@@ -38,6 +40,22 @@ UNIT_MAP = {
     "litres": "L"
 }
 
+# Base unit and conversion factor of each unit (mass in kg, volume in L)
+BASE_UNITS = {
+    "oz": ("kg", 0.028349523125),
+    "lb": ("kg", 0.45359237),
+    "kg": ("kg", 1),
+    "fl oz": ("L", 0.0295735295625),
+    "mL": ("L", 0.001),
+    "L": ("L", 1),
+}
+
+# Conversion table for every unit spelling in UNIT_MAP (ex. "pounds" --> ("kg", 0.45359237))
+UNIT_CONVERSIONS = {unit: BASE_UNITS[normalized] for unit, normalized in UNIT_MAP.items()}
+
+# Significant digits kept in canonical weights (so 16 oz and 1 lb round to the same value)
+CANONICAL_DIGITS = 6
+
 # Format unit according to the valid units and return a string
 def format_unit(value: str) -> str:
     """
@@ -81,4 +99,31 @@ def format_unit(value: str) -> str:
     normalized_unit = UNIT_MAP[unit_part]
 
     # Return number and unit together in one string
-    return f"{number_part} {normalized_unit}"
\ No newline at end of file
+    return f"{number_part} {normalized_unit}"
+
+# Converts a weight to its base unit
+@lru_cache(maxsize=4096)
+def canonical_weight(value: str) -> str:
+    """
+    Returns value converted to its base unit (kg or L), rounded to CANONICAL_DIGITS
+    significant digits, so equivalent sizes give the same string.
+    Values that aren't a valid weight are returned unchanged.
+    Ex:
+        16 oz --> 0.453592 kg
+        1 lb --> 0.453592 kg
+        1000 ml --> 1 L
+    """
+    try:
+        formatted = format_unit(value)
+    except ValueError:
+        return value
+    if not formatted:
+        return value
+
+    # Convert the number to the base unit
+    number, unit = formatted.split(" ", 1)
+    base_unit, factor = UNIT_CONVERSIONS[unit.lower()]
+    rounded = Decimal(f"{float(number) * factor:.{CANONICAL_DIGITS}g}")
+
+    # Write the number without an exponent (ex. 1E-5 --> 0.00001) so it's still a valid weight
+    return f"{rounded:f} {base_unit}"
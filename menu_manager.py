@@ -1,7 +1,16 @@
 import os
+from datetime import date, datetime, time, timedelta
 from food_groups import VARIATION_FOOD_GROUP_MAP, CANONICAL_FOOD_GROUPS
 from measurements import format_unit
-from config import save_config
+from config import load_config, save_config, save_reorder_thresholds
+from expiration import parse_date, format_date
+from lots import Lot
+from allocation import Recipient, plan_allocation
+from exporters import get_extension
+from watcher import FileWatcher
+from forecast import format_days_of_supply
+from catalog import CATALOG_FILE, normalize_code
+from quick_entry import parse_lines
 
 class MenuManager:
     # Valid yes responses for confirmation
@@ -9,11 +18,17 @@ class MenuManager:
     # Valid no responses for confirmation
     NO_KEYS = ["n", "no"]
     
-    def __init__(self, inventory, food_bank_name):
+    def __init__(self, inventory, food_bank_name, catalog=None):
         self.inventory = inventory
         self.food_bank_name = food_bank_name
+        # Product catalog for scan mode: code -> (name, container, food group, weight)
+        self.catalog = catalog if catalog is not None else {}
         # Keeps track of when program will end
         self.end_program = False
+        # Print an alert as soon as an item drops to its reorder threshold
+        self.inventory.low_stock.on_alert = self.low_stock_alert
+        # Watches the current file for changes made outside this program
+        self.watcher = FileWatcher(inventory)
 
     # Draws a border made of *
     def draw_border(self):
@@ -66,6 +81,14 @@ class MenuManager:
         print("(3) Remove Item from Inventory\n")
         print("(4) Load Inventory from CSV File\n")
         print("(5) Save Inventory to CSV File\n")
+        print("(6) Undo Last Change\n")
+        print("(7) Redo Last Change\n")
+        print("(8) Plan Distribution\n")
+        print("(9) Reports\n")
+        print("(S) Scan Items\n")
+        print("(E) Quick Entry\n")
+        print("(U) Merge Equivalent Sizes\n")
+        print("(L) Bin Locations and Pick Lists\n")
         print("(Q) Quit\n")
 
     # Displays display inventory menu
@@ -75,6 +98,10 @@ class MenuManager:
             Shows the following options:
             (1) Show Inventory
             (2) Sort Inventory
+            (3) Expiring Soon
+            (4) Low Stock Report
+            (5) Lot Recall Lookup
+            (6) Filter Inventory
             (R) Return to Main Menu
         """
         # If inventory is empty, show empty inventory message and return to main menu
@@ -96,6 +123,10 @@ class MenuManager:
             # Print menu and record user input
             print("(1) Show Inventory (Default View)")
             print("(2) Sort Inventory")
+            print("(3) Expiring Soon")
+            print("(4) Low Stock Report")
+            print("(5) Lot Recall Lookup")
+            print("(6) Filter Inventory")
             print("(R) Return to Main Menu")
             print()
             # Ask user to choose an option
@@ -109,6 +140,22 @@ class MenuManager:
             elif user_input == '2':
                 self.display_sort_inventory_menu()
                 continue
+            # If user presses 3, show items expiring soon
+            elif user_input == '3':
+                self.expiring_soon_menu()
+                continue
+            # If user presses 4, show low stock report
+            elif user_input == '4':
+                self.low_stock_menu()
+                continue
+            # If user presses 5, look up items holding a lot
+            elif user_input == '5':
+                self.lot_recall_menu()
+                continue
+            # If user presses 6, filter inventory
+            elif user_input == '6':
+                self.filter_inventory_menu()
+                continue
             # If user presses 'r', return to main menu
             elif user_input == 'r':
                 #Print newline
@@ -231,7 +278,8 @@ class MenuManager:
                 print("\nInvalid input. Please try again.")
 
         # Sort inventory according to input (sort_by and reverse)
-        sorted_items = self.inventory.get_sorted_items(sort_by=sort_by, reverse = reverse)
+        # Items are streamed in sorted order instead of copied into a list
+        sorted_items = self.inventory.iter_sorted(sort_by=sort_by, reverse = reverse)
 
         # Display sorted items
         self.display_sorted_items(sorted_items, sort_title, order)
@@ -239,9 +287,317 @@ class MenuManager:
         # Waits for user to press Enter to return to View Inventory Menu (pause screen)
         input("Press Enter to return to View Inventory Menu...")
 
+    # Shows items expiring soon
+    def expiring_soon_menu(self):
+        """
+            Displays items that expire within a number of days (default 7), earliest first
+            Expired items are marked and user can remove all expired items at once
+            If nothing expires within the window, the next items to expire are shown
+        """
+        # Ask for the number of days to look ahead
+        while True:
+            days_input = input("\nShow items expiring within how many days? (default 7): ").strip()
+            if not days_input:
+                days = 7
+                break
+            if days_input.isdigit():
+                days = int(days_input)
+                break
+            print("\nInvalid input. Please enter a whole number.")
+
+        today = date.today()
+        expiring = self.inventory.get_expiring_before(today + timedelta(days=days + 1))
+
+        # Print newline
+        print()
+
+        # Puts "Expiring Soon" header in borders
+        header = f"Expiring Soon - Next {days} Day(s)"
+        self.draw_header_with_borders(header)
+
+        # Print newline
+        print()
+
+        # If nothing expires within the window, show the next items to expire instead
+        if not expiring:
+            print(f"No items expire within {days} day(s).")
+            expiring = self.inventory.get_next_expiring(5)
+            if not expiring:
+                print("No items have an expiration date.\n")
+                input("Press Enter to return to View Inventory Menu...")
+                return
+            print("\nNext items to expire:\n")
+
+        # Print each item, marking items with expired units (only those lots are removed)
+        # Ex: 2026-10-20 - Milk (1 L, Jug, Dairy) - Qty: 14 [4 EXPIRED]
+        expired_count = 0
+        for item in expiring:
+            status = ""
+            if item.expiration < today:
+                status = f" [{item.count_expiring(today)} EXPIRED]"
+                expired_count += 1
+            print(f"{format_date(item.expiration)} - {item.get_display()}{status}")
+
+        # Print newline
+        print()
+
+        # If there are expired items, ask if user wants to remove them
+        if expired_count and self.get_confirmation(f"Remove the expired units of {expired_count} item(s) from inventory?"):
+            removed = self.inventory.remove_expired(today)
+            print(f"\nRemoved {sum(quantity for _, quantity in removed)} expired unit(s) across {len(removed)} item(s).\n")
+
+        # Waits for user to press Enter to return to View Inventory Menu (pause screen)
+        input("Press Enter to return to View Inventory Menu...")
+
+    # Shows items matching filters
+    def filter_inventory_menu(self):
+        """
+            Prompts user for optional filters and shows the matching items
+            Food group, container, and unit accept several values separated by commas (any match)
+            Every filter given must match
+            User presses Enter to skip a filter
+        """
+        print("\nEnter filters (press Enter to skip). Separate several values with commas.\n")
+
+        # Text filters (several values = any of them)
+        filters = {}
+        for attribute, prompt in (("food_group", "Food group(s)"), ("container", "Container(s)"), ("unit", "Unit(s) (ex. oz, lb)")):
+            values = [value.strip() for value in input(f"{prompt}: ").split(",") if value.strip()]
+            filters[attribute] = values or None
+
+        # Quantity range
+        quantities = {}
+        for bound, prompt in (("min_qty", "Minimum quantity"), ("max_qty", "Maximum quantity")):
+            while True:
+                quantity_input = input(f"{prompt}: ").strip()
+                if not quantity_input:
+                    quantities[bound] = None
+                    break
+                if quantity_input.isdigit():
+                    quantities[bound] = int(quantity_input)
+                    break
+                print("\nInvalid quantity. Please enter a whole number.\n")
+
+        try:
+            items = self.inventory.query(**filters, **quantities)
+        except ValueError as e:
+            print(f"\n{e}\n")
+            return
+
+        # Print newline
+        print()
+
+        # Puts "Filtered Inventory" header in borders
+        header = "Filtered Inventory"
+        self.draw_header_with_borders(header)
+
+        # Print newline
+        print()
+
+        # If nothing matches, show message
+        if not items:
+            print("No items match these filters.\n")
+        # Otherwise, print matching items in alphabetical order
+        else:
+            for item in sorted(items, key=lambda item: (item.name, item.container, item.food_group, item.weight)):
+                print(item.get_display())
+            print(f"\n{len(items)} matching item(s), {sum(item.quantity for item in items)} total quantity.\n")
+
+        # Waits for user to press Enter to return to View Inventory Menu (pause screen)
+        input("Press Enter to return to View Inventory Menu...")
+
+    # Shows every item holding units of a lot
+    def lot_recall_menu(self):
+        """
+            Prompts user for a lot/batch id and displays every item that still holds units from it
+            Used to find stock affected by a recall
+        """
+        lot_id = input("\nEnter the lot/batch ID to look up: ").strip()
+        if not lot_id:
+            print("\nLot ID cannot be empty.")
+            return
+
+        matches = self.inventory.recall_lot(lot_id)
+
+        # Print newline
+        print()
+
+        # Puts "Lot Recall" header in borders
+        header = f"LOT RECALL - {lot_id}"
+        self.draw_header_with_borders(header)
+
+        # Print newline
+        print()
+
+        # If no item holds the lot, print message
+        if not matches:
+            print(f"No items in inventory hold lot '{lot_id}'.")
+
+        # Print each item holding the lot
+        # Ex: Rice (Bag, Grains, 1 lb) - 12 from this lot
+        for key, quantity in matches:
+            name, container, food_group, _ = key
+            weight = self.inventory.get_display_weight(key)
+            print(f"{name.title()} ({container.title()}, {food_group.title()}, {weight}) - {quantity} from this lot")
+
+        # Print newline
+        print()
+
+        # Waits for user to press Enter to return to View Inventory Menu (pause screen)
+        input("Press Enter to return to View Inventory Menu...")
+
+    # Asks user for optional lot information
+    def get_lot_input(self):
+        """
+            Prompts user for an optional lot/batch id and donation source
+            Returns a Lot donated today (quantity is set when the item is added)
+        """
+        lot_id = input("Lot/batch ID (press Enter to skip): ").strip()
+        source = input("Donation source (press Enter to skip): ").strip()
+        return Lot(lot_id, date.today(), source, 0)
+
+    # Prints a low stock alert
+    def low_stock_alert(self, key, quantity, threshold):
+        """
+            Prints an alert when an item drops to or below its reorder threshold
+            Called by the inventory's low stock index as soon as the threshold is crossed
+        """
+        name, container, food_group, _ = key
+        weight = self.inventory.get_display_weight(key)
+        print(f"\nLOW STOCK ALERT: {name.title()} ({container.title()}, {food_group.title()}, {weight}) "
+              f"has {quantity} left (reorder at {threshold}).")
+
+    # Shows low stock report and reorder threshold options
+    def low_stock_menu(self):
+        """
+            Displays items at or below their reorder threshold (most urgent first)
+            Shows the following options:
+            (1) Set Item Reorder Threshold
+            (2) Set Food Group Reorder Threshold
+            (R) Return to View Inventory Menu
+        """
+        while True:
+            # Print newline
+            print()
+
+            # Puts "Low Stock Report" header in borders
+            header = "LOW STOCK REPORT"
+            self.draw_header_with_borders(header)
+
+            # Print newline
+            print()
+
+            # Print each low item
+            # Ex: Rice (Bag, Grains, 1 lb) - Qty: 15 (reorder at 20)
+            low_items = self.inventory.get_low_stock()
+            if not low_items:
+                print("No items are low on stock.")
+            for key, quantity, threshold in low_items:
+                name, container, food_group, _ = key
+                weight = self.inventory.get_display_weight(key)
+                print(f"{name.title()} ({container.title()}, {food_group.title()}, {weight}) - Qty: {quantity} (reorder at {threshold})")
+
+            # Print menu and record user input
+            print()
+            print("(1) Set Item Reorder Threshold")
+            print("(2) Set Food Group Reorder Threshold")
+            print("(R) Return to View Inventory Menu")
+            print()
+            user_input = input("Choose one of the following options: ").strip().lower()
+
+            # If user presses 1, set threshold for one item
+            if user_input == '1':
+                self.set_item_threshold_menu()
+            # If user presses 2, set threshold for a food group
+            elif user_input == '2':
+                self.set_group_threshold_menu()
+            # If user presses 'r', return to View Inventory Menu
+            elif user_input == 'r':
+                break
+            # Otherwise, print invalid input message
+            else:
+                print("\nInvalid input. Please try again.")
+
+    # Asks user for a reorder threshold
+    def get_threshold_input(self):
+        """
+            Prompts user for a reorder threshold (whole number)
+            Returns None if user presses Enter (removes the threshold)
+        """
+        while True:
+            threshold_input = input("Reorder threshold (press Enter to remove): ").strip()
+            if not threshold_input:
+                return None
+            if threshold_input.isdigit():
+                return int(threshold_input)
+            print("\nInvalid input. Please enter a whole number.\n")
+
+    # Sets reorder threshold for one item
+    def set_item_threshold_menu(self):
+        """Prompts user for an item (name, container, weight) and its reorder threshold"""
+        print()
+        name = input("Item name: ").strip().lower()
+        container = input("Container (Can, Box, Jar, etc.): ").strip().lower()
+        weight_input = input("Weight (ex. 12 oz, 2 lb): ").strip().lower()
+
+        # Validate weight
+        try:
+            formatted_weight = format_unit(weight_input)
+        except ValueError as e:
+            print(f"\nInvalid weight: {e}")
+            return
+
+        # Find item (same name, container, and weight (ignoring food_group))
+        matching_keys = self.inventory.find_keys(name, container, formatted_weight)
+
+        # If item is not found in inventory, print error message and return
+        if not matching_keys:
+            print("\nItem not found.")
+            return
+        key = matching_keys[0] if len(matching_keys) == 1 else self.choose_item_from_matches(matching_keys)
+        if key is None:
+            print("\nSelection canceled.")
+            return
+
+        threshold = self.get_threshold_input()
+        self.inventory.set_reorder_threshold(key, threshold)
+        print("\nReorder threshold updated.")
+
+    # Sets reorder threshold for a food group
+    def set_group_threshold_menu(self):
+        """Prompts user for a food group and its reorder threshold, then saves group thresholds"""
+        print()
+        while True:
+            fg_input = input(f"Food Group ({', '.join(CANONICAL_FOOD_GROUPS)}): ").strip().lower()
+            if fg_input in VARIATION_FOOD_GROUP_MAP:
+                food_group = VARIATION_FOOD_GROUP_MAP[fg_input]
+                break
+            print("\nInvalid food group. Please enter a valid option.\n")
+
+        threshold = self.get_threshold_input()
+        self.inventory.set_group_reorder_threshold(food_group, threshold)
+
+        # Group thresholds are saved right away (they are not part of the inventory file)
+        save_reorder_thresholds(self.inventory.low_stock.group_thresholds)
+        print(f"\nReorder threshold for {food_group} updated.")
+
+    # Asks user for an optional expiration date
+    def get_expiration_input(self):
+        """
+            Prompts user for an expiration date (YYYY-MM-DD)
+            Returns None if user presses Enter to skip
+            Keeps asking until input is empty or a valid date
+        """
+        while True:
+            expiration_input = input("Expiration date (YYYY-MM-DD, press Enter to skip): ").strip()
+            try:
+                return parse_date(expiration_input)
+            except ValueError as e:
+                print(f"\n{e}\n")
+
     # Display sorted items
     def display_sorted_items(self, sorted_items, sort_by, order):
-        """Shows the sorted items"""
+        """Shows the sorted items (any iterable of Items, ex. Inventory.iter_sorted)"""
         #Print newline
         print()
     
@@ -253,14 +609,17 @@ class MenuManager:
         print()
 
         # If inventory is empty, print message and exit
-        if not sorted_items:
+        if not self.inventory.items:
             print("\nInventory is empty. Nothing to sort.")
             return
 
+        # Consumption rates of every item (computed once for the whole list)
+        rates = self.inventory.get_consumption_rates()
+
         # Print each item from inventory
         for item in sorted_items:
-            formatted_weight = format_unit(item.weight)
-            print(f"{item.name.title()} ({formatted_weight}, {item.container.title()}, {item.food_group.title()}) - Qty: {item.quantity}")
+            days_left = format_days_of_supply(self.inventory.get_days_of_supply(item, rates))
+            print(f"{item.get_display()}{days_left}")
 
         # Print newline
         print()
@@ -284,15 +643,11 @@ class MenuManager:
         """
         # Prints a numbered list of items from matching keys
         # Ex:
-        # 1) Cereal (Box, Grains, 12 oz) - 10 available
+        # 1) Cereal (12 oz, Box, Grains) - 10 available
         print("\nMultiple matching items found:")
         for i, k in enumerate(matching_keys, start=1):
             item = self.inventory.items[k]
-            print(
-                f"{i}) {item.name.title()} "
-                f"({item.container.title()}, {item.food_group.title()}, {item.weight}) "
-                f"- {item.quantity} available"
-            )
+            print(f"{i}) {item.get_label()} - {item.quantity} available")
         # Option to cancel selection
         print("\n0) Cancel")
 
@@ -398,14 +753,19 @@ class MenuManager:
                 else:
                     print("\nInvalid quantity. Please enter a positive whole number greater than 0.\n")
 
+            # Optional expiration date (items keep their earliest date)
+            expiration = self.get_expiration_input()
+
+            # Optional lot information (used for recalls)
+            lot = self.get_lot_input()
+
             # Defining food_group to ensure it does not cause an error if checked before defined
             food_group = None
             # Flag to confirm existing item in inventory
             confirmed_existing = False
 
             # Check if item exists (has the same name, container, and weight (ignoring food_group))
-            partial_key = (name.lower(), container.lower(), formatted_weight.lower())
-            matching_keys = [k for k in self.inventory.items if (k[0], k[1], k[3]) == partial_key]
+            matching_keys = self.inventory.find_keys(name, container, formatted_weight)
             # Header message for adding to an existing item
             header_message = "This item is already in inventory."
 
@@ -488,7 +848,7 @@ class MenuManager:
         key = self.inventory.make_key(name, container, food_group, formatted_weight)
 
         # Add item to inventory and print input
-        self.inventory.add_item(name, container, food_group, formatted_weight, quantity)
+        self.inventory.add_item(name, container, food_group, formatted_weight, quantity, expiration, lot)
 
         # Get updated quantity to show new total
         total_quantity = self.inventory.items[key].quantity
@@ -502,6 +862,303 @@ class MenuManager:
         # Prints newline for extra space
         print()
 
+    # Adds items by scanning product codes
+    def scan_items_menu(self):
+        """
+            Scan mode for fast intake with a barcode scanner (or typed codes)
+            Each code is looked up in the product catalog and adds one unit of that product
+            Scans of the same code in a row (a burst) are added to inventory together
+            with one add_item when a different code is scanned or scanning ends
+            User presses Enter on an empty line (or types 'r') to finish
+        """
+        # If there is no catalog, show message and exit function
+        if not self.catalog:
+            print(f"\nProduct catalog is empty. Add products to '{CATALOG_FILE}' to use scan mode.\n")
+            return
+
+        # Prints newline
+        print()
+        # Puts "SCAN ITEMS" in borders
+        header = "SCAN ITEMS"
+        self.draw_header_with_borders(header)
+        # Prints newline
+        print()
+        print("Scan each item. Press Enter on an empty line (or type 'R') to finish.\n")
+
+        # Current burst of scans of the same code
+        burst_code = None
+        burst_count = 0
+        # Totals for the session
+        total_units = 0
+        total_adds = 0
+
+        while True:
+            code_input = input("Scan: ").strip()
+            finished = not code_input or code_input.lower() == 'r'
+            code = normalize_code(code_input) if not finished else None
+
+            # Same code again: just count it
+            if code is not None and code == burst_code:
+                burst_count += 1
+                print(f"  x{burst_count}")
+                continue
+
+            # Different code (or done): add the finished burst in one change
+            if burst_code is not None:
+                name, container, food_group, weight = self.catalog[burst_code]
+                self.inventory.add_item(name, container, food_group, weight, burst_count)
+                total_units += burst_count
+                total_adds += 1
+                burst_code = None
+                burst_count = 0
+
+            if finished:
+                break
+
+            # Start a new burst if the code is in the catalog
+            product = self.catalog.get(code)
+            if product is None:
+                print(f"  Code '{code_input}' is not in the product catalog.")
+                continue
+            name, container, food_group, weight = product
+            print(f"  {name.title()} ({weight}, {container.title()}, {food_group})")
+            burst_code = code
+            burst_count = 1
+
+        # Print summary of scanned items
+        print(f"\nAdded {total_units} unit(s) to inventory in {total_adds} change(s).\n")
+
+        # Waits for user to press Enter to return to Main Menu (pause screen)
+        input("Press Enter to return to Main Menu...")
+        # Prints newline for extra space
+        print()
+
+    # Adds many items from one-line entries
+    def quick_entry_menu(self):
+        """
+            Quick entry for fast intake: one item per line, typed or pasted as a block
+            Format: QUANTITY CONTAINER NAME WEIGHT FOOD_GROUP (ex. 10 can corn 12oz veg)
+            User presses Enter on an empty line to finish, then confirms once to add every valid line
+        """
+        # Prints newline
+        print()
+        # Puts "QUICK ENTRY" in borders
+        header = "QUICK ENTRY"
+        self.draw_header_with_borders(header)
+        # Prints newline
+        print()
+        print("Enter one item per line: QUANTITY CONTAINER NAME WEIGHT FOOD_GROUP")
+        print("Ex: 10 can corn 12oz veg")
+        print("Paste many lines at once if you like. Press Enter on an empty line to finish.\n")
+
+        # Read lines until an empty line
+        lines = []
+        while True:
+            line = input()
+            if not line.strip():
+                break
+            lines.append(line)
+
+        entries, errors = parse_lines(lines)
+
+        # Show lines that couldn't be read
+        if errors:
+            print(f"\n{len(errors)} line(s) could not be read and will be skipped:")
+            for number, line, message in errors:
+                print(f"  Line {number}: '{line}' - {message}")
+
+        # If nothing to add, exit function
+        if not entries:
+            print("\nNo items to add.\n")
+            return
+
+        # Show every item to be added
+        print("\nItems to add:")
+        for name, container, food_group, weight, quantity in entries:
+            print(f"  {quantity} {name.title()} ({container.title()}, {food_group}, {weight})")
+        print()
+
+        # Confirm once, then add the whole batch
+        total_units = sum(entry[4] for entry in entries)
+        if not self.get_confirmation(f"Add {len(entries)} item(s) ({total_units} unit(s)) to inventory?"):
+            print("\nQuick entry canceled.\n")
+            return
+
+        self.inventory.add_items(entries)
+
+        # Prints that items have been added to inventory
+        print(f"\n{total_units} unit(s) across {len(entries)} line(s) added to inventory.\n")
+
+        # Waits for user to press Enter to return to Main Menu (pause screen)
+        input("Press Enter to return to Main Menu...")
+        # Prints newline for extra space
+        print()
+
+    # Displays bin locations menu
+    def locations_menu(self):
+        """Menu for setting item bin locations, finding items near a bin, and generating pick lists"""
+        while True:
+            # Prints newline
+            print()
+            # Puts "BIN LOCATIONS" header in borders
+            self.draw_header_with_borders("BIN LOCATIONS")
+            # Prints newline
+            print()
+
+            print("(1) Set Item Location")
+            print("(2) Show Items Near a Bin")
+            print("(3) Generate Pick List")
+            print("(R) Return to Main Menu")
+            print()
+
+            user_input = input("Choose one of the following options: ").strip().lower()
+
+            if user_input == '1':
+                self.set_location_menu()
+            elif user_input == '2':
+                self.items_near_bin_menu()
+            elif user_input == '3':
+                self.pick_list_menu()
+            elif user_input == 'r':
+                print()
+                break
+            else:
+                print("\nInvalid input. Please try again.")
+
+    # Sets the bin location of one item
+    def set_location_menu(self):
+        """Prompts user for an item (name, container, weight) and its bin location"""
+        print()
+        name = input("Item name: ").strip().lower()
+        container = input("Container (Can, Box, Jar, etc.): ").strip().lower()
+        weight_input = input("Weight (ex. 12 oz, 2 lb): ").strip().lower()
+
+        # Validate weight
+        try:
+            formatted_weight = format_unit(weight_input)
+        except ValueError as e:
+            print(f"\nInvalid weight: {e}")
+            return
+
+        # Find item (same name, container, and weight (ignoring food_group))
+        matching_keys = self.inventory.find_keys(name, container, formatted_weight)
+        if not matching_keys:
+            print("\nItem not found.")
+            return
+        key = matching_keys[0] if len(matching_keys) == 1 else self.choose_item_from_matches(matching_keys)
+        if key is None:
+            print("\nSelection canceled.")
+            return
+
+        current = self.inventory.items[key].location
+        print(f"\nCurrent location: {current or 'None'}")
+        location = input("New location (ex. B-12-3, blank to remove): ").strip()
+
+        try:
+            self.inventory.set_location(key, location)
+        except ValueError as e:
+            print(f"\n{e}")
+            return
+        print("\nLocation updated." if location else "\nLocation removed.")
+
+    # Shows the items near a bin
+    def items_near_bin_menu(self):
+        """Prompts user for a bin location and distance, then lists the items within that distance"""
+        print()
+        location = input("Bin location (ex. B-12-3): ").strip()
+        distance_input = input("Distance (bays, default 10): ").strip()
+
+        if distance_input and not distance_input.isdigit():
+            print("\nInvalid distance. Must be a whole number.")
+            return
+        max_distance = int(distance_input) if distance_input else 10
+
+        try:
+            nearby = self.inventory.get_items_near(location, max_distance)
+        except ValueError as e:
+            print(f"\n{e}")
+            return
+
+        print()
+        if not nearby:
+            print(f"No items within {max_distance} of {location.upper()}.")
+        # Ex: B-12-3 (2 away): Corn (12 oz, Can, Vegetables) - Qty: 10
+        for distance, key in nearby:
+            item = self.inventory.items[key]
+            print(f"{item.location} ({distance} away): {item.get_display()}")
+        print()
+
+    # Builds a pick route for a list of items
+    def pick_list_menu(self):
+        """
+            Reads a pick list in the quick entry format (QUANTITY CONTAINER NAME WEIGHT FOOD_GROUP),
+            prints the picks in walking order through the warehouse, and optionally removes them
+        """
+        print()
+        print("Enter one pick per line: QUANTITY CONTAINER NAME WEIGHT FOOD_GROUP")
+        print("Ex: 10 can corn 12oz veg")
+        print("Paste many lines at once if you like. Press Enter on an empty line to finish.\n")
+
+        # Read lines until an empty line
+        lines = []
+        while True:
+            line = input()
+            if not line.strip():
+                break
+            lines.append(line)
+
+        entries, errors = parse_lines(lines)
+
+        # Show lines that couldn't be read
+        if errors:
+            print(f"\n{len(errors)} line(s) could not be read and will be skipped:")
+            for number, line, message in errors:
+                print(f"  Line {number}: '{line}' - {message}")
+
+        # If nothing to pick, exit function
+        if not entries:
+            print("\nNo items to pick.\n")
+            return
+
+        # Add up picks of the same item
+        picks = {}
+        for name, container, food_group, weight, quantity in entries:
+            key = self.inventory.make_key(name, container, food_group, weight)
+            picks[key] = picks.get(key, 0) + quantity
+
+        route, distance = self.inventory.get_pick_route(list(picks.items()))
+
+        # Print the route
+        # Ex: 1. B-12-3     10 x Corn (12 oz, Can, Vegetables)
+        print()
+        self.draw_header_with_borders("PICK LIST")
+        print()
+        problems = 0
+        for stop, (key, quantity, location) in enumerate(route, start=1):
+            item = self.inventory.items.get(key)
+            if item is None:
+                problems += 1
+                print(f"{stop:>3}. {'-':<10} {quantity} x {key[0].title()} - NOT IN INVENTORY")
+                continue
+            note = ""
+            if quantity > item.quantity:
+                problems += 1
+                note = f" - ONLY {item.quantity} AVAILABLE"
+            elif location is None:
+                note = " - NO LOCATION"
+            print(f"{stop:>3}. {location or '-':<10} {quantity} x {item.get_label()}{note}")
+        print(f"\nWalking distance: {distance} (from the dock and back)\n")
+
+        # Picked items can be removed right away if every pick is available
+        if problems:
+            print(f"{problems} pick(s) can't be filled, so nothing will be removed.\n")
+            return
+        if self.get_confirmation("Remove these items from inventory now?"):
+            self.inventory.remove_items(entries)
+            print(f"\n{sum(picks.values())} unit(s) removed from inventory.\n")
+        else:
+            print("\nPick list not removed from inventory.\n")
+
     #Displays remove items menu that asks for user input
     def remove_item_menu(self):
         """Prompts user to input the following information to remove item: name, category, size, and quantity
@@ -562,8 +1219,7 @@ class MenuManager:
                     print(f"\nInvalid weight: {e}\n")
 
             # Check if item exists (has the same name, container, and weight (ignoring food_group))
-            partial_key = (name.lower(), container.lower(), formatted_weight.lower())
-            matching_keys = [k for k in self.inventory.items if (k[0], k[1], k[3]) == partial_key]
+            matching_keys = self.inventory.find_keys(name, container, formatted_weight)
 
             # If item is not found in inventory, print error message and ask user to try again
             if not matching_keys:
@@ -602,8 +1258,10 @@ class MenuManager:
                         # Otherwise user wants to try again, so print new line and return to the start of the loop
                         print()
                         continue
-            # Store current quantity of item
+            # Store current quantity and version of item
+            # (the version is checked again when removing, so no lock is held while user types)
             available_quantity = self.inventory.items[key].quantity
+            expected_version = self.inventory.get_item_version(key)
 
             # Won't exit until user inputs a valid response (int) for quantity
             while True:
@@ -650,12 +1308,21 @@ class MenuManager:
                 else:
                     print()
                     continue
-            # If user chooses to remove item, break from loop (continue to the next step)
-            else:
+
+            # If user chooses to remove item, load any outside changes (ex. from another station)
+            # and remove it only if it hasn't changed since its quantity was shown
+            self.check_external_changes()
+            if self.inventory.remove_item(name, container, food_group, formatted_weight, quantity,
+                                          expected_version=expected_version):
                 break
 
-        # Remove item from inventory and print input
-        self.inventory.remove_item(name, container, food_group, formatted_weight, quantity)
+            # Otherwise, the removal was stale, so ask if user wants to try again with the new quantity
+            if not self.get_confirmation("Do you want to try again?"):
+                print("\nReturning to Main Menu.\n")
+                return
+            print()
+
+        # Print removed item
         print(f"\n{quantity} {name.title()} ({container.title()}, {food_group.title()}, {formatted_weight}) removed from inventory.\n")
 
         # Waits for user to press Enter to return to Main Menu (pause screen)
@@ -689,8 +1356,8 @@ class MenuManager:
             # If user input isn't empty, store it
             if filename_input:
                 filename = filename_input
-                # If user forgets to add .csv, add it at the end
-                if not filename.lower().endswith(file_extension):
+                # If user forgets to add .csv (or another supported extension), add it at the end
+                if not get_extension(filename):
                     filename += file_extension
                 break
             # Otherwise, print error message
@@ -733,7 +1400,7 @@ class MenuManager:
                 if user_input == '1':
                     # If current filename exists, save under that filename
                     if current_filename:
-                        self.inventory.save_inventory_to_csv(current_filename)
+                        self.inventory.save_changes(current_filename)
                     # Otherwise, follow save as prompt
                     else:
                         self.save_as(file_extension)
@@ -793,6 +1460,9 @@ class MenuManager:
             print("Inventory is empty. Nothing to save.\n")
             return
 
+        # Load outside changes first so saving doesn't overwrite them
+        self.check_external_changes()
+
         filename = self.inventory.get_current_file()
         file_extension = ".csv"
 
@@ -821,7 +1491,7 @@ class MenuManager:
             if user_input == '1':
                 # If current filename exists, save under that filename
                 if filename:
-                    self.inventory.save_inventory_to_csv(filename)
+                    self.inventory.save_changes(filename)
                     print()
                     break
                 # Otherwise, save as and ask for filename
@@ -846,6 +1516,8 @@ class MenuManager:
         """
             Save as csv file and prompt user to input filename
             If user types filename without .csv extention, program adds it at the end of filename
+            Other supported extensions export in that format:
+            .csv.gz/.csv.xz (compressed CSV), .jsonl/.jsonl.gz (JSON Lines), .txt (fixed-width)
             Checks if file exists under filename and asks for confirmation to save
         """
         # Prints newline
@@ -854,13 +1526,13 @@ class MenuManager:
         # Ask for filename
         # Keep asking until user enters a valid name (not empty)
         while True:
-            filename_input = input("Enter the CSV filename to save as (ex. file_name.csv): ").strip()
+            filename_input = input("Enter the filename to save as (ex. file_name.csv, file_name.csv.gz, file_name.jsonl, file_name.txt): ").strip()
 
             # If filename is not empty, save to variable
             if filename_input:
                 filename = filename_input
-                # If user forgets to add .csv, add it at the end
-                if not filename.lower().endswith(file_extention):
+                # If user forgets to add .csv (or another supported extension), add it at the end
+                if not get_extension(filename):
                     filename += file_extention
                 break
             print("\nFilename cannot be empty. Please try again.\n")
@@ -882,6 +1554,392 @@ class MenuManager:
             # Save data to config
             save_config(self.food_bank_name, filename)
 
+    # Plans and applies a distribution to households/agencies
+    def distribution_menu(self):
+        """
+            Prompts user for recipients (name and household size) and target servings
+            per person for each food group, then shows a fair allocation plan
+
+            If user confirms, the allocated quantities are removed from inventory
+        """
+        # If inventory is empty, show message and exit function
+        if not self.inventory.items:
+            print("\nInventory is empty. Nothing to distribute.\n")
+            return
+
+        # Prints newline
+        print()
+        # Puts "Plan Distribution" in borders
+        header = "PLAN DISTRIBUTION"
+        self.draw_header_with_borders(header)
+
+        # Ask for recipients until user enters a blank line
+        # Ex: Smith Family, 4
+        print("\nEnter each household/agency as: name, household size")
+        print("Press Enter on an empty line when done.\n")
+        recipients = []
+        while True:
+            line = input("Recipient: ").strip()
+            if not line:
+                break
+            name, _, size = line.rpartition(",")
+            # Names must be unique so each allocation can be told apart
+            if any(recipient.name.lower() == name.strip().lower() for recipient in recipients):
+                print(f"\n'{name.strip()}' was already entered. Please use a different name.\n")
+            elif name.strip() and size.strip().isdigit() and int(size) > 0:
+                recipients.append(Recipient(name, int(size)))
+            else:
+                print("\nInvalid recipient. Use the format: name, household size (ex. Smith Family, 4)\n")
+
+        # If no recipients were entered, return to Main Menu
+        if not recipients:
+            print("\nNo recipients entered. Returning to Main Menu.\n")
+            return
+
+        # Ask for target servings per person for each food group
+        print("\nEnter target servings per person for each food group (press Enter for 0):\n")
+        targets = {}
+        for group in CANONICAL_FOOD_GROUPS:
+            while True:
+                servings_input = input(f"{group}: ").strip()
+                if not servings_input or servings_input.isdigit():
+                    targets[group] = int(servings_input or 0)
+                    break
+                print("\nInvalid input. Please enter a whole number.\n")
+
+        plan = plan_allocation(self.inventory, recipients, targets)
+
+        # Print each recipient's allocation
+        # Ex: Smith Family (4) - 14 units | Grains 8/8, Protein 6/8
+        print()
+        self.draw_border()
+        for recipient, fill, allocation in zip(recipients, plan.fill, plan.allocations):
+            units = sum(quantity for _, quantity in allocation)
+            groups = ", ".join(f"{group} {given}/{target}" for group, (given, target) in fill.items())
+            print(f"{recipient.name} ({recipient.household_size}) - {units} units | {groups}")
+        self.draw_border()
+        print(f"Total units to distribute: {plan.get_total_quantity()}")
+
+        # If nothing can be allocated, return to Main Menu
+        if not plan.totals:
+            print("\nNothing to distribute. Returning to Main Menu.\n")
+            return
+
+        # Show what would be left by food group (the plan is applied to a what-if view,
+        # so inventory isn't changed)
+        # Ex: Grains: 120 --> 96
+        view = self.inventory.create_view()
+        plan.apply(view)
+        before = self.inventory.get_report("food_group")
+        after = view.get_report("food_group")
+        print("\nStock left by food group (now --> after distribution):")
+        for group in sorted(before):
+            print(f"{group[0].title()}: {before[group][1]} --> {after.get(group, [0, 0])[1]}")
+
+        # Ask user to confirm before removing from inventory
+        if not self.get_confirmation("Remove these quantities from inventory?"):
+            print("\nDistribution canceled. Returning to Main Menu.\n")
+            return
+
+        if plan.apply(self.inventory):
+            print(f"\n{plan.get_total_quantity()} units removed from inventory for {len(recipients)} recipient(s).\n")
+        else:
+            print("\nInventory changed since the plan was made. Nothing was removed.\n")
+
+        # Waits for user to press Enter to return to Main Menu (pause screen)
+        input("Press Enter to return to Main Menu...")
+
+    # Displays reports menu
+    def reports_menu(self):
+        """
+            Displays the reports menu
+            Shows item counts and total quantities grouped by:
+            (1) Food Group
+            (2) Container
+            (3) Unit
+            (4) Food Group and Container
+            (5) Food Group and Unit
+            (6) Stock Held Over Time
+            (R) Return to Main Menu
+        """
+        # If inventory is empty, show message and exit function
+        if not self.inventory.items:
+            print("\nInventory is empty. Nothing to report.\n")
+            return
+
+        # Map user input to report dimensions and display name
+        report_options = {
+            '1': (("food_group",), 'Food Group'),
+            '2': (("container",), 'Container'),
+            '3': (("unit",), 'Unit'),
+            '4': (("food_group", "container"), 'Food Group and Container'),
+            '5': (("food_group", "unit"), 'Food Group and Unit'),
+        }
+
+        while True:
+            # Prints newline
+            print()
+
+            # Puts "REPORTS" header in borders
+            header = "REPORTS"
+            self.draw_header_with_borders(header)
+
+            # Prints newline
+            print()
+
+            # Print map
+            print("Group by:")
+            for key, (_, title) in report_options.items():
+                print(f"({key}) {title}")
+            print("(6) Stock Held Over Time")
+            print("(R) Return to Main Menu")
+            print()
+
+            # Ask user to choose an option
+            user_input = input("Choose one of the following options: ").strip().lower()
+
+            # If user input matches map, show the report
+            if user_input in report_options:
+                group_by, title = report_options[user_input]
+                # Food group report also shows how long each group will last
+                days_of_supply = self.inventory.get_group_days_of_supply() if group_by == ("food_group",) else None
+                self.display_report(self.inventory.get_report(*group_by), title, days_of_supply)
+            # If user presses '6', show stock held over time
+            elif user_input == '6':
+                self.stock_history_menu()
+            # If user presses 'r', return to main menu
+            elif user_input == 'r':
+                print()
+                break
+            # Otherwise, print invalid input message
+            else:
+                print("\nInvalid input. Please try again.")
+
+    # Displays one report
+    def display_report(self, report, title, days_of_supply=None):
+        """
+            Prints each group of a report with its item count and total quantity
+            Ex: Grains / Bag - Items: 3, Qty: 45
+            days_of_supply (optional): {food group: days} shown for a food group report
+            Ex: Grains - Items: 3, Qty: 45 - Days Left: 12.5
+        """
+        # Print newline
+        print()
+
+        # Puts report title in borders
+        header = f"Report - {title}"
+        self.draw_header_with_borders(header)
+
+        # Print newline
+        print()
+
+        # Print each group in alphabetical order
+        for group in sorted(report):
+            item_count, quantity = report[group]
+            days_left = format_days_of_supply(days_of_supply.get(group[0])) if days_of_supply else ""
+            print(f"{' / '.join(group)} - Items: {item_count}, Qty: {quantity}{days_left}")
+
+        # Print newline
+        print()
+
+        # Draws border to separate report from totals
+        self.draw_border()
+
+        # Displays totals (unique items and total quantities)
+        self.inventory.display_totals()
+
+        # Waits for user to press Enter to return to Reports Menu (pause screen)
+        input("Press Enter to return to Reports Menu...")
+
+    # Displays stock held per food group over a date range
+    def stock_history_menu(self):
+        """
+            Prompts user for a start and end date and shows, per food group:
+            stock on the start and end dates, units added and removed, and average units held
+            Ex: Grains - Start: 120, End: 80, Added: 40, Removed: 80, Avg: 96.5
+        """
+        # Ask for the date range (end defaults to today)
+        while True:
+            try:
+                start_date = parse_date(input("\nStart date (YYYY-MM-DD): "))
+                end_date = parse_date(input("End date (YYYY-MM-DD, press Enter for today): ")) or date.today()
+            except ValueError as e:
+                print(f"\n{e}")
+                continue
+            if start_date is None:
+                print("\nStart date cannot be empty.")
+            elif end_date < start_date:
+                print("\nEnd date cannot be before the start date.")
+            else:
+                break
+
+        # Range covers the start of the start date to the end of the end date
+        start = datetime.combine(start_date, time.min).timestamp()
+        end = datetime.combine(end_date + timedelta(days=1), time.min).timestamp()
+        report = self.inventory.get_stock_history_report(start, end)
+
+        # Print newline
+        print()
+
+        # Puts date range in borders
+        header = f"Stock Held - {format_date(start_date)} to {format_date(end_date)}"
+        self.draw_header_with_borders(header)
+
+        # Print newline
+        print()
+
+        if report is None:
+            print("Stock history is not being recorded.\n")
+        elif not report:
+            print("No stock was held in this date range.\n")
+        else:
+            # Print each food group in alphabetical order
+            for food_group in sorted(report):
+                start_quantity, end_quantity, added, removed, average = report[food_group]
+                print(f"{food_group} - Start: {start_quantity}, End: {end_quantity}, Added: {added}, Removed: {removed}, Avg: {average:.1f}")
+            print()
+
+        # Waits for user to press Enter to return to Reports Menu (pause screen)
+        input("Press Enter to return to Reports Menu...")
+
+    # Checks the inventory file for outside changes
+    def check_external_changes(self):
+        """
+            Checks if the current inventory file was changed outside this program
+            Changes that don't conflict with unsaved changes are loaded automatically
+            For each conflict, user chooses which version to keep
+        """
+        try:
+            applied, conflicts = self.watcher.check()
+        except Exception as e:
+            print(f"\nCould not check '{self.inventory.get_current_file()}' for outside changes: {e}\n")
+            return
+
+        if applied:
+            print(f"\n'{self.inventory.get_current_file()}' was changed outside this program. "
+                  f"{applied} change(s) loaded.\n")
+
+        for conflict in conflicts:
+            self.resolve_conflict_menu(conflict)
+
+    # Asks user to resolve a conflict
+    def resolve_conflict_menu(self, conflict):
+        """
+            Shows an item changed both here and in the file, and asks which version to keep:
+            (1) Keep Mine
+            (2) Use File Version
+        """
+        name, container, food_group, weight = conflict.key
+
+        # Print newline
+        print()
+
+        # Puts "CONFLICT" header in borders
+        header = "CONFLICT - ITEM CHANGED IN FILE AND HERE"
+        self.draw_header_with_borders(header)
+
+        # Print conflict info
+        # Ex: Rice (Bag, Grains, 1 lb) - Was: 20, File: 30, Mine: 25
+        #     Different in file: quantity, location
+        print(f"\n{name.title()} ({container.title()}, {food_group.title()}, {weight})")
+        print(f"Was: {conflict.base}, File: {conflict.theirs}, Mine: {conflict.mine}")
+        print(f"Different in file: {', '.join(field.replace('_', ' ') for field in conflict.fields)}\n")
+
+        while True:
+            print("(1) Keep Mine")
+            print("(2) Use File Version\n")
+            user_input = input("Choose an option: ").strip()
+
+            # If user presses 1, keep this program's quantity
+            if user_input == '1':
+                self.watcher.resolve(conflict, keep_mine=True)
+                break
+            # If user presses 2, take the file's version
+            elif user_input == '2':
+                self.watcher.resolve(conflict, keep_mine=False)
+                break
+            # Otherwise, print invalid input message
+            else:
+                print("\nInvalid input. Please try again.\n")
+
+    # Describes a change record from inventory history
+    def describe_change(self, record):
+        """
+            Returns a short description of a change record
+            Ex: 10 Corn (Can, Vegetables, 12 oz) added
+            Ex (batch): 3 items (25 units) added
+        """
+        changes = record[0]
+        if len(changes) > 1:
+            total = sum(delta for _, delta, _, _ in changes)
+            action = "added" if total > 0 else "removed"
+            return f"{len(changes)} items ({abs(total)} units) {action}"
+
+        key, delta = changes[0][0], changes[0][1]
+        name, container, food_group, _ = key
+        weight = self.inventory.get_display_weight(key)
+        action = "added" if delta > 0 else "removed"
+        return f"{abs(delta)} {name.title()} ({container.title()}, {food_group.title()}, {weight}) {action}"
+
+    # Undoes the last change to inventory
+    def undo_menu(self):
+        """
+            Undoes the most recent add/remove and prints what was undone
+            Prints a message if there is nothing to undo
+        """
+        record = self.inventory.undo()
+
+        # If there is nothing to undo, print message and return to Main Menu
+        if record is None:
+            print("\nNothing to undo.\n")
+            return
+
+        print(f"\nUndone: {self.describe_change(record)}.\n")
+
+    # Redoes the last undone change to inventory
+    def redo_menu(self):
+        """
+            Redoes the most recently undone add/remove and prints what was redone
+            Prints a message if there is nothing to redo
+        """
+        record = self.inventory.redo()
+
+        # If there is nothing to redo, print message and return to Main Menu
+        if record is None:
+            print("\nNothing to redo.\n")
+            return
+
+        print(f"\nRedone: {self.describe_change(record)}.\n")
+
+    # Displays items changed since the last save
+    def display_pending_changes(self, limit:int = 20):
+        """
+            Prints a summary of items changed since the last save
+            Shows up to limit items with their net change and current quantity,
+            and other edits (location, reorder threshold, merged sizes)
+        """
+        edits = self.inventory.get_edited_keys()
+        # Quantity changes first, then items with only other edits
+        changes = [(key, f"{delta:+d} ({'now ' + str(quantity) if quantity else 'deleted'})")
+                   for key, delta, quantity in self.inventory.get_pending_changes()]
+        changes += [(key, "") for key in edits if key not in self.inventory.pending_changes]
+
+        print(f"\nYou have unsaved changes to {len(changes)} item(s):\n")
+
+        # Print each changed item
+        # Ex: Corn (Can, Vegetables, 12 oz): -10 (now 4)
+        # Ex: Rice (Bag, Grains, 1 lb): location changed
+        for key, status in changes[:limit]:
+            name, container, food_group, _ = key
+            weight = self.inventory.get_display_weight(key)
+            if key in edits:
+                status = ", ".join(([status] if status else []) + edits[key])
+            print(f"{name.title()} ({container.title()}, {food_group.title()}, {weight}): {status}")
+
+        # If there are more changes than the limit, print how many are not shown
+        if len(changes) > limit:
+            print(f"...and {len(changes) - limit} more")
+
     # Save before quitting menu
     def save_before_quitting_menu(self):
         """
@@ -899,8 +1957,11 @@ class MenuManager:
             # Storing changed flag (True = unsaved changes, False = saved/unchanged)
             inventory_changed = self.inventory.get_changed()
         
+            # List the pending changes
+            self.display_pending_changes()
+
             # Print menu and record user input
-            print("\nYou have unsaved changes. What would you like to do?\n")
+            print("\nWhat would you like to do?\n")
             print("(1) Save and quit")
             print("(2) Quit without saving")
             print("(3) Cancel quit")
@@ -939,8 +2000,38 @@ class MenuManager:
             else:
                 print("\nInvalid input. Please try again.\n")
 
+    # Turns on canonical units and merges items with equivalent sizes
+    def merge_units_menu(self):
+        """
+            Explains canonical units, asks for confirmation, then merges items with
+            equivalent sizes (ex. 16 oz and 1 lb rice) and saves the setting to config.txt
+        """
+        self.draw_header_with_borders("Merge Equivalent Sizes")
+
+        if self.inventory.canonical_units:
+            print("\nEquivalent sizes are already merged (Canonical Units is on in config.txt).\n")
+            return
+
+        print("\nItems with the same name, container, and food group whose sizes are equal")
+        print("(ex. 16 oz and 1 lb, or 1000 mL and 1 L) will be merged into one item.")
+        print("Sizes added later are matched the same way. This can't be undone.\n")
+
+        if not self.get_confirmation("Merge equivalent sizes?"):
+            print("\nMerge canceled.\n")
+            return
+
+        merged = self.inventory.enable_canonical_units()
+        print(f"\nMerged {merged} item(s) into items with an equivalent size.")
+
+        # Keep the setting for the next time the program starts
+        _, inventory_csv = load_config()
+        save_config(self.food_bank_name, inventory_csv, canonical_units=True)
+
     def main_menu(self):
         while not self.end_program:
+            # Load any changes made to the inventory file outside this program
+            self.check_external_changes()
+
             # Prints the main menu
             self.print_main_menu()                   
             user_input = input("Choose one of the options above: ").strip().lower()
@@ -960,6 +2051,30 @@ class MenuManager:
             # If user presses 5, display save inventory menu
             elif user_input == '5':
                 self.save_inventory_menu()
+            # If user presses 6, undo the last change
+            elif user_input == '6':
+                self.undo_menu()
+            # If user presses 7, redo the last undone change
+            elif user_input == '7':
+                self.redo_menu()
+            # If user presses 8, plan a distribution to households/agencies
+            elif user_input == '8':
+                self.distribution_menu()
+            # If user presses 9, display reports menu
+            elif user_input == '9':
+                self.reports_menu()
+            # If user presses 's', start scan mode
+            elif user_input == 's':
+                self.scan_items_menu()
+            # If user presses 'e', start quick entry
+            elif user_input == 'e':
+                self.quick_entry_menu()
+            # If user presses 'u', merge items with equivalent sizes
+            elif user_input == 'u':
+                self.merge_units_menu()
+            # If user presses 'l', display bin locations menu
+            elif user_input == 'l':
+                self.locations_menu()
             #If user presses 'q' or 'Q', end program
             elif user_input == 'q':
                 # Store inventory changed flag (determines if the inventory has been saved before quitting program)
@@ -0,0 +1,178 @@
+import gc
+import marshal
+import os
+from datetime import date
+from item import Item
+from lots import Lot
+
+# Extension added to the inventory filename for its parse cache file
+CACHE_EXTENSION = ".cache"
+
+# Marks a file as an inventory parse cache
+CACHE_MAGIC = "food-bank-inventory-cache"
+
+# Version of the cache file layout (caches with another version are stale)
+CACHE_FORMAT = 4
+
+# Bytes used to store the length of the cache header
+# (a cache file is: header length, marshaled header, marshaled rows)
+HEADER_LENGTH_BYTES = 4
+
+# Longest header accepted (longer means the file isn't a parse cache)
+MAX_HEADER_LENGTH = 1 << 16
+
+# Returns the cache filename for an inventory file
+def get_cache_file(filename):
+    """Returns the name of the parse cache file that goes with filename"""
+    return filename + CACHE_EXTENSION
+
+# Returns the key a cache file must match
+def make_cache_key(filename, stats, digest, canonical_units:bool = False):
+    """
+        Returns the cache key of filename: (absolute path, mtime_ns, size, content hash, canonical units)
+        stats: (mtime_ns, size) of the file, digest: its content hash (see exporters.py)
+        canonical_units: True if item keys use canonical weights (items are merged differently)
+    """
+    return (os.path.abspath(filename), stats[0], stats[1], digest, canonical_units)
+
+# Converts a date to a number marshal can store
+def _to_ordinal(value):
+    """Returns value.toordinal(), or None for None"""
+    return value.toordinal() if value is not None else None
+
+# Converts a stored number back to a date
+def _from_ordinal(value):
+    """Returns date.fromordinal(value), or None for None"""
+    return date.fromordinal(value) if value is not None else None
+
+# Reads the header of a cache file
+def _read_header(file):
+    """
+        Returns the header of an open cache file, (CACHE_MAGIC, format, key),
+        or None if the file isn't a parse cache
+    """
+    length = int.from_bytes(file.read(HEADER_LENGTH_BYTES), "little")
+    if length > MAX_HEADER_LENGTH:
+        return None
+    try:
+        header = marshal.loads(file.read(length))
+    except (EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(header, tuple) or len(header) != 3 or header[0] != CACHE_MAGIC:
+        return None
+    return header
+
+# Reads the cached items of an inventory file
+def load_cache(filename, key):
+    """
+        Returns (items, thresholds) from the cache file of filename if it was written for key,
+        otherwise None (no cache, a stale cache, or an unreadable cache)
+        items: dictionary of item key -> Item, thresholds: dictionary of item key -> reorder_at
+    """
+    try:
+        with open(get_cache_file(filename), 'rb') as file:
+            # The header is read first, so a stale cache isn't read any further
+            if _read_header(file) != (CACHE_MAGIC, CACHE_FORMAT, key):
+                return None
+            # Reading all the bytes and then unmarshaling is much faster than marshal.load(file)
+            rows = marshal.loads(file.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    # Building many objects at once triggers garbage collections that find nothing
+    # to free, so they're paused until the items are built
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        items = {}
+        thresholds = {}
+        for item_key, name, container, food_group, weight, quantity, reorder_at, location, lots in rows:
+            lots = [Lot(lot_id, _from_ordinal(donated), source, lot_quantity, _from_ordinal(expiration))
+                    for lot_id, donated, source, lot_quantity, expiration in lots]
+            items[item_key] = Item(name, container, food_group, weight, quantity, lots=lots, location=location)
+            if reorder_at is not None:
+                thresholds[item_key] = reorder_at
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return items, thresholds
+
+# Writes the items of an inventory file to its cache
+def save_cache(filename, key, items, thresholds):
+    """
+        Writes items and thresholds (as read from filename) to the cache file of filename
+        The cache is written to a temporary file first, so a failed write never leaves
+        a partial cache behind. Returns True if the cache was written
+    """
+    rows = [(item_key, item.name, item.container, item.food_group, item.weight, item.quantity,
+             thresholds.get(item_key), item.location,
+             tuple((lot.lot_id, _to_ordinal(lot.donation_date), lot.source, lot.quantity, _to_ordinal(lot.expiration))
+                   for lot in item.lots))
+            for item_key, item in items.items()]
+
+    cache_filename = get_cache_file(filename)
+    temp_filename = cache_filename + ".tmp"
+    try:
+        with open(temp_filename, 'wb') as file:
+            header = marshal.dumps((CACHE_MAGIC, CACHE_FORMAT, key))
+            file.write(len(header).to_bytes(HEADER_LENGTH_BYTES, "little"))
+            file.write(header)
+            file.write(marshal.dumps(rows))
+        os.replace(temp_filename, cache_filename)
+    except (OSError, ValueError):
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+        return False
+    return True
+
+# Deletes the cache of an inventory file
+def remove_cache(filename):
+    """Deletes the cache file of filename (used when filename is rewritten)"""
+    try:
+        os.remove(get_cache_file(filename))
+    except FileNotFoundError:
+        pass
+
+# Deletes cache files that no longer match their inventory file
+def evict_stale_caches(directory="."):
+    """
+        Deletes the cache files in directory whose inventory file is gone, has a different
+        size or modified time than when it was cached, or that use an old cache format
+        Only the header of each cache is read, and no inventory file is hashed
+        Files that aren't parse caches are never deleted
+        Returns the number of cache files deleted
+    """
+    removed = 0
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return removed
+
+    for entry in entries:
+        if not entry.is_file() or not entry.name.endswith(CACHE_EXTENSION):
+            continue
+
+        # Read the header (skip files that can't be read or aren't caches)
+        try:
+            with open(entry.path, 'rb') as file:
+                header = _read_header(file)
+        except OSError:
+            continue
+        if header is None:
+            continue
+
+        # Stale if the format changed or the inventory file changed or is gone
+        _, cache_format, key = header
+        try:
+            stat = os.stat(entry.path[:-len(CACHE_EXTENSION)])
+            stale = cache_format != CACHE_FORMAT or (stat.st_mtime_ns, stat.st_size) != tuple(key[1:3])
+        except (OSError, TypeError):
+            stale = True
+
+        if stale:
+            try:
+                os.remove(entry.path)
+                removed += 1
+            except OSError:
+                pass
+    return removed
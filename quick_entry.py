@@ -0,0 +1,79 @@
+from functools import lru_cache
+from food_groups import normalize_food_group
+from measurements import format_unit
+
+# Most tokens a weight can take up (ex. "8 fl oz")
+MAX_WEIGHT_TOKENS = 3
+
+# Looks up a food group token (cached, since manifests repeat the same few groups)
+@lru_cache(maxsize=None)
+def _parse_food_group(token:str):
+    """Returns the canonical food group of token, or None if unrecognized"""
+    return normalize_food_group(token)
+
+# Parses a weight (cached, since manifests repeat the same few sizes)
+@lru_cache(maxsize=4096)
+def _parse_weight(text:str):
+    """Returns text formatted by format_unit, or None if it isn't a valid weight"""
+    try:
+        return format_unit(text) or None
+    except ValueError:
+        return None
+
+# Parses one quick-entry line
+def parse_line(line:str):
+    """
+        Parses one line in the format: QUANTITY CONTAINER NAME WEIGHT FOOD_GROUP
+        Ex: "10 can corn 12oz veg" --> ("corn", "can", "Vegetables", "12 oz", 10)
+        The name can be several words and the weight can be written with or without spaces
+
+        Returns (name, container, food group, weight, quantity)
+        Raises ValueError describing the first problem found
+    """
+    tokens = line.lower().split()
+    if len(tokens) < 5:
+        raise ValueError("Expected: QUANTITY CONTAINER NAME WEIGHT FOOD_GROUP.")
+
+    # Quantity comes first (ex. 10 or 10x)
+    quantity_token = tokens[0].rstrip("x")
+    if not quantity_token.isdigit() or int(quantity_token) <= 0:
+        raise ValueError(f"Invalid quantity '{tokens[0]}'. Must be a whole number greater than 0.")
+    quantity = int(quantity_token)
+
+    # Food group comes last
+    food_group = _parse_food_group(tokens[-1])
+    if food_group is None:
+        raise ValueError(f"Unknown food group '{tokens[-1]}'.")
+
+    # Weight is the fewest tokens before the food group that form a valid weight
+    # (leaving at least one token each for the container and name)
+    weight = None
+    for count in range(1, min(MAX_WEIGHT_TOKENS, len(tokens) - 4) + 1):
+        weight = _parse_weight(" ".join(tokens[-1 - count:-1]))
+        if weight is not None:
+            break
+    if weight is None:
+        raise ValueError(f"No valid weight before '{tokens[-1]}' (ex. 12 oz, 2 lb).")
+
+    container = tokens[1]
+    name = " ".join(tokens[2:-1 - count])
+    return name, container, food_group, weight, quantity
+
+# Parses a block of quick-entry lines
+def parse_lines(lines):
+    """
+        Parses each non-empty line with parse_line
+        Returns (entries, errors)
+        entries: list of (name, container, food group, weight, quantity)
+        errors: list of (line number, line, error message)
+    """
+    entries = []
+    errors = []
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            entries.append(parse_line(line))
+        except ValueError as e:
+            errors.append((number, line.strip(), str(e)))
+    return entries, errors
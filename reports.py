@@ -0,0 +1,64 @@
+from food_groups import normalize_food_group
+from measurements import format_unit
+
+# Returns the food group of an item for reports
+def _food_group(item) -> str:
+    """Returns the canonical food group of item (or the item's own group if unrecognized)"""
+    return normalize_food_group(item.food_group) or item.food_group.title()
+
+# Returns the container of an item for reports
+def _container(item) -> str:
+    """Returns the container of item"""
+    return item.container.title()
+
+# Returns the unit of an item's weight for reports
+def _unit(item) -> str:
+    """
+        Returns the unit of item's weight (ex. 12 oz --> oz)
+        Weights without a unit (ex. an empty weight from a file) have the unit "",
+        and weights that aren't valid are returned as they are
+    """
+    try:
+        formatted = format_unit(item.weight)
+    except ValueError:
+        return item.weight
+    _, _, unit = formatted.partition(" ")
+    return unit
+
+# Dimensions items can be grouped by in a report
+REPORT_DIMENSIONS = {
+    "food_group": _food_group,
+    "container": _container,
+    "unit": _unit,
+}
+
+# Builds group-by reports in one pass over the items
+def build_reports(items, group_bys):
+    """
+        Builds one report per group_by in a single pass over items
+
+        group_bys: list of tuples of dimension names (ex. [("food_group",), ("food_group", "unit")])
+        Returns {group_by: {group values (tuple): [item count, total quantity]}}
+        Raises ValueError for an unknown dimension
+    """
+    for group_by in group_bys:
+        for dimension in group_by:
+            if dimension not in REPORT_DIMENSIONS:
+                raise ValueError(f"Unknown report dimension '{dimension}'.")
+
+    # Each dimension is computed once per item, even if several reports use it
+    dimensions = sorted({dimension for group_by in group_bys for dimension in group_by})
+    reports = {group_by: {} for group_by in group_bys}
+
+    for item in items:
+        values = {dimension: REPORT_DIMENSIONS[dimension](item) for dimension in dimensions}
+        for group_by, report in reports.items():
+            group = tuple(values[dimension] for dimension in group_by)
+            totals = report.get(group)
+            if totals is None:
+                report[group] = [1, item.quantity]
+            else:
+                totals[0] += 1
+                totals[1] += item.quantity
+
+    return reports
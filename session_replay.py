@@ -0,0 +1,207 @@
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+import menu_manager
+from config import load_config
+from main import main as run_program
+from menu_manager import MenuManager
+
+# Version of the session file layout
+SESSION_FORMAT = 1
+
+# Percentiles shown in replay reports
+REPORT_PERCENTILES = (50, 90, 99)
+
+# Returns the menu that asked for input
+def _calling_menu(frame):
+    """
+        Returns the name of the closest menu function (name ending in "_menu") on the call
+        stack starting at frame, so prompts from helpers like get_confirmation count toward
+        the menu that used them. Falls back to the function that called input
+    """
+    caller = frame.f_code.co_name
+    while frame is not None:
+        if frame.f_code.co_name.endswith("_menu"):
+            return frame.f_code.co_name
+        frame = frame.f_back
+    return caller
+
+# Returns a percentile of some values
+def percentile(values, percent:float):
+    """
+        Returns the percent-th percentile of values (nearest rank), or 0.0 if there are none
+        Ex: percentile([1, 2, 3, 4], 50) --> 2
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[int(rank) - 1]
+
+class SessionRecorder:
+    """
+        Stands in for input() in menu_manager and writes every prompt and response to a
+        session file (JSON lines), with timestamps
+
+        The first line is a header: {"format", "started", "inventory"}
+        Each step is: {"menu", "prompt", "response", "at", "latency", "think"}
+        at: seconds since the session started when the response was entered
+        latency: seconds the program took to show the prompt after the previous response
+        think: seconds user took to answer
+    """
+    def __init__(self, file, inventory_file=None):
+        # Open session file (steps are written as they happen, so a crash keeps the session)
+        self.file = file
+        self.started = time.perf_counter()
+        # When the previous response was entered (program time is measured from here)
+        self.last_response = self.started
+        self._write({"format": SESSION_FORMAT, "started": datetime.now().isoformat(timespec="seconds"),
+                     "inventory": os.path.abspath(inventory_file) if inventory_file else None})
+
+    # Writes one line to the session file
+    def _write(self, entry):
+        """Writes entry as one JSON line and flushes it"""
+        self.file.write(json.dumps(entry) + "\n")
+        self.file.flush()
+
+    # Asks for input and records it
+    def __call__(self, prompt=""):
+        """Calls the real input(prompt) and records the prompt, response, and timings"""
+        menu = _calling_menu(sys._getframe(1))
+        asked = time.perf_counter()
+        response = builtins.input(prompt)
+        answered = time.perf_counter()
+        self._write({"menu": menu, "prompt": prompt, "response": response,
+                     "at": round(answered - self.started, 6),
+                     "latency": round(asked - self.last_response, 6),
+                     "think": round(answered - asked, 6)})
+        self.last_response = answered
+        return response
+
+class SessionPlayer:
+    """
+        Stands in for input() in menu_manager and answers every prompt with the next
+        recorded response, timing how long the program takes to get to each prompt
+
+        Raises EOFError (like input() at the end of a file) when the responses run out
+        latencies: menu name -> list of seconds from the previous response to its prompt
+        mismatches: number of prompts that weren't the prompt recorded at that step
+    """
+    def __init__(self, steps):
+        # Recorded steps ({"prompt", "response"}, in order)
+        self.steps = steps
+        self.position = 0
+        self.latencies = {}
+        self.mismatches = 0
+        self.last_response = time.perf_counter()
+
+    # Answers a prompt with the next recorded response
+    def __call__(self, prompt=""):
+        """Returns the next recorded response (raises EOFError if there are none left)"""
+        asked = time.perf_counter()
+        menu = _calling_menu(sys._getframe(1))
+        self.latencies.setdefault(menu, []).append(asked - self.last_response)
+
+        if self.position >= len(self.steps):
+            raise EOFError("end of recorded session")
+        step = self.steps[self.position]
+        self.position += 1
+        if step.get("prompt") is not None and step["prompt"] != prompt:
+            self.mismatches += 1
+
+        self.last_response = time.perf_counter()
+        return step["response"]
+
+# Reads a session file
+def load_session(filename):
+    """
+        Returns (header, steps) from a session file written by SessionRecorder
+        Raises ValueError if the file isn't a session file
+    """
+    with open(filename, 'r', encoding='utf-8') as file:
+        lines = [json.loads(line) for line in file if line.strip()]
+    if not lines or lines[0].get("format") != SESSION_FORMAT:
+        raise ValueError(f"'{filename}' is not a session file.")
+    return lines[0], lines[1:]
+
+# Records a real session
+def record_session(filename):
+    """
+        Runs the program (main.py) and records every menu prompt and response to filename
+        The prompt for the food bank name (if config has none) is asked before the menus and is not recorded
+    """
+    _, inventory_csv = load_config()
+    with open(filename, 'w', encoding='utf-8') as file:
+        menu_manager.input = SessionRecorder(file, inventory_csv)
+        try:
+            run_program()
+        finally:
+            del menu_manager.input
+
+# Replays a session without a user
+def replay_session(steps, inventory, food_bank_name="Replay"):
+    """
+        Feeds recorded steps through MenuManager.main_menu on inventory (headless)
+        Output is thrown away, and the replay runs in a temporary directory so files the
+        session saves (inventory, config) don't overwrite real ones
+
+        Returns the SessionPlayer (latencies per menu, mismatched prompts, and steps used)
+        A session that ends before the user quits stops when its responses run out
+    """
+    player = SessionPlayer(steps)
+    directory = os.getcwd()
+    menu_manager.input = player
+    try:
+        with tempfile.TemporaryDirectory() as replay_directory:
+            os.chdir(replay_directory)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    MenuManager(inventory, food_bank_name).main_menu()
+            except EOFError:
+                pass
+            finally:
+                os.chdir(directory)
+    finally:
+        del menu_manager.input
+    return player
+
+# Prints latency percentiles of a replay
+def print_latency_report(player):
+    """
+        Prints the number of prompts and latency percentiles (ms) of each menu, slowest p99 first
+        Ex: remove_item_menu      12      0.04      0.11      0.35      0.35
+    """
+    headers = "".join(f"{'p' + str(percent):>10}" for percent in REPORT_PERCENTILES)
+    print(f"{'menu':<28}{'prompts':>8}{headers}{'max':>10}  (ms)")
+
+    def p99(entry):
+        return percentile(entry[1], REPORT_PERCENTILES[-1])
+
+    for menu, latencies in sorted(player.latencies.items(), key=p99, reverse=True):
+        values = "".join(f"{percentile(latencies, percent) * 1000:10.2f}" for percent in REPORT_PERCENTILES)
+        print(f"{menu:<28}{len(latencies):>8}{values}{max(latencies) * 1000:10.2f}")
+
+    print(f"{player.position} of {len(player.steps)} recorded responses used, "
+          f"{player.mismatches} prompt(s) differed from the recording")
+
+def main():
+    """
+        Records a session of the program to a file
+        python session_replay.py SESSION_FILE
+        (replay it with: python benchmarks.py replay --session SESSION_FILE)
+    """
+    parser = argparse.ArgumentParser(description="Record every menu prompt and response of a session.")
+    parser.add_argument("session", help="session file to write (JSON lines)")
+    args = parser.parse_args()
+    record_session(args.session)
+
+# Only run main when executing this program
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+import bisect
+import csv
+import os
+import time
+from food_groups import normalize_food_group
+
+# Default file for the stock history log
+STOCK_HISTORY_FILE = "stock_history.log"
+
+# Extensions added to the log filename for the key table and checkpoint files
+KEYS_EXTENSION = ".keys"
+CHECKPOINT_EXTENSION = ".ckpt"
+
+# Minimum number of events between checkpoints
+CHECKPOINT_EVERY = 1000
+
+# Encodings of whole numbers for the binary log
+
+# Appends a varint to a bytearray
+def _write_varint(buffer:bytearray, value:int):
+    """Appends a non-negative int as a varint (7 bits per byte, high bit = more bytes follow)"""
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+# Reads a varint from bytes
+def _read_varint(data, position:int):
+    """
+        Reads a varint starting at position
+        Returns (value, next position)
+        Raises IndexError if data ends in the middle of the varint
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+# Maps a signed int to a non-negative int
+def _zigzag(value:int) -> int:
+    """Maps 0, -1, 1, -2, 2... to 0, 1, 2, 3, 4... so small changes stay small varints"""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+# Maps a zigzag int back to a signed int
+def _unzigzag(value:int) -> int:
+    """Reverses _zigzag"""
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+class StockHistory:
+    """
+        Append-only history of stock level changes, used for "stock held over time" reports
+
+        Three files are kept:
+        - the log (filename): one event per quantity change, stored as three varints:
+          seconds since the previous event, key id x 2 (+1 for a removal), and the change
+          (zigzag encoded). Most events take 3-5 bytes
+        - the key table (filename + .keys): CSV of keys, where the row number is the key id
+        - checkpoints (filename + .ckpt): the full stock level of every key at a log offset
+
+        A checkpoint is written once the events since the last one reach CHECKPOINT_EVERY
+        or the number of stocked keys (whichever is more), so checkpoints never take more
+        space than the events between them. A query seeks to the last checkpoint before
+        its start time and replays at most one checkpoint interval to get there
+    """
+    def __init__(self, filename:str = STOCK_HISTORY_FILE):
+        self.filename = filename
+        # Key table: id -> key, and key -> id
+        self.keys = []
+        self.key_ids = {}
+        # Current stock level of every key id with stock
+        self.stock = {}
+        # Time (seconds) of the last event
+        self.last_time = 0
+        # Size of the log in bytes
+        self.log_size = 0
+        # Checkpoints as parallel lists of time, log offset, and checkpoint file offset
+        self.checkpoint_times = []
+        self.checkpoint_offsets = []
+        self.checkpoint_positions = []
+        # Events written since the last checkpoint
+        self.events_since_checkpoint = 0
+        self._open()
+
+    # Reads the key table, checkpoints, and the end of the log
+    def _open(self):
+        """Loads the key table and checkpoints, then replays the log after the last checkpoint"""
+        keys_filename = self.filename + KEYS_EXTENSION
+        if os.path.exists(keys_filename):
+            with open(keys_filename, 'r', newline='', encoding='utf-8') as file:
+                for row in csv.reader(file):
+                    self.key_ids[tuple(row)] = len(self.keys)
+                    self.keys.append(tuple(row))
+
+        if os.path.exists(self.filename):
+            self.log_size = os.path.getsize(self.filename)
+
+        # Read checkpoint headers (checkpoints past the end of the log are from an unfinished write)
+        checkpoint_filename = self.filename + CHECKPOINT_EXTENSION
+        if os.path.exists(checkpoint_filename):
+            with open(checkpoint_filename, 'rb') as file:
+                data = file.read()
+            position = 0
+            try:
+                while position < len(data):
+                    start = position
+                    when, position = _read_varint(data, position)
+                    offset, position = _read_varint(data, position)
+                    count, position = _read_varint(data, position)
+                    for _ in range(count * 2):
+                        _, position = _read_varint(data, position)
+                    if offset > self.log_size:
+                        break
+                    self.checkpoint_times.append(when)
+                    self.checkpoint_offsets.append(offset)
+                    self.checkpoint_positions.append(start)
+            except IndexError:
+                pass
+
+        # Replay the log from the last checkpoint to get the current stock
+        stock, offset, when = self._seek(None)
+        for when, key_id, delta, _ in self._events(offset, when):
+            stock[key_id] = stock.get(key_id, 0) + delta
+            self.events_since_checkpoint += 1
+        self.stock = {key_id: quantity for key_id, quantity in stock.items() if quantity}
+        self.last_time = when
+
+    # Returns the id of a key, adding it to the key table if it's new
+    def _key_id(self, key, new_keys) -> int:
+        """
+            Returns the id of key, adding it to the key table if it's new
+            New keys are also appended to new_keys, to be written to the key table file
+            with _write_keys (one write for a whole batch)
+        """
+        key_id = self.key_ids.get(key)
+        if key_id is None:
+            key_id = len(self.keys)
+            self.keys.append(key)
+            self.key_ids[key] = key_id
+            new_keys.append(key)
+        return key_id
+
+    # Appends new keys to the key table file
+    def _write_keys(self, new_keys):
+        """Appends new_keys to the key table file with one write"""
+        if not new_keys:
+            return
+        with open(self.filename + KEYS_EXTENSION, 'a', newline='', encoding='utf-8') as file:
+            csv.writer(file).writerows(new_keys)
+
+    # Records changes to stock levels
+    def record_many(self, changes, when=None, removal:bool = False):
+        """
+            Appends (key, delta) changes to the log with one write
+            when: time of the changes in seconds (default: now)
+            removal: True if the changes are removals from inventory (used for consumption forecasts)
+        """
+        # Times never go backwards in the log
+        when = max(int(time.time() if when is None else when), self.last_time)
+
+        buffer = bytearray()
+        new_keys = []
+        for key, delta in changes:
+            if not delta:
+                continue
+            key_id = self._key_id(key, new_keys)
+            _write_varint(buffer, when - self.last_time)
+            _write_varint(buffer, key_id << 1 | removal)
+            _write_varint(buffer, _zigzag(delta))
+            self.last_time = when
+
+            quantity = self.stock.get(key_id, 0) + delta
+            if quantity:
+                self.stock[key_id] = quantity
+            else:
+                self.stock.pop(key_id, None)
+            self.events_since_checkpoint += 1
+
+        if not buffer:
+            return
+        # New keys are written before the events that use them
+        self._write_keys(new_keys)
+        with open(self.filename, 'ab') as file:
+            file.write(buffer)
+        self.log_size += len(buffer)
+
+        if self.events_since_checkpoint >= max(CHECKPOINT_EVERY, len(self.stock)):
+            self._write_checkpoint()
+
+    # Records one change to a stock level
+    def record(self, key, delta:int, when=None, removal:bool = False):
+        """Appends a change of delta to key's stock level to the log"""
+        self.record_many([(key, delta)], when, removal)
+
+    # Records the changes needed to match the given stock levels
+    def sync(self, quantities, when=None):
+        """
+            Records a change for every key whose stock level differs from quantities ({key: quantity})
+            Keys missing from quantities are recorded as going to 0 (used after loading a file)
+        """
+        changes = []
+        for key, quantity in quantities.items():
+            key_id = self.key_ids.get(key)
+            current = self.stock.get(key_id, 0) if key_id is not None else 0
+            if quantity != current:
+                changes.append((key, quantity - current))
+        for key_id, quantity in list(self.stock.items()):
+            key = self.keys[key_id]
+            if key not in quantities:
+                changes.append((key, -quantity))
+        self.record_many(changes, when)
+
+    # Writes a checkpoint of the current stock levels
+    def _write_checkpoint(self):
+        """Appends the current stock of every key and the log size to the checkpoint file"""
+        buffer = bytearray()
+        _write_varint(buffer, self.last_time)
+        _write_varint(buffer, self.log_size)
+        _write_varint(buffer, len(self.stock))
+        for key_id, quantity in self.stock.items():
+            _write_varint(buffer, key_id)
+            _write_varint(buffer, _zigzag(quantity))
+
+        checkpoint_filename = self.filename + CHECKPOINT_EXTENSION
+        position = os.path.getsize(checkpoint_filename) if os.path.exists(checkpoint_filename) else 0
+        with open(checkpoint_filename, 'ab') as file:
+            file.write(buffer)
+
+        self.checkpoint_times.append(self.last_time)
+        self.checkpoint_offsets.append(self.log_size)
+        self.checkpoint_positions.append(position)
+        self.events_since_checkpoint = 0
+
+    # Finds the last checkpoint at or before a time
+    def _seek(self, when):
+        """
+            Returns (stock by key id, log offset, time) of the last checkpoint at or before when
+            (None = last checkpoint); starts from the beginning of the log if there is none
+        """
+        index = len(self.checkpoint_times) - 1 if when is None else bisect.bisect_right(self.checkpoint_times, when) - 1
+        if index < 0:
+            return {}, 0, 0
+
+        with open(self.filename + CHECKPOINT_EXTENSION, 'rb') as file:
+            file.seek(self.checkpoint_positions[index])
+            end = self.checkpoint_positions[index + 1] if index + 1 < len(self.checkpoint_positions) else -1
+            data = file.read(end - self.checkpoint_positions[index] if end >= 0 else -1)
+
+        checkpoint_time, position = _read_varint(data, 0)
+        offset, position = _read_varint(data, position)
+        count, position = _read_varint(data, position)
+        stock = {}
+        for _ in range(count):
+            key_id, position = _read_varint(data, position)
+            quantity, position = _read_varint(data, position)
+            stock[key_id] = _unzigzag(quantity)
+        return stock, offset, checkpoint_time
+
+    # Reads events from the log
+    def _events(self, offset:int, when:int, end=None):
+        """
+            Yields (time, key id, delta, removal) for each event from log offset up to time end (None = all)
+            when: time of the event just before offset
+            Only reads up to the first checkpoint after end
+        """
+        if not os.path.exists(self.filename):
+            return
+
+        # Events after end can't be past the first checkpoint with a later time
+        stop = self.log_size
+        if end is not None:
+            index = bisect.bisect_right(self.checkpoint_times, end)
+            if index < len(self.checkpoint_offsets):
+                stop = self.checkpoint_offsets[index]
+
+        with open(self.filename, 'rb') as file:
+            file.seek(offset)
+            data = file.read(max(0, stop - offset))
+
+        position = 0
+        try:
+            while position < len(data):
+                elapsed, position = _read_varint(data, position)
+                field, position = _read_varint(data, position)
+                delta, position = _read_varint(data, position)
+                when += elapsed
+                if end is not None and when > end:
+                    return
+                yield when, field >> 1, _unzigzag(delta), bool(field & 1)
+        except IndexError:
+            # Unfinished event at the end of the log
+            return
+
+    # Returns stock levels at a time
+    def stock_at(self, when):
+        """Returns {key: quantity} of every key with stock at time when (seconds)"""
+        stock, offset, checkpoint_time = self._seek(when)
+        for _, key_id, delta, _ in self._events(offset, checkpoint_time, when):
+            stock[key_id] = stock.get(key_id, 0) + delta
+        return {self.keys[key_id]: quantity for key_id, quantity in stock.items() if quantity}
+
+    # Reads removals from the log
+    def iter_removals(self, start):
+        """
+            Yields (time, key, quantity removed) for each removal after time start (seconds)
+            An undone removal is yielded with a negative quantity
+        """
+        _, offset, checkpoint_time = self._seek(start)
+        for when, key_id, delta, removal in self._events(offset, checkpoint_time):
+            if removal and when > start:
+                yield when, self.keys[key_id], -delta
+
+    # Summarizes stock levels between two times
+    def summarize(self, start, end):
+        """
+            Returns {key: [start quantity, end quantity, added, removed, average]} between
+            times start and end (seconds) for every key with stock or changes in the range
+            average is the time-weighted average quantity held
+        """
+        if end <= start:
+            raise ValueError("End time must be after start time.")
+
+        # Stock at the start time
+        stock, offset, checkpoint_time = self._seek(start)
+        events = self._events(offset, checkpoint_time, end)
+        summary = {}
+        changed_at = {}
+        for when, key_id, delta, _ in events:
+            if when > start:
+                # First event in the range: stop replaying and start summing
+                stock[key_id] = stock.get(key_id, 0)
+                for stocked_id, quantity in stock.items():
+                    summary[stocked_id] = [quantity, quantity, 0, 0, 0]
+                    changed_at[stocked_id] = start
+                self._add_event(summary, changed_at, when, key_id, delta)
+                break
+            stock[key_id] = stock.get(key_id, 0) + delta
+        else:
+            for stocked_id, quantity in stock.items():
+                summary[stocked_id] = [quantity, quantity, 0, 0, 0]
+                changed_at[stocked_id] = start
+
+        # Add up each event in the range
+        for when, key_id, delta, _ in events:
+            self._add_event(summary, changed_at, when, key_id, delta)
+
+        # Finish the time-weighted averages
+        results = {}
+        for key_id, totals in summary.items():
+            totals[4] = (totals[4] + totals[1] * (end - changed_at[key_id])) / (end - start)
+            if totals[0] or totals[1] or totals[2] or totals[3]:
+                results[self.keys[key_id]] = totals
+        return results
+
+    # Adds one event to a summary
+    def _add_event(self, summary, changed_at, when, key_id, delta):
+        """Updates a key's end quantity, added/removed totals, and quantity x time held"""
+        totals = summary.get(key_id)
+        if totals is None:
+            totals = summary[key_id] = [0, 0, 0, 0, 0]
+            changed_at[key_id] = when
+        totals[4] += totals[1] * (when - changed_at[key_id])
+        changed_at[key_id] = when
+        totals[1] += delta
+        if delta > 0:
+            totals[2] += delta
+        else:
+            totals[3] -= delta
+
+    # Summarizes stock levels by food group between two times
+    def summarize_by_food_group(self, start, end):
+        """
+            Returns {food group: [start quantity, end quantity, added, removed, average]}
+            (see summarize)
+        """
+        groups = {}
+        for key, totals in self.summarize(start, end).items():
+            food_group = normalize_food_group(key[2]) or key[2].title()
+            group = groups.setdefault(food_group, [0, 0, 0, 0, 0])
+            for index, value in enumerate(totals):
+                group[index] += value
+        return groups
@@ -0,0 +1,131 @@
+import csv
+import os
+import tempfile
+import unittest
+import inventory_diff
+from inventory import CSV_FIELDNAMES, DELTA_EXTENSION
+from inventory_diff import diff_files, merge_files, iter_inventory_rows
+
+RICE = ("rice", "bag", "grains", "2 lb")
+CORN = ("corn", "can", "vegetables", "12 oz")
+BEANS = ("beans", "can", "protein", "15 oz")
+PASTA = ("pasta", "box", "grains", "1 lb")
+
+class MergeFilesTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    # Writes an inventory CSV file
+    def write(self, name, quantities, locations=None):
+        """Writes {key: quantity} as an inventory file and returns its path"""
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(CSV_FIELDNAMES)
+            for key, quantity in quantities.items():
+                location = (locations or {}).get(key, "")
+                writer.writerow(list(key) + [quantity, "", "", location, ""])
+        return path
+
+    # Reads a merged file
+    def read(self, path):
+        """Returns {key: row} of a merged file"""
+        return {key: row for key, row, _ in iter_inventory_rows(path)}
+
+    # Merges three versions and returns the conflicts and merged quantities
+    def merge(self, base, ours, theirs):
+        """Returns (conflicts, {key: merged quantity})"""
+        output = os.path.join(self.directory.name, "merged.csv")
+        conflicts = merge_files(self.write("base.csv", base), self.write("ours.csv", ours),
+                                self.write("theirs.csv", theirs), output)
+        return conflicts, {key: int(row["quantity"]) for key, row in self.read(output).items()}
+
+    # Changes made on only one side are kept
+    def test_one_sided_changes_are_kept(self):
+        """A change on either side wins over the base, with no conflict"""
+        conflicts, merged = self.merge({RICE: 20, CORN: 5, BEANS: 3},
+                                       {RICE: 15, CORN: 5, BEANS: 3},
+                                       {RICE: 20, CORN: 8})
+        self.assertEqual(conflicts, [])
+        self.assertEqual(merged, {RICE: 15, CORN: 8})
+
+    # The same change on both sides is applied once
+    def test_same_change_is_not_a_conflict(self):
+        """Both sides removing the same units (or adding the same item) merges cleanly"""
+        conflicts, merged = self.merge({RICE: 20}, {RICE: 12, PASTA: 4}, {RICE: 12, PASTA: 4})
+        self.assertEqual(conflicts, [])
+        self.assertEqual(merged, {RICE: 12, PASTA: 4})
+
+    # Different changes to the same item are both applied and reported
+    def test_different_changes_conflict(self):
+        """base 20, ours 15, theirs 18 merges to 13 and is reported once"""
+        conflicts, merged = self.merge({RICE: 20, CORN: 5}, {RICE: 15, CORN: 5}, {RICE: 18, CORN: 5})
+        self.assertEqual(conflicts, [(RICE, 20, 15, 18, 13)])
+        self.assertEqual(merged, {RICE: 13, CORN: 5})
+
+    # An item deleted on one side and changed on the other
+    def test_delete_against_change_conflicts(self):
+        """The merged quantity never goes below 0, and a merge to 0 drops the item"""
+        conflicts, merged = self.merge({RICE: 10, CORN: 5}, {CORN: 5}, {RICE: 4, CORN: 5})
+        self.assertEqual(conflicts, [(RICE, 10, 0, 4, 0)])
+        self.assertEqual(merged, {CORN: 5})
+
+    # Items added on both sides with different quantities
+    def test_added_on_both_sides_conflicts(self):
+        """With no base row, both additions are kept (base 0)"""
+        conflicts, merged = self.merge({}, {PASTA: 3}, {PASTA: 5})
+        self.assertEqual(conflicts, [(PASTA, 0, 3, 5, 8)])
+        self.assertEqual(merged, {PASTA: 8})
+
+    # Rows other than quantity come from our side
+    def test_merged_row_keeps_our_fields(self):
+        """The merged row uses our version's other fields with the merged quantity"""
+        output = os.path.join(self.directory.name, "merged.csv")
+        merge_files(self.write("base.csv", {RICE: 20}),
+                    self.write("ours.csv", {RICE: 15}, {RICE: "A-1-1"}),
+                    self.write("theirs.csv", {RICE: 18}, {RICE: "B-2-2"}), output)
+        row = self.read(output)[RICE]
+        self.assertEqual((row["quantity"], row["location"]), ("13", "A-1-1"))
+
+    # Delta files are applied before merging
+    def test_delta_file_is_applied(self):
+        """A side's delta file replaces its rows (quantity 0 = deleted)"""
+        ours = self.write("ours.csv", {RICE: 20, CORN: 5})
+        with open(ours + DELTA_EXTENSION, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(CSV_FIELDNAMES)
+            writer.writerow(list(RICE) + [15, "", "", "", ""])
+            writer.writerow(list(CORN) + [0, "", "", "", ""])
+
+        output = os.path.join(self.directory.name, "merged.csv")
+        conflicts = merge_files(self.write("base.csv", {RICE: 20, CORN: 5}), ours,
+                                self.write("theirs.csv", {RICE: 18, CORN: 5}), output)
+        self.assertEqual(conflicts, [(RICE, 20, 15, 18, 13)])
+        self.assertEqual({key: row["quantity"] for key, row in self.read(output).items()}, {RICE: "13"})
+
+    # Large inputs are merged in partitions
+    def test_partitioned_merge_matches(self):
+        """Splitting the files into partitions gives the same conflicts and result"""
+        partition_bytes = inventory_diff.PARTITION_BYTES
+        inventory_diff.PARTITION_BYTES = 64
+        try:
+            conflicts, merged = self.merge({RICE: 20, CORN: 5, BEANS: 3},
+                                           {RICE: 15, CORN: 5, BEANS: 3, PASTA: 1},
+                                           {RICE: 18, CORN: 9})
+        finally:
+            inventory_diff.PARTITION_BYTES = partition_bytes
+        self.assertEqual(conflicts, [(RICE, 20, 15, 18, 13)])
+        self.assertEqual(merged, {RICE: 13, CORN: 9, PASTA: 1})
+
+    # Differences between two files
+    def test_diff_files(self):
+        """Yields (key, old, new) for added, removed, and changed items"""
+        old = self.write("old.csv", {RICE: 20, CORN: 5, BEANS: 3})
+        new = self.write("new.csv", {RICE: 15, CORN: 5, PASTA: 2})
+        self.assertEqual(sorted(diff_files(old, new)), sorted([(RICE, 20, 15), (BEANS, 3, 0), (PASTA, 0, 2)]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+import stock_history
+from stock_history import StockHistory, CHECKPOINT_EXTENSION
+
+RICE = ("rice", "bag", "grains", "2 lb")
+BEANS = ("beans", "can", "protein", "15 oz")
+
+class StockHistoryTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "stock_history.log")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    # Changes written by one StockHistory are read back by the next one
+    def test_round_trip(self):
+        """Reopening the log gives the same stock levels, stock at past times, and removals"""
+        log = StockHistory(self.filename)
+        log.record_many([(RICE, 10), (BEANS, 4)], when=100)
+        log.record(RICE, -3, when=200, removal=True)
+        log.record(BEANS, -4, when=300, removal=True)
+
+        reopened = StockHistory(self.filename)
+        self.assertEqual(reopened.stock_at(150), {RICE: 10, BEANS: 4})
+        self.assertEqual(reopened.stock_at(250), {RICE: 7, BEANS: 4})
+        self.assertEqual(reopened.stock_at(300), {RICE: 7})
+        self.assertEqual(list(reopened.iter_removals(100)), [(200, RICE, 3), (300, BEANS, 4)])
+        self.assertEqual(reopened.last_time, 300)
+
+        # New changes continue the same log
+        reopened.record(RICE, 5, when=400)
+        self.assertEqual(StockHistory(self.filename).stock_at(400), {RICE: 12})
+
+    # Checkpoints are used when the log is reopened
+    def test_reopen_after_checkpoint(self):
+        """Stock levels before, at, and after a checkpoint match after reopening"""
+        every = stock_history.CHECKPOINT_EVERY
+        stock_history.CHECKPOINT_EVERY = 4
+        try:
+            log = StockHistory(self.filename)
+            for when in range(1, 11):
+                log.record(RICE, 1, when=when)
+            log.record(BEANS, 2, when=11)
+        finally:
+            stock_history.CHECKPOINT_EVERY = every
+
+        self.assertTrue(os.path.exists(self.filename + CHECKPOINT_EXTENSION))
+        self.assertEqual(len(log.checkpoint_times), 2)
+
+        reopened = StockHistory(self.filename)
+        self.assertEqual(reopened.checkpoint_times, log.checkpoint_times)
+        self.assertEqual(reopened.stock_at(3), {RICE: 3})
+        self.assertEqual(reopened.stock_at(4), {RICE: 4})
+        self.assertEqual(reopened.stock_at(9), {RICE: 9})
+        self.assertEqual(reopened.stock_at(11), {RICE: 10, BEANS: 2})
+        self.assertEqual(reopened.events_since_checkpoint, 3)
+
+        summary = reopened.summarize(2, 11)
+        self.assertEqual(summary[RICE][:4], [2, 10, 8, 0])
+
+    # A checkpoint past the end of the log is from an unfinished write
+    def test_checkpoint_past_end_of_log_is_ignored(self):
+        """A truncated log is replayed from the last checkpoint that it still contains"""
+        every = stock_history.CHECKPOINT_EVERY
+        stock_history.CHECKPOINT_EVERY = 2
+        try:
+            log = StockHistory(self.filename)
+            for when in range(1, 5):
+                log.record(RICE, 1, when=when)
+        finally:
+            stock_history.CHECKPOINT_EVERY = every
+
+        # Cut the log back to before the second checkpoint
+        with open(self.filename, 'r+b') as file:
+            file.truncate(log.checkpoint_offsets[0])
+
+        reopened = StockHistory(self.filename)
+        self.assertEqual(reopened.checkpoint_offsets, log.checkpoint_offsets[:1])
+        self.assertEqual(reopened.stock_at(10), {RICE: 2})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import contextlib
+import csv
+import io
+import os
+import tempfile
+import unittest
+from datetime import date
+from inventory import Inventory, CSV_FIELDNAMES
+from watcher import FileWatcher
+
+RICE = ("rice", "bag", "grains", "2 lb")
+CORN = ("corn", "can", "vegetables", "12 oz")
+BEANS = ("beans", "can", "protein", "15 oz")
+
+class FileWatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "inventory.csv")
+        # Inventory prints confirmations, which aren't needed here
+        self.output = contextlib.redirect_stdout(io.StringIO())
+        self.output.__enter__()
+
+        self.inventory = Inventory()
+        self.inventory.add_item("Rice", "Bag", "Grains", "2 lb", 10, date(2026, 12, 1))
+        self.inventory.add_item("Corn", "Can", "Vegetables", "12 oz", 5)
+        self.inventory.add_item("Beans", "Can", "Protein", "15 oz", 4)
+        self.inventory.save_inventory_to_csv(self.filename)
+        self.watcher = FileWatcher(self.inventory)
+
+    def tearDown(self):
+        self.output.__exit__(None, None, None)
+        self.directory.cleanup()
+
+    # Edits the inventory file like another program would
+    def edit_file(self, key, **fields):
+        """Sets fields of key's row in the file and moves its modified time forward"""
+        with open(self.filename, 'r', newline='', encoding='utf-8') as file:
+            rows = list(csv.DictReader(file))
+        for row in rows:
+            if (row["name"], row["container"], row["food_group"], row["weight"]) == key:
+                row.update(fields)
+        with open(self.filename, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.DictWriter(file, fieldnames=CSV_FIELDNAMES)
+            writer.writeheader()
+            writer.writerows(rows)
+        stat = os.stat(self.filename)
+        os.utime(self.filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    # An unchanged file is skipped
+    def test_no_outside_change(self):
+        """check() applies nothing when the file matches the last save"""
+        self.assertEqual(self.watcher.check(), (0, []))
+
+    # Outside edits to fields other than quantity are applied
+    def test_location_edit_is_applied(self):
+        """A new location in the file is loaded when this program didn't change the item"""
+        self.edit_file(RICE, location="B-12-3")
+        applied, conflicts = self.watcher.check()
+        self.assertEqual((applied, conflicts), (1, []))
+        self.assertEqual(self.inventory.items[RICE].location, "B-12-3")
+        self.assertEqual(self.inventory.items[RICE].quantity, 10)
+        self.assertFalse(self.inventory.has_unsaved_changes())
+
+    def test_reorder_threshold_edit_is_applied(self):
+        """A reorder threshold set in the file is loaded"""
+        self.edit_file(CORN, reorder_at="3")
+        self.assertEqual(self.watcher.check(), (1, []))
+        self.assertEqual(self.inventory.low_stock.item_thresholds.get(CORN), 3)
+
+    def test_expiration_edit_is_applied(self):
+        """A changed expiration date (and lots) in the file is loaded"""
+        with open(self.filename, 'r', newline='', encoding='utf-8') as file:
+            lots = next(row["lots"] for row in csv.DictReader(file) if row["name"] == "rice")
+        self.edit_file(RICE, expiration="2027-01-01", lots=lots.replace("2026-12-01", "2027-01-01"))
+        self.assertEqual(self.watcher.check(), (1, []))
+        self.assertEqual(self.inventory.items[RICE].expiration, date(2027, 1, 1))
+
+    # Items edited in both places are conflicts
+    def test_edit_against_local_edit_conflicts(self):
+        """A local location edit (not a quantity change) still conflicts with an outside edit"""
+        self.inventory.set_location(CORN, "A-1-1")
+        self.edit_file(CORN, location="C-2-2")
+        applied, conflicts = self.watcher.check()
+        self.assertEqual(applied, 0)
+        self.assertEqual([(conflict.key, conflict.fields) for conflict in conflicts], [(CORN, ["location"])])
+        # Nothing is overwritten until the conflict is resolved
+        self.assertEqual(self.inventory.items[CORN].location, "A-1-1")
+
+    def test_keep_mine_keeps_local_edit(self):
+        """Keeping this program's version leaves the edit unsaved against the new file"""
+        self.inventory.set_location(CORN, "A-1-1")
+        self.edit_file(CORN, location="C-2-2")
+        _, conflicts = self.watcher.check()
+        self.watcher.resolve(conflicts[0], keep_mine=True)
+        self.assertEqual(self.inventory.items[CORN].location, "A-1-1")
+        self.assertIn(CORN, self.inventory.get_edited_keys())
+        self.assertTrue(self.inventory.get_changed())
+
+    def test_take_theirs_clears_local_change(self):
+        """Taking the file's version replaces the item and forgets its unsaved change"""
+        self.inventory.remove_item("Rice", "Bag", "Grains", "2 lb", 2)
+        self.edit_file(RICE, location="B-12-3")
+        _, conflicts = self.watcher.check()
+        self.assertEqual([conflict.fields for conflict in conflicts], [["quantity", "location", "lots"]])
+        self.watcher.resolve(conflicts[0], keep_mine=False)
+        self.assertEqual((self.inventory.items[RICE].quantity, self.inventory.items[RICE].location), (10, "B-12-3"))
+        self.assertFalse(self.inventory.has_unsaved_change(RICE))
+
+    def test_same_edit_is_not_a_conflict(self):
+        """An outside edit that matches the local edit clears the unsaved change"""
+        self.inventory.set_location(CORN, "A-1-1")
+        self.edit_file(CORN, location="A-1-1")
+        self.assertEqual(self.watcher.check(), (0, []))
+        self.assertFalse(self.inventory.has_unsaved_change(CORN))
+
+    # Undo history of other items is kept
+    def test_history_of_untouched_items_is_kept(self):
+        """Only undo records of items the file changed are dropped"""
+        self.inventory.add_item("Beans", "Can", "Protein", "15 oz", 1)
+        self.inventory.add_item("Corn", "Can", "Vegetables", "12 oz", 2)
+        self.edit_file(RICE, location="B-12-3")
+        self.watcher.check()
+
+        undo_keys = [[change[0] for change in record[0]] for record in self.inventory.history.undo_stack]
+        self.assertEqual(undo_keys, [[CORN], [BEANS], [BEANS], [CORN]])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+import csv
+import os
+from exporters import read_rows, file_stats, file_hashes, file_fingerprint
+from expiration import parse_date, format_date
+from inventory import CSV_FIELDNAMES, item_values
+from item import Item
+from lots import parse_lots, format_lots
+
+# Names of the fields compared between the file and inventory (in item_values order)
+COMPARED_FIELDS = ("quantity", "expiration", "reorder_at", "location", "lots")
+
+# Builds the item a file row loads as
+def _row_item(row):
+    """Returns an Item built from a file row the way loading builds it"""
+    return Item(row["name"], row["container"], row["food_group"], row["weight"], int(row["quantity"]),
+                parse_date(row.get("expiration")), parse_lots(row.get("lots")), row.get("location") or None)
+
+# Returns the fields of a file row
+def _row_values(row):
+    """Returns item_values of a file row (None for None), so it can be compared with inventory"""
+    if row is None:
+        return None
+    reorder_at = row.get("reorder_at")
+    return item_values(_row_item(row), int(reorder_at) if reorder_at not in (None, "") else None)
+
+# Returns the fields of a file row as written
+def _raw_values(row):
+    """
+        Returns the fields of a file row without parsing them, in item_values order
+        A row written from an item matches that item's item_values exactly, so unchanged rows
+        can be skipped without building an Item (rows that don't match are compared with _row_values)
+    """
+    return (int(row["quantity"]), row.get("expiration") or "", row.get("reorder_at") or "",
+            row.get("location") or "", row.get("lots") or "")
+
+# Adds up two file rows of the same item
+def _merge_rows(earlier, later):
+    """
+        Returns one row for two rows with the same key, merged the way loading merges them:
+        quantities add up, lots are combined (earlier row's lots first, each with its own
+        expiration date), and the later row's location and reorder threshold win if set
+    """
+    item = _row_item(earlier)
+    for lot in _row_item(later).lots:
+        item.add_lot(lot)
+
+    row = dict(later)
+    row["quantity"] = str(item.quantity)
+    row["lots"] = format_lots(item.lots)
+    row["expiration"] = format_date(item.expiration)
+    for field in ("location", "reorder_at"):
+        if later.get(field) in (None, ""):
+            row[field] = earlier.get(field, "")
+    return row
+
+class Conflict:
+    """
+        An item changed both in this program and in the file since the last load/save
+
+        key: inventory key of the item
+        base: quantity at the last load/save
+        mine: quantity in this program
+        theirs: quantity in the file (0 if the file deleted it)
+        row: the item's row from the file (None if the file deleted it)
+        fields: names of the fields that differ between this program and the file (ex. ["location"])
+        theirs_values: item_values of the file's version (None if the file deleted it)
+    """
+    def __init__(self, key, base, mine, theirs, row, fields, theirs_values):
+        self.key = key
+        self.base = base
+        self.mine = mine
+        self.theirs = theirs
+        self.row = row
+        self.fields = fields
+        self.theirs_values = theirs_values
+
+class FileWatcher:
+    """
+        Watches the inventory's current file for changes made outside this program
+
+        check() is cheap when nothing changed: it compares file modified times and sizes
+        with the fingerprint taken at the last load/save, and only hashes the files if those
+        differ. When the contents changed, the file is diffed against the inventory by key in
+        one pass, comparing every saved field (quantity, expiration, reorder threshold, location,
+        and lots). Changes to items with no unsaved changes in this program are applied right
+        away; items changed in both places (including edits like a new location) are returned
+        as conflicts
+    """
+    def __init__(self, inventory):
+        self.inventory = inventory
+
+    # Checks if the current file changed outside this program
+    def has_changed(self) -> bool:
+        """Returns True if the current file (or its delta file) contents changed since the last load/save"""
+        files = self.inventory.get_current_files()
+        if not files or self.inventory.file_fingerprint is None:
+            return False
+
+        stats, hashes = self.inventory.file_fingerprint
+        new_stats = file_stats(files)
+        if new_stats == stats:
+            return False
+
+        # Modified time/size changed, so compare contents
+        new_hashes = file_hashes(files)
+        if new_hashes == hashes:
+            # File was only touched, so remember the new stats to skip hashing next time
+            self.inventory.file_fingerprint = (new_stats, hashes)
+            return False
+        return True
+
+    # Reads the current file (and its delta file) by key
+    def read_file_items(self):
+        """
+            Returns {key: row} for every item in the current file, with its delta file applied
+            Rows with the same key (ex. 16 oz and 1 lb with canonical units) are added up like loading does
+        """
+        make_key = self.inventory.make_key
+        file_items = {}
+
+        filename, delta_filename = self.inventory.get_current_files()
+        for row in read_rows(filename, CSV_FIELDNAMES):
+            key = make_key(row["name"], row["container"], row["food_group"], row["weight"])
+            file_items[key] = _merge_rows(file_items[key], row) if key in file_items else row
+
+        # Later rows (delta file) replace earlier ones; quantity 0 means deleted
+        if os.path.exists(delta_filename):
+            with open(delta_filename, 'r', newline='', encoding='utf-8') as file:
+                for row in csv.DictReader(file):
+                    key = make_key(row["name"], row["container"], row["food_group"], row["weight"])
+                    if int(row["quantity"]) > 0:
+                        file_items[key] = row
+                    else:
+                        file_items.pop(key, None)
+        return file_items
+
+    # Checks for and applies outside changes
+    def check(self):
+        """
+            Checks the current file for outside changes
+            Applies changes that don't conflict with unsaved changes in this program
+
+            Returns (number of changes applied, list of Conflicts)
+        """
+        if not self.has_changed():
+            return 0, []
+
+        inventory = self.inventory
+        file_items = self.read_file_items()
+        local = set(inventory.pending_changes) | set(inventory.edited_keys)
+
+        applied = 0
+        conflicts = []
+        # Keys the file changed
+        touched = []
+        for key in set(file_items) | set(inventory.items) | local:
+            row = file_items.get(key)
+            mine = inventory.get_item_values(key)
+            # Fields at the last load/save
+            base = inventory.get_saved_values(key) if key in local else mine
+
+            # File didn't change this item (most rows are exactly as this program wrote them)
+            if row is not None and _raw_values(row) == base:
+                continue
+            theirs = _row_values(row)
+            if theirs == base:
+                continue
+            touched.append(key)
+
+            # Only the file changed this item, so apply it
+            if key not in local:
+                inventory.apply_external_row(key, row)
+                applied += 1
+            # Both made the same change, so it's no longer unsaved
+            elif theirs == mine:
+                inventory.clear_unsaved(key)
+            # Both changed the item differently
+            else:
+                fields = [field for field, a, b in zip(COMPARED_FIELDS, mine or (0,) * 5, theirs or (0,) * 5) if a != b]
+                conflicts.append(Conflict(key, base[0] if base else 0, mine[0] if mine else 0,
+                                          theirs[0] if theirs else 0, row, fields, theirs))
+
+        # The file is the new starting point for unsaved changes
+        inventory.file_fingerprint = file_fingerprint(inventory.get_current_files())
+
+        # Undo history of the items the file changed no longer matches, so it's dropped
+        inventory.history.drop_keys(touched)
+        inventory.set_changed(inventory.has_unsaved_changes() or bool(conflicts))
+        return applied, conflicts
+
+    # Resolves a conflict
+    def resolve(self, conflict, keep_mine:bool):
+        """
+            Resolves a conflict by keeping this program's version (an unsaved change against the file)
+            or taking the file's version of the item
+        """
+        inventory = self.inventory
+        key = conflict.key
+
+        if keep_mine:
+            inventory.keep_unsaved(key, conflict.theirs_values)
+        else:
+            inventory.apply_external_row(key, conflict.row)
+            inventory.clear_unsaved(key)
+
+        inventory.set_changed(inventory.has_unsaved_changes())